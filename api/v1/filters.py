@@ -0,0 +1,27 @@
+from rest_framework.filters import BaseFilterBackend
+
+from employees.filters import FILTERS, compile_query
+
+
+class EmployeeQueryFilter(BaseFilterBackend):
+    """
+    Фильтр сотрудников через общий компилятор запросов.
+
+    Поддерживает те же параметры, что и поиск на сайте и экспорт:
+    last_name, first_name, patronymic, region_name (или region_code),
+    note_date, note_number, status, created_at.
+    """
+
+    def filter_queryset(self, request, queryset, view):
+        return compile_query(request.query_params).apply(queryset)
+
+    def get_schema_operation_parameters(self, view):
+        return [
+            {
+                "name": param,
+                "required": False,
+                "in": "query",
+                "schema": {"type": "string"},
+            }
+            for param in FILTERS
+        ]
@@ -1,7 +1,12 @@
+from django.db import IntegrityError, transaction
 from rest_framework import serializers
 
+from employees.logins import create_employee
 from employees.models import Employee, Region, PasswordPolicy
 
+# Максимум сотрудников в одном запросе предпросмотра логинов
+LOGIN_PREVIEW_MAX = 5000
+
 
 class RegionSerializer(serializers.ModelSerializer):
     """Сериализатор для модели Region."""
@@ -20,10 +25,12 @@ class PasswordPolicySerializer(serializers.ModelSerializer):
 
 
 class EmployeeReadSerializer(serializers.ModelSerializer):
-    """Сериализатор для чтения сотрудников (с вложенными регионами)."""
+    """Сериализатор для чтения сотрудников (с вложенным регионом)."""
 
-    region_name = RegionSerializer(read_only=True)
-    region_code = RegionSerializer(read_only=True)
+    region = RegionSerializer(read_only=True)
+    # прежние имена поля региона: тот же объект, без отдельного JOIN
+    region_name = RegionSerializer(source="region", read_only=True)
+    region_code = RegionSerializer(source="region", read_only=True)
 
     class Meta:
         model = Employee
@@ -32,6 +39,7 @@ class EmployeeReadSerializer(serializers.ModelSerializer):
             "last_name",
             "first_name",
             "patronymic",
+            "region",
             "region_name",
             "region_code",
             "status",
@@ -41,7 +49,15 @@ class EmployeeReadSerializer(serializers.ModelSerializer):
 
 
 class EmployeeWriteSerializer(serializers.ModelSerializer):
-    """Сериализатор для записи сотрудников (через id регионов)."""
+    """
+    Сериализатор для записи сотрудников (через id региона).
+
+    Регион передаётся в поле region; прежние поля region_name и
+    region_code принимаются как его синонимы.
+    """
+
+    region_name = serializers.IntegerField(source="region_id", read_only=True)
+    region_code = serializers.IntegerField(source="region_id", read_only=True)
 
     class Meta:
         model = Employee
@@ -50,7 +66,54 @@ class EmployeeWriteSerializer(serializers.ModelSerializer):
             "last_name",
             "first_name",
             "patronymic",
+            "region",
             "region_name",
             "region_code",
             "status",
         ]
+
+    def to_internal_value(self, data):
+        if "region" not in data:
+            legacy = data.get("region_name", data.get("region_code"))
+            if legacy is not None:
+                data = data.copy()
+                data["region"] = legacy
+        return super().to_internal_value(data)
+
+    # дубликат ФИО в регионе отклоняет ограничение БД при сохранении
+    duplicate_message = "Такой сотрудник в этом регионе уже существует."
+
+    def create(self, validated_data):
+        """Создаёт сотрудника с первым свободным логином."""
+        try:
+            return create_employee(**validated_data)
+        except IntegrityError:
+            raise serializers.ValidationError(self.duplicate_message)
+
+    def update(self, instance, validated_data):
+        try:
+            with transaction.atomic():
+                return super().update(instance, validated_data)
+        except IntegrityError:
+            raise serializers.ValidationError(self.duplicate_message)
+
+
+class LoginPersonSerializer(serializers.Serializer):
+    """ФИО и регион (id) сотрудника для предпросмотра логина."""
+
+    last_name = serializers.CharField(max_length=100)
+    first_name = serializers.CharField(max_length=100)
+    patronymic = serializers.CharField(
+        max_length=100, required=False, allow_blank=True, default=""
+    )
+    region = serializers.IntegerField()
+
+
+class LoginPreviewSerializer(serializers.Serializer):
+    """Список сотрудников для пакетного предпросмотра логинов."""
+
+    people = serializers.ListField(
+        child=LoginPersonSerializer(),
+        allow_empty=False,
+        max_length=LOGIN_PREVIEW_MAX,
+    )
@@ -1,15 +1,20 @@
 from rest_framework import viewsets
+from rest_framework.decorators import action
 from rest_framework.permissions import IsAuthenticated
-from django_filters.rest_framework import DjangoFilterBackend
 from rest_framework.filters import SearchFilter, OrderingFilter
+from rest_framework.response import Response
 
+from employees.logins import propose_logins
 from employees.models import Employee, Region, PasswordPolicy
+from employees.writes import run_write
 from .serializers import (
     EmployeeReadSerializer,
     EmployeeWriteSerializer,
+    LoginPreviewSerializer,
     RegionSerializer,
     PasswordPolicySerializer,
 )
+from .filters import EmployeeQueryFilter
 from .permissions import IsAdminOrManager
 
 
@@ -22,21 +27,75 @@ class EmployeeViewSet(viewsets.ModelViewSet):
     - Просмотрщик может только читать.
     """
 
-    queryset = Employee.objects.all()
+    queryset = Employee.objects.select_related("region")
     permission_classes = [IsAuthenticated, IsAdminOrManager]
-    filter_backends = [DjangoFilterBackend, SearchFilter, OrderingFilter]
+    filter_backends = [EmployeeQueryFilter, SearchFilter, OrderingFilter]
 
-    # Фильтры
-    filterset_fields = ["status", "region_name", "region_code"]
-    search_fields = ["last_name", "first_name", "patronymic"]
+    # Фильтры: общий компилятор запросов (employees.filters)
+    search_fields = [
+        "last_name__fts",
+        "first_name__fts",
+        "patronymic__fts",
+        "note_number__fts",
+        "login__fts",
+    ]
     ordering_fields = ["last_name", "first_name", "id", "created_at"]
 
     def get_serializer_class(self):
         """Для чтения используем ReadSerializer, для записи — WriteSerializer."""
         if self.action in ("list", "retrieve"):
             return EmployeeReadSerializer
+        if self.action == "logins":
+            return LoginPreviewSerializer
         return EmployeeWriteSerializer
 
+    def perform_create(self, serializer):
+        run_write(serializer.save)
+
+    def perform_update(self, serializer):
+        run_write(serializer.save)
+
+    def perform_destroy(self, instance):
+        run_write(instance.delete)
+
+    @action(detail=False, methods=["post"])
+    def logins(self, request):
+        """
+        Пакетный предпросмотр логинов.
+
+        Принимает {"people": [{"last_name", "first_name", "patronymic",
+        "region"}, ...]} и за один запрос к БД возвращает предлагаемые
+        логины: {"results": [{"login", "base", "conflict"} |
+        {"error"}, ...]} в том же порядке. conflict — логин без номера
+        уже занят. Логины не резервируются.
+        """
+        serializer = self.get_serializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        people = serializer.validated_data["people"]
+
+        regions = Region.objects.in_bulk(
+            {person["region"] for person in people}
+        )
+        known = [person for person in people if person["region"] in regions]
+        proposals = iter(
+            propose_logins(
+                (
+                    regions[person["region"]].code,
+                    person["last_name"],
+                    person["first_name"],
+                    person["patronymic"],
+                )
+                for person in known
+            )
+        )
+        results = [
+            next(proposals)
+            if person["region"] in regions
+            else {"error": "Неизвестный регион."}
+            for person in people
+        ]
+        return Response({"results": results})
+
 
 class RegionViewSet(viewsets.ModelViewSet):
     """ViewSet для регионов."""
@@ -1,10 +1,15 @@
 from django.contrib import admin
 from django.contrib.auth.admin import UserAdmin
+from django.http import StreamingHttpResponse
+from django.utils import timezone
 
 from users.models import User
+from .bulk import rotate_passwords
+from .exports import CREDENTIAL_HEADERS, iter_credential_rows, iter_csv
 from .models import (
     ActionLog,
     Employee,
+    ExportJob,
     LoginHistory,
     PasswordPolicy,
     Region,
@@ -28,40 +33,69 @@ class EmployeeAdmin(admin.ModelAdmin):
         'last_name',
         'first_name',
         'patronymic',
-        'region_name',
-        'region_code',
+        'region',
         'login',
         'action',
         'status',
         'created_at',
     )
-    list_filter = ('region_name', 'action', 'status')
+    list_filter = ('region', 'action', 'status')
+    list_select_related = ('region',)
+    # поиск через полнотекстовый индекс (lookup «fts», см. employees.fts)
     search_fields = (
-        'last_name',
-        'first_name',
-        'patronymic',
-        'login',
-        'note_number',
+        'last_name__fts',
+        'first_name__fts',
+        'patronymic__fts',
+        'login__fts',
+        'note_number__fts',
     )
     ordering = ('last_name',)
-    readonly_fields = ('created_at',)
+    readonly_fields = ('created_at', 'updated_at')
+    actions = ('rotate_selected_passwords',)
 
     fieldsets = (
         (
             'Личные данные',
             {'fields': ('last_name', 'first_name', 'patronymic')},
         ),
-        ('Регион', {'fields': ('region_name', 'region_code')}),
+        ('Регион', {'fields': ('region',)}),
         (
             'Служебная записка',
             {'fields': ('note_date', 'note_number', 'action')},
         ),
         (
             'Учётные данные',
-            {'fields': ('login', 'password', 'status', 'created_at')},
+            {
+                'fields': (
+                    'login',
+                    'password',
+                    'status',
+                    'created_at',
+                    'updated_at',
+                )
+            },
         ),
     )
 
+    @admin.action(
+        description='Сменить пароли работающих и выгрузить CSV',
+        permissions=('change',),
+    )
+    def rotate_selected_passwords(self, request, queryset):
+        """
+        Массовая смена паролей выбранных сотрудников.
+
+        Ответ — CSV с новыми логинами и паролями (отдаётся потоком).
+        """
+        ids = rotate_passwords(queryset, user=request.user)
+        response = StreamingHttpResponse(
+            iter_csv(iter_credential_rows(ids), CREDENTIAL_HEADERS),
+            content_type='text/csv; charset=utf-8',
+        )
+        filename = f'passwords-{timezone.localdate():%Y%m%d}.csv'
+        response['Content-Disposition'] = f'attachment; filename="{filename}"'
+        return response
+
 
 @admin.register(PasswordPolicy)
 class PasswordPolicyAdmin(admin.ModelAdmin):
@@ -119,6 +153,31 @@ class LoginHistoryAdmin(admin.ModelAdmin):
         return False
 
 
+@admin.register(ExportJob)
+class ExportJobAdmin(admin.ModelAdmin):
+    """Админка для модели ExportJob."""
+
+    list_display = (
+        'created_at',
+        'user',
+        'status',
+        'done',
+        'total',
+        'finished_at',
+    )
+    list_filter = ('status', 'created_at')
+    search_fields = ('user__username',)
+    ordering = ('-created_at',)
+
+    def has_add_permission(self, request):
+        """Задачи создаются только со страницы экспорта."""
+        return False
+
+    def has_change_permission(self, request, obj=None):
+        """Запрещает изменение существующих записей."""
+        return False
+
+
 @admin.register(User)
 class CustomUserAdmin(UserAdmin):
     """Админка для кастомной модели User с дополнительным полем role."""
@@ -4,6 +4,7 @@ from rest_framework import permissions, viewsets
 
 from .models import Employee, Region
 from .serializers import EmployeeSerializer, RegionSerializer
+from .writes import run_write
 
 logger = logging.getLogger(__name__)
 
@@ -23,7 +24,7 @@ class EmployeeViewSet(viewsets.ModelViewSet):
             serializer (EmployeeSerializer): сериализатор с данными
             сотрудника.
         """
-        employee = serializer.save()
+        employee = run_write(serializer.save)
         logger.info("Создан сотрудник через API: %s", employee)
 
 
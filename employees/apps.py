@@ -9,3 +9,7 @@ class EmployeesConfig(AppConfig):
     def ready(self):
         # подключаем сигналы
         from . import signals  # noqa: F401
+        from .fts import register_lookups
+
+        # lookup «fts» для поиска по полнотекстовому индексу
+        register_lookups(self.get_model('Employee'))
@@ -0,0 +1,287 @@
+"""
+Массовые операции над сотрудниками порциями фиксированного размера.
+
+Каждая порция обрабатывается в отдельной короткой транзакции, поэтому
+база не блокируется на всё время операции, а в запросах нет длинных
+списков параметров (лимит переменных SQLite). Ход выполнения
+сохраняется в БД (BulkProgress) и доступен по токену операции из любого
+процесса. Удаление из веб-интерфейса выполняется в фоновом потоке
+(start_delete), чтобы большие выборки не упирались в таймаут запроса.
+"""
+import logging
+import threading
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from datetime import timedelta
+from typing import Callable, Iterable, Iterator, Optional
+
+from django.conf import settings
+from django.db import close_old_connections, connection
+from django.utils import timezone
+
+from . import fts, suggest
+from .caching import bulk_change, bump_data_version
+from .models import ActionLog, BulkProgress, Employee
+from .utils import generate_passwords
+from .writes import run_write
+
+# Размер порции для массовых операций
+BULK_CHUNK_SIZE = getattr(settings, 'BULK_CHUNK_SIZE', 500)
+
+# Сколько секунд хранится информация о ходе операции
+PROGRESS_TIMEOUT = 3600
+
+# Сколько массовых операций выполняется в фоне одновременно
+BULK_MAX_WORKERS = getattr(settings, 'BULK_MAX_WORKERS', 1)
+
+app_logger = logging.getLogger('app')
+actions_logger = logging.getLogger('actions')
+
+_executor = None
+_executor_lock = threading.Lock()
+
+
+def new_progress_token() -> str:
+    """Новый токен для отслеживания хода массовой операции."""
+    return uuid.uuid4().hex
+
+
+def get_progress(token: str) -> Optional[dict]:
+    """
+    Возвращает ход массовой операции.
+
+    Returns:
+        dict | None: {'done', 'total', 'finished', 'error'} или None.
+    """
+    fresh = timezone.now() - timedelta(seconds=PROGRESS_TIMEOUT)
+    return (
+        BulkProgress.objects.filter(token=token, updated_at__gt=fresh)
+        .values('done', 'total', 'finished', 'error')
+        .first()
+    )
+
+
+def set_progress(
+    token: Optional[str], done: int, total: int, finished: bool = False
+) -> None:
+    """Сохраняет ход массовой операции (если задан токен)."""
+    if not token:
+        return
+    if not done:
+        # начало операции: заодно удаляем устаревшие записи
+        stale = timezone.now() - timedelta(seconds=PROGRESS_TIMEOUT)
+        BulkProgress.objects.filter(updated_at__lte=stale).delete()
+    BulkProgress.objects.update_or_create(
+        token=token,
+        defaults={'done': done, 'total': total, 'finished': finished},
+    )
+
+
+def fail_progress(token: Optional[str], error: str) -> None:
+    """Отмечает операцию завершённой с ошибкой."""
+    if token:
+        BulkProgress.objects.update_or_create(
+            token=token, defaults={'finished': True, 'error': error}
+        )
+
+
+def chunked(ids: Iterable[int], size: int = BULK_CHUNK_SIZE) -> Iterator:
+    """Разбивает список id на порции."""
+    ids = list(ids)
+    for start in range(0, len(ids), size):
+        yield ids[start:start + size]
+
+
+def iter_id_chunks(queryset, size: int = BULK_CHUNK_SIZE) -> Iterator:
+    """
+    Порции id строк набора, по возрастанию id.
+
+    Следующая порция читается по условию id > последнего id, поэтому
+    обработанные (удалённые или изменённые) строки не влияют на обход.
+    """
+    last_pk = 0
+    while True:
+        ids = list(
+            queryset.filter(pk__gt=last_pk)
+            .order_by('pk')
+            .values_list('pk', flat=True)[:size]
+        )
+        if not ids:
+            return
+        yield ids
+        last_pk = ids[-1]
+
+
+def run_in_chunks(
+    chunks: Iterable[list],
+    operation: Callable,
+    total: int,
+    token: Optional[str] = None,
+) -> int:
+    """
+    Выполняет операцию над порциями сотрудников.
+
+    Args:
+        chunks (Iterable[list[int]]): порции id.
+        operation (Callable): функция, получающая QuerySet порции,
+            например ``lambda qs: qs.delete()``.
+        total (int): общее количество (для отчёта о ходе).
+        token (str | None): токен для отслеживания хода.
+
+    Returns:
+        int: количество обработанных сотрудников.
+    """
+    done = 0
+    set_progress(token, done, total)
+    for ids in chunks:
+        run_write(_apply, operation, ids)
+        done += len(ids)
+        set_progress(token, done, total)
+    set_progress(token, done, total, finished=True)
+    return done
+
+
+def _apply(operation: Callable, ids: list) -> None:
+    # версия данных увеличивается внутри той же транзакции записи
+    with bulk_change():
+        operation(Employee.objects.filter(pk__in=ids))
+        # сигналы удаления внутри bulk_change() индексы не трогают:
+        # удалённые строки убираются из индексов один раз на порцию
+        remaining = set(
+            Employee.objects.filter(pk__in=ids).values_list('pk', flat=True)
+        )
+        deleted = [pk for pk in ids if pk not in remaining]
+        if deleted:
+            fts.unindex_employees(deleted)
+            suggest.remove_employees(deleted)
+
+
+def delete_employees(
+    queryset=None,
+    ids: Optional[Iterable[int]] = None,
+    token: Optional[str] = None,
+) -> int:
+    """
+    Удаляет сотрудников порциями: по запросу или по списку id.
+
+    Args:
+        queryset (QuerySet | None): набор сотрудников (например,
+            результат канонического поискового запроса).
+        ids (Iterable[int] | None): явный список id.
+        token (str | None): токен для отслеживания хода.
+
+    Returns:
+        int: количество удалённых сотрудников.
+    """
+    if queryset is not None:
+        total = queryset.count()
+        chunks = iter_id_chunks(queryset)
+    else:
+        ids = list(ids or [])
+        total = len(ids)
+        # отбрасываем id, которых уже нет в базе
+        chunks = (
+            list(
+                Employee.objects.filter(pk__in=part).values_list(
+                    'pk', flat=True
+                )
+            )
+            for part in chunked(ids)
+        )
+    return run_in_chunks(chunks, lambda qs: qs.delete(), total, token)
+
+
+def _get_executor() -> ThreadPoolExecutor:
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(
+                max_workers=BULK_MAX_WORKERS,
+                thread_name_prefix='bulk',
+            )
+        return _executor
+
+
+def start_delete(
+    queryset=None,
+    ids: Optional[Iterable[int]] = None,
+    token: Optional[str] = None,
+    user=None,
+) -> str:
+    """
+    Ставит удаление сотрудников в очередь фонового потока.
+
+    Args:
+        queryset (QuerySet | None): набор сотрудников.
+        ids (Iterable[int] | None): явный список id.
+        token (str | None): токен хода (новый, если не задан).
+        user (User | None): кто запустил удаление (для журнала).
+
+    Returns:
+        str: токен для опроса get_progress().
+    """
+    token = token or new_progress_token()
+    set_progress(token, 0, 0)
+    ids = None if ids is None else list(ids)
+    _get_executor().submit(_run_delete, queryset, ids, token, user)
+    return token
+
+
+def _run_delete(queryset, ids, token: str, user) -> None:
+    """Выполняет удаление в потоке пула."""
+    close_old_connections()
+    try:
+        deleted = delete_employees(queryset, ids, token)
+        actions_logger.info("%s удалил сотрудников: %s", user, deleted)
+    except Exception as exc:
+        app_logger.exception('Ошибка фонового удаления %s', token)
+        fail_progress(token, str(exc))
+    finally:
+        connection.close()
+
+
+def rotate_passwords(
+    queryset, user=None, token: Optional[str] = None
+) -> list:
+    """
+    Меняет пароли работающих сотрудников набора порциями.
+
+    Пароли порции генерируются одним вызовом generate_passwords и
+    записываются одним bulk_update; в журнал действий пишется одна
+    запись на порцию. Заблокированные сотрудники пропускаются.
+
+    Args:
+        queryset (QuerySet): набор сотрудников (регион, результат
+            поиска или выбранные в админке).
+        user (User | None): пользователь для журнала действий.
+        token (str | None): токен для отслеживания хода.
+
+    Returns:
+        list[int]: id сотрудников, которым сменён пароль.
+    """
+    queryset = queryset.filter(status='active')
+    rotated = []
+
+    def rotate(chunk):
+        employees = list(chunk.only('pk'))
+        now = timezone.now()
+        passwords = generate_passwords(len(employees))
+        for employee, password in zip(employees, passwords):
+            employee.password = password
+            # auto_now не срабатывает в bulk_update
+            employee.updated_at = now
+        Employee.objects.bulk_update(employees, ['password', 'updated_at'])
+        ActionLog.objects.create(
+            user=user,
+            action='Смена паролей',
+            employee=(
+                f'{len(employees)} сотрудников, id '
+                f'{employees[0].pk}–{employees[-1].pk}'
+            ),
+        )
+        # bulk_update не вызывает сигналы
+        bump_data_version()
+        rotated.extend(employee.pk for employee in employees)
+
+    run_in_chunks(iter_id_chunks(queryset), rotate, queryset.count(), token)
+    return rotated
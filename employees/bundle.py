@@ -0,0 +1,189 @@
+"""
+Выгрузка реестра архивом: отдельная книга XLSX на каждый регион.
+
+Выборка разбивается по region_id, книги регионов строятся
+параллельно в общем для процесса пуле из EXPORT_BUNDLE_WORKERS
+процессов (одновременные скачивания делят его, а не создают свои), а
+готовые файлы сразу отправляются клиенту в ZIP-архиве, который пишется
+потоком без сборки целиком.
+"""
+import multiprocessing
+import os
+import shutil
+import tempfile
+import threading
+import zipfile
+from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from concurrent.futures.process import BrokenProcessPool
+from typing import Iterable, Iterator
+
+import django
+from django.conf import settings
+from django.db import connections
+from django.utils.text import get_valid_filename
+
+from .exports import (
+    EXPORT_SNAPSHOT_CHUNK,
+    iter_rows,
+    iter_snapshot_ids,
+    write_xlsx,
+)
+from .models import Employee, Region
+
+# Сколько процессов строят книги регионов одновременно (на все
+# скачивания процесса веб-сервера вместе)
+EXPORT_BUNDLE_WORKERS = getattr(
+    settings, 'EXPORT_BUNDLE_WORKERS', min(4, os.cpu_count() or 1)
+)
+
+# Размер порции при копировании файлов в архив
+ZIP_COPY_CHUNK = 1024 * 1024
+
+_pool = None
+_pool_lock = threading.Lock()
+
+
+def _group(pairs: Iterable[tuple]) -> dict:
+    groups = defaultdict(list)
+    for region_id, pk in pairs:
+        groups[region_id].append(pk)
+    return dict(groups)
+
+
+def group_by_region(queryset) -> dict:
+    """
+    Группирует id выборки по региону одним проходом курсора.
+
+    Returns:
+        dict: {region_id: [id, ...]} с id по возрастанию.
+    """
+    pairs = queryset.order_by('pk').values_list('region_id', 'pk')
+    return _group(pairs.iterator(chunk_size=EXPORT_SNAPSHOT_CHUNK))
+
+
+def group_snapshot_by_region(snapshot: dict) -> dict:
+    """
+    Группирует id снимка выборки по региону (запрос на порцию id).
+
+    Raises:
+        LookupError: снимок удалён как истёкший.
+    """
+    return _group(
+        pair
+        for ids in iter_snapshot_ids(snapshot)
+        for pair in Employee.objects.filter(pk__in=ids)
+        .order_by('pk')
+        .values_list('region_id', 'pk')
+    )
+
+
+def _get_pool() -> ProcessPoolExecutor:
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            # spawn: процессы не копируют потоки и соединения веб-сервера.
+            # Инициализатор — сам django.setup: функция из этого модуля
+            # импортировала бы модели до настройки Django
+            _pool = ProcessPoolExecutor(
+                max_workers=EXPORT_BUNDLE_WORKERS,
+                mp_context=multiprocessing.get_context('spawn'),
+                initializer=django.setup,
+            )
+        return _pool
+
+
+def _reset_pool(pool: ProcessPoolExecutor) -> None:
+    # после падения процесса пул непригоден; следующий запрос создаст новый
+    global _pool
+    with _pool_lock:
+        if _pool is pool:
+            _pool = None
+    pool.shutdown(wait=False, cancel_futures=True)
+
+
+def _build_region(path: str, ids: list) -> str:
+    """Строит книгу региона в процессе пула и возвращает путь к ней."""
+    rows = (
+        row
+        for start in range(0, len(ids), EXPORT_SNAPSHOT_CHUNK)
+        for row in iter_rows(
+            Employee.objects.filter(
+                pk__in=ids[start:start + EXPORT_SNAPSHOT_CHUNK]
+            )
+        )
+    )
+    try:
+        with open(path, 'wb') as fileobj:
+            write_xlsx(rows, fileobj)
+    finally:
+        connections.close_all()
+    return path
+
+
+class _ZipStream:
+    """Несмещаемый файл для zipfile: накапливает байты до выдачи."""
+
+    def __init__(self):
+        self._parts = []
+
+    def write(self, data):
+        self._parts.append(bytes(data))
+        return len(data)
+
+    def flush(self):
+        pass
+
+    def pop(self) -> bytes:
+        data = b''.join(self._parts)
+        self._parts = []
+        return data
+
+
+def iter_region_bundle(groups: dict) -> Iterator[bytes]:
+    """
+    ZIP-архив с книгами регионов потоком.
+
+    Книги строятся параллельно в общем пуле процессов; каждая готовая
+    книга сразу дописывается в архив, поэтому первые байты уходят
+    клиенту после первого построенного региона. XLSX уже сжат, поэтому
+    файлы кладутся в архив без повторного сжатия.
+
+    Args:
+        groups (dict): {region_id: [id, ...]} из group_by_region().
+
+    Yields:
+        bytes: очередная часть архива.
+    """
+    names = {
+        region.pk: get_valid_filename(f'{region.name}.xlsx')
+        for region in Region.objects.filter(pk__in=list(groups))
+    }
+    workdir = tempfile.mkdtemp(prefix='export_bundle_')
+    stream = _ZipStream()
+    pool = _get_pool()
+    futures = {}
+    try:
+        with zipfile.ZipFile(stream, 'w') as archive:
+            for region_id, ids in groups.items():
+                path = os.path.join(workdir, f'{region_id}.xlsx')
+                futures[pool.submit(_build_region, path, ids)] = region_id
+            for future in as_completed(futures):
+                path = future.result()
+                arcname = names.get(futures[future], os.path.basename(path))
+                with open(path, 'rb') as src, archive.open(
+                    arcname, 'w', force_zip64=True
+                ) as dest:
+                    while chunk := src.read(ZIP_COPY_CHUNK):
+                        dest.write(chunk)
+                        yield stream.pop()
+                os.remove(path)
+        yield stream.pop()
+    except BrokenProcessPool:
+        _reset_pool(pool)
+        raise
+    finally:
+        # клиент отключился или ошибка: не строить оставшиеся книги
+        for future in futures:
+            future.cancel()
+        shutil.rmtree(workdir, ignore_errors=True)
@@ -0,0 +1,202 @@
+"""
+Версия данных сотрудников и кэш результатов поиска.
+
+Ключ кэша строится из канонического набора фильтров и текущей версии
+данных. Любое изменение сотрудников увеличивает версию, поэтому старые
+записи просто перестают запрашиваться и вытесняются по таймауту.
+"""
+import hashlib
+import json
+import threading
+from contextlib import contextmanager
+from typing import Optional
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import Count, F
+from django.utils import timezone
+
+from .models import DataVersion, Employee
+
+# Время жизни записей кэша поиска (секунды)
+SEARCH_CACHE_TIMEOUT = getattr(settings, 'SEARCH_CACHE_TIMEOUT', 600)
+
+# Для больших выборок список id не кэшируется, только общее количество
+SEARCH_CACHE_MAX_IDS = getattr(settings, 'SEARCH_CACHE_MAX_IDS', 20000)
+
+_local = threading.local()
+
+
+def get_data_version() -> int:
+    """
+    Возвращает текущую версию данных сотрудников.
+
+    Returns:
+        int: номер версии (0, если данные ещё не менялись).
+    """
+    return (
+        DataVersion.objects.filter(pk=1)
+        .values_list('version', flat=True)
+        .first()
+        or 0
+    )
+
+
+def bump_data_version() -> None:
+    """
+    Увеличивает версию данных сотрудников.
+
+    Внутри блока ``bulk_change()`` увеличение откладывается до выхода
+    из внешнего блока и выполняется один раз.
+    """
+    if getattr(_local, 'depth', 0):
+        _local.dirty = True
+        return
+    updated = DataVersion.objects.filter(pk=1).update(
+        version=F('version') + 1, changed_at=timezone.now()
+    )
+    if not updated:
+        DataVersion.objects.get_or_create(pk=1, defaults={'version': 1})
+
+
+def in_bulk_change() -> bool:
+    """Выполняется ли код внутри блока bulk_change()."""
+    return bool(getattr(_local, 'depth', 0))
+
+
+@contextmanager
+def bulk_change():
+    """
+    Группирует массовые изменения: версия увеличивается один раз.
+
+    Внутри блока сигнал удаления сотрудника не обновляет поисковые
+    индексы построчно: вызывающий код удаляет строки индексов сразу
+    для всей порции (см. bulk._apply).
+
+    Пример:
+        with bulk_change():
+            employees.delete()
+    """
+    _local.depth = getattr(_local, 'depth', 0) + 1
+    try:
+        yield
+    finally:
+        _local.depth -= 1
+        if not _local.depth and getattr(_local, 'dirty', False):
+            _local.dirty = False
+            bump_data_version()
+
+
+def make_key(prefix: str, params: dict, version: int) -> str:
+    """
+    Строит ключ кэша для канонического набора параметров.
+
+    Args:
+        prefix (str): тип записи (search, facets, ...).
+        params (dict): канонические параметры запроса.
+        version (int): версия данных.
+
+    Returns:
+        str: ключ кэша.
+    """
+    raw = json.dumps(params, sort_keys=True, ensure_ascii=False)
+    digest = hashlib.sha1(raw.encode()).hexdigest()
+    return f'employees:{prefix}:v{version}:{digest}'
+
+
+def search_results(canon: dict, queryset, ordering) -> dict:
+    """
+    Возвращает упорядоченный список id и общее число найденных.
+
+    При попадании в кэш таблица сотрудников не читается.
+
+    Args:
+        canon (dict): канонические фильтры (без курсора страницы).
+        queryset (QuerySet): отфильтрованный набор сотрудников.
+        ordering (tuple[str]): порядок сортировки результата.
+
+    Returns:
+        dict: {'ids': list[int] | None, 'total': int, 'version': int};
+            ids = None, если выборка больше SEARCH_CACHE_MAX_IDS.
+    """
+    version = get_data_version()
+    key = make_key('search', canon, version)
+    result = cache.get(key)
+    if result is not None:
+        return result
+
+    ids: Optional[list] = list(
+        queryset.order_by(*ordering).values_list('pk', flat=True)[
+            : SEARCH_CACHE_MAX_IDS + 1
+        ]
+    )
+    if len(ids) > SEARCH_CACHE_MAX_IDS:
+        total = queryset.count()
+        ids = None
+    else:
+        total = len(ids)
+
+    result = {'ids': ids, 'total': total, 'version': version}
+    cache.set(key, result, SEARCH_CACHE_TIMEOUT)
+    return result
+
+
+def facet_counts(
+    canon: dict, queryset, version: Optional[int] = None
+) -> dict:
+    """
+    Считает сотрудников по статусам и регионам одним GROUP BY запросом.
+
+    Результат кэшируется с той же версией данных, что и результаты
+    поиска.
+
+    Args:
+        canon (dict): канонические фильтры (без курсора страницы).
+        queryset (QuerySet): отфильтрованный набор сотрудников.
+        version (int | None): уже прочитанная версия данных.
+
+    Returns:
+        dict: {'status': [...], 'region': [...]}, элементы — словари
+            с ключами value, label, count (по убыванию count).
+    """
+    if version is None:
+        version = get_data_version()
+    key = make_key('facets', canon, version)
+    facets = cache.get(key)
+    if facets is not None:
+        return facets
+
+    rows = (
+        queryset.order_by()
+        .values('status', 'region', 'region__name')
+        .annotate(count=Count('pk'))
+    )
+    statuses = dict(Employee.STATUSES)
+    by_status = {}
+    by_region = {}
+    for row in rows:
+        status = by_status.setdefault(
+            row['status'],
+            {
+                'value': row['status'],
+                'label': statuses.get(row['status'], row['status']),
+                'count': 0,
+            },
+        )
+        status['count'] += row['count']
+        region = by_region.setdefault(
+            row['region'],
+            {
+                'value': str(row['region']),
+                'label': row['region__name'],
+                'count': 0,
+            },
+        )
+        region['count'] += row['count']
+
+    facets = {
+        'status': sorted(by_status.values(), key=lambda f: -f['count']),
+        'region': sorted(by_region.values(), key=lambda f: -f['count']),
+    }
+    cache.set(key, facets, SEARCH_CACHE_TIMEOUT)
+    return facets
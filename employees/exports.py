@@ -0,0 +1,317 @@
+"""
+Экспорт сотрудников.
+
+Страница подтверждения экспорта один раз выполняет фильтр и сохраняет
+найденные id в БД (снимок выборки, ExportSnapshot) под случайным
+токеном, поэтому экспорт может обработать любой процесс сервера. Экспорт
+по токену читает id порциями и выгружает ровно те строки, количество
+которых видел пользователь, не повторяя фильтрацию.
+
+Строки читаются кортежами значений (values_list) с JOIN региона и
+записываются в книгу openpyxl в режиме write-only, которая хранит лист
+во временном файле, поэтому память не зависит от числа строк. Форматы
+CSV и NDJSON формируются генераторами и отдаются потоком по мере
+чтения строк.
+"""
+import csv
+import json
+import tempfile
+import uuid
+from datetime import timedelta
+from typing import BinaryIO, Iterable, Iterator, Optional
+
+from django.conf import settings
+from django.utils import timezone
+from openpyxl import Workbook
+
+from .caching import get_data_version
+from .models import Employee, ExportSnapshot, ExportSnapshotPart
+from .writes import run_write
+
+# Сколько секунд действует снимок выборки для экспорта
+EXPORT_SNAPSHOT_TIMEOUT = getattr(settings, 'EXPORT_SNAPSHOT_TIMEOUT', 900)
+
+# Сколько id хранится в одной части снимка
+EXPORT_SNAPSHOT_CHUNK = 2000
+
+# Сколько строк читается из БД за один раз
+EXPORT_CHUNK_SIZE = getattr(settings, 'EXPORT_CHUNK_SIZE', 2000)
+
+# Колонки выгрузки: (заголовок, поле для values_list)
+EXPORT_COLUMNS = (
+    ('Фамилия', 'last_name'),
+    ('Имя', 'first_name'),
+    ('Отчество', 'patronymic'),
+    ('Регион', 'region__name'),
+    ('Дата записки', 'note_date'),
+    ('Номер записки', 'note_number'),
+    ('Логин', 'login'),
+    ('Пароль', 'password'),
+)
+EXPORT_HEADERS = [header for header, _field in EXPORT_COLUMNS]
+EXPORT_FIELDS = [field for _header, field in EXPORT_COLUMNS]
+
+# Колонки выгрузки учётных данных после смены паролей
+CREDENTIAL_COLUMNS = (
+    ('Фамилия', 'last_name'),
+    ('Имя', 'first_name'),
+    ('Отчество', 'patronymic'),
+    ('Регион', 'region__name'),
+    ('Логин', 'login'),
+    ('Пароль', 'password'),
+)
+CREDENTIAL_HEADERS = [header for header, _field in CREDENTIAL_COLUMNS]
+CREDENTIAL_FIELDS = [field for _header, field in CREDENTIAL_COLUMNS]
+
+# Ключи объектов NDJSON: имена полей модели; название региона — под
+# прежним ключом region_name
+NDJSON_KEYS = [
+    'region_name' if field == 'region__name' else field.split('__')[0]
+    for field in EXPORT_FIELDS
+]
+
+XLSX_CONTENT_TYPE = (
+    'application/vnd.openxmlformats-officedocument.spreadsheetml.sheet'
+)
+
+# Форматы выгрузки: формат -> (Content-Type, расширение файла)
+EXPORT_FORMATS = {
+    'xlsx': (XLSX_CONTENT_TYPE, 'xlsx'),
+    'csv': ('text/csv; charset=utf-8', 'csv'),
+    'ndjson': ('application/x-ndjson; charset=utf-8', 'ndjson'),
+    # архив с отдельной книгой на каждый регион (employees.bundle)
+    'zip': ('application/zip', 'zip'),
+}
+
+
+def _snapshot_dict(snapshot: ExportSnapshot) -> dict:
+    return {
+        'token': snapshot.token,
+        'count': snapshot.count,
+        'chunks': snapshot.chunks,
+        'user_id': snapshot.user_id,
+        'query': snapshot.query,
+        'version': snapshot.version,
+        'taken_at': snapshot.taken_at.isoformat(),
+    }
+
+
+def _save_snapshot(snapshot: ExportSnapshot, parts: list) -> None:
+    # истёкшие снимки удаляются вместе с частями (по индексу expires_at)
+    ExportSnapshot.objects.filter(expires_at__lte=timezone.now()).delete()
+    snapshot.save()
+    ExportSnapshotPart.objects.bulk_create(
+        ExportSnapshotPart(snapshot=snapshot, number=number, ids=ids)
+        for number, ids in enumerate(parts)
+    )
+
+
+def create_snapshot(queryset, user, query: Optional[dict] = None) -> dict:
+    """
+    Сохраняет id найденных сотрудников в снимок выборки.
+
+    Id читаются курсором (без загрузки моделей) в порядке первичного
+    ключа и сохраняются одной транзакцией записи порциями по
+    EXPORT_SNAPSHOT_CHUNK.
+
+    Args:
+        queryset (QuerySet): отфильтрованный набор сотрудников.
+        user (User): пользователь, которому выдаётся снимок.
+        query (dict | None): канонические параметры фильтра.
+
+    Returns:
+        dict: {'token', 'count', 'chunks', 'user_id', 'query',
+            'version', 'taken_at'}; версия и время — до чтения id.
+    """
+    version = get_data_version()
+    taken_at = timezone.now()
+    ids = queryset.order_by('pk').values_list('pk', flat=True)
+    parts = []
+    count = 0
+    for pk in ids.iterator(chunk_size=EXPORT_SNAPSHOT_CHUNK):
+        if not parts or len(parts[-1]) == EXPORT_SNAPSHOT_CHUNK:
+            parts.append([])
+        parts[-1].append(pk)
+        count += 1
+
+    snapshot = ExportSnapshot(
+        token=uuid.uuid4().hex,
+        user=user,
+        count=count,
+        chunks=len(parts),
+        query=query or {},
+        version=version,
+        taken_at=taken_at,
+        expires_at=taken_at + timedelta(seconds=EXPORT_SNAPSHOT_TIMEOUT),
+    )
+    run_write(_save_snapshot, snapshot, parts)
+    return _snapshot_dict(snapshot)
+
+
+def get_snapshot(token: str, user) -> Optional[dict]:
+    """
+    Возвращает снимок выборки, выданный этому пользователю.
+
+    Returns:
+        dict | None: описание снимка или None, если токен неизвестен,
+            истёк или принадлежит другому пользователю.
+    """
+    if not token:
+        return None
+    snapshot = ExportSnapshot.objects.filter(
+        token=token, user=user.pk, expires_at__gt=timezone.now()
+    ).first()
+    return _snapshot_dict(snapshot) if snapshot else None
+
+
+def iter_snapshot_ids(snapshot: dict) -> Iterator[list]:
+    """
+    Порции id снимка в порядке сохранения.
+
+    Raises:
+        LookupError: снимок удалён как истёкший.
+    """
+    parts = ExportSnapshotPart.objects.filter(
+        snapshot__token=snapshot['token']
+    )
+    for part in range(snapshot['chunks']):
+        ids = parts.filter(number=part).values_list('ids', flat=True).first()
+        if ids is None:
+            raise LookupError(f"Снимок {snapshot['token']} устарел")
+        yield ids
+
+
+def snapshot_is_complete(snapshot: dict) -> bool:
+    """
+    Проверяет, что снимок ещё не истёк и все его части на месте.
+
+    Нужна перед потоковой выдачей: после отправки заголовков ответа
+    сообщить об устаревшем снимке уже нельзя.
+    """
+    parts = ExportSnapshotPart.objects.filter(
+        snapshot__token=snapshot['token'],
+        snapshot__expires_at__gt=timezone.now(),
+    )
+    return parts.count() == snapshot['chunks']
+
+
+def iter_rows(queryset) -> Iterator[tuple]:
+    """
+    Строки выгрузки для набора сотрудников, в порядке id.
+
+    Читает кортежи значений курсором порциями по EXPORT_CHUNK_SIZE,
+    регион подставляется через JOIN.
+    """
+    rows = queryset.order_by('pk').values_list(*EXPORT_FIELDS)
+    yield from rows.iterator(chunk_size=EXPORT_CHUNK_SIZE)
+
+
+def iter_credential_rows(ids: Iterable[int]) -> Iterator[tuple]:
+    """
+    Строки CREDENTIAL_COLUMNS для списка id: один запрос на порцию.
+    """
+    ids = list(ids)
+    for start in range(0, len(ids), EXPORT_CHUNK_SIZE):
+        part = ids[start:start + EXPORT_CHUNK_SIZE]
+        rows = (
+            Employee.objects.filter(pk__in=part)
+            .order_by('pk')
+            .values_list(*CREDENTIAL_FIELDS)
+        )
+        yield from rows
+
+
+def iter_snapshot_rows(snapshot: dict) -> Iterator[tuple]:
+    """
+    Строки выгрузки для снимка: один запрос на порцию id.
+
+    Сотрудники, удалённые после подтверждения, пропускаются.
+    """
+    for ids in iter_snapshot_ids(snapshot):
+        yield from iter_rows(Employee.objects.filter(pk__in=ids))
+
+
+def write_xlsx(rows: Iterable[tuple], fileobj: BinaryIO) -> int:
+    """
+    Записывает строки выгрузки в XLSX (openpyxl write-only).
+
+    Args:
+        rows (Iterable[tuple]): строки в порядке EXPORT_COLUMNS.
+        fileobj (BinaryIO): файл для записи.
+
+    Returns:
+        int: количество записанных строк.
+    """
+    wb = Workbook(write_only=True)
+    ws = wb.create_sheet('Сотрудники')
+    ws.append(EXPORT_HEADERS)
+    count = 0
+    for row in rows:
+        # пустые отчество и дата записки — пустые ячейки
+        ws.append(['' if value is None else value for value in row])
+        count += 1
+    wb.save(fileobj)
+    return count
+
+
+def build_xlsx(rows: Iterable[tuple]) -> BinaryIO:
+    """
+    Собирает XLSX во временном файле и возвращает его с начала.
+
+    XLSX — zip-архив, оглавление которого пишется при сохранении,
+    поэтому файл собирается целиком на диске, а клиенту отдаётся
+    потоком порциями (FileResponse).
+    """
+    fileobj = tempfile.TemporaryFile()
+    try:
+        write_xlsx(rows, fileobj)
+    except BaseException:
+        fileobj.close()
+        raise
+    fileobj.seek(0)
+    return fileobj
+
+
+class _Echo:
+    """Псевдофайл для csv.writer: возвращает строку вместо записи."""
+
+    def write(self, value):
+        return value
+
+
+def _batched(lines: Iterable[str], size: int = EXPORT_CHUNK_SIZE):
+    # отдаём ответ крупными порциями, а не по строке
+    batch = []
+    for line in lines:
+        batch.append(line)
+        if len(batch) >= size:
+            yield ''.join(batch)
+            batch = []
+    if batch:
+        yield ''.join(batch)
+
+
+def iter_csv(
+    rows: Iterable[tuple], headers: Iterable[str] = EXPORT_HEADERS
+) -> Iterator[str]:
+    """
+    Выгрузка в CSV потоком.
+
+    Первой строкой идёт BOM, чтобы Excel открывал файл в UTF-8.
+    Пустые значения выгружаются пустыми полями, даты — в ISO-формате.
+    """
+    writer = csv.writer(_Echo())
+    yield '\ufeff' + writer.writerow(headers)
+    yield from _batched(writer.writerow(row) for row in rows)
+
+
+def iter_ndjson(rows: Iterable[tuple]) -> Iterator[str]:
+    """
+    Выгрузка в NDJSON потоком: один JSON-объект на строку.
+
+    Ключи — имена полей модели (NDJSON_KEYS), пустые значения — null.
+    """
+    dumps = json.JSONEncoder(ensure_ascii=False, default=str).encode
+    yield from _batched(
+        dumps(dict(zip(NDJSON_KEYS, row))) + '\n' for row in rows
+    )
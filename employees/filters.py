@@ -0,0 +1,172 @@
+"""
+Единый слой фильтрации сотрудников.
+
+Параметры запроса (GET поиска, экспорта, API) приводятся к
+каноническому виду и компилируются в условие Q, которое использует
+индексы: полнотекстовый lookup ``fts`` для ФИО и номера записки,
+сравнение по *_id без JOIN для регионов. Скомпилированный план
+запоминается для каждого канонического запроса.
+"""
+from datetime import datetime, time, timedelta
+from functools import lru_cache
+from urllib.parse import urlencode
+
+from django.db.models import Q
+from django.utils import timezone
+from django.utils.dateparse import parse_date, parse_datetime
+
+from .models import Employee
+
+# Сколько скомпилированных запросов хранить в памяти процесса
+COMPILED_CACHE_SIZE = 512
+
+
+def _text(value):
+    return value.strip() or None
+
+
+def _id(value):
+    value = value.strip()
+    return value if value.isdigit() else None
+
+
+def _date(value):
+    try:
+        date = parse_date(value.strip())
+    except ValueError:
+        return None
+    return date.isoformat() if date else None
+
+
+def _datetime(value):
+    # метка времени ISO 8601 (или дата — с начала суток)
+    value = value.strip()
+    try:
+        moment = parse_datetime(value)
+        if moment is None and parse_date(value):
+            moment = parse_datetime(f'{value}T00:00')
+    except ValueError:
+        return None
+    if moment is None:
+        return None
+    if timezone.is_naive(moment):
+        moment = timezone.make_aware(moment)
+    return moment.isoformat()
+
+
+def _status(value):
+    return value if value in dict(Employee.STATUSES) else None
+
+
+def _day(field):
+    """
+    Условие «дата поля = день» полуоткрытым интервалом [начало суток,
+    начало следующих суток) в текущем часовом поясе.
+
+    В отличие от lookup ``__date`` колонка не оборачивается в функцию,
+    поэтому условие обслуживается индексом.
+    """
+
+    def condition(value):
+        day = datetime.strptime(value, '%Y-%m-%d').date()
+        start = timezone.make_aware(datetime.combine(day, time.min))
+        end = timezone.make_aware(
+            datetime.combine(day + timedelta(days=1), time.min)
+        )
+        return Q(**{f'{field}__gte': start, f'{field}__lt': end})
+
+    return condition
+
+
+# Параметр -> (разбор значения, lookup или функция значение -> Q).
+# Порядок задаёт канонический URL.
+FILTERS = {
+    'last_name': (_text, 'last_name__fts'),
+    'first_name': (_text, 'first_name__fts'),
+    'patronymic': (_text, 'patronymic__fts'),
+    'region_name': (_id, 'region_id'),
+    'note_date': (_date, 'note_date'),
+    'note_number': (_text, 'note_number__fts'),
+    'status': (_status, 'status'),
+    'created_at': (_date, _day('created_at')),
+    # изменённые (в т.ч. созданные и заблокированные) после метки
+    'since': (_datetime, 'updated_at__gt'),
+}
+
+# Синонимы параметров (employees_by_region передаёт ?region=<id>;
+# region_code — прежнее второе поле региона)
+ALIASES = {'region': 'region_name', 'region_code': 'region_name'}
+
+
+class CompiledQuery:
+    """Скомпилированный фильтр для канонического набора параметров."""
+
+    def __init__(self, canon, condition):
+        self.canon = canon
+        self.condition = condition
+
+    def __bool__(self):
+        return bool(self.canon)
+
+    def apply(self, queryset):
+        """Применяет фильтр к набору сотрудников."""
+        return queryset.filter(self.condition)
+
+    @property
+    def querystring(self) -> str:
+        """Канонический query string (без курсора страницы)."""
+        return urlencode(self.canon)
+
+
+@lru_cache(maxsize=COMPILED_CACHE_SIZE)
+def _compile(items: tuple) -> CompiledQuery:
+    condition = Q()
+    for param, value in items:
+        lookup = FILTERS[param][1]
+        if callable(lookup):
+            condition &= lookup(value)
+        else:
+            condition &= Q(**{lookup: value})
+    return CompiledQuery(dict(items), condition)
+
+
+def canonicalize(params) -> dict:
+    """
+    Приводит параметры запроса к каноническому виду.
+
+    Пустые, неизвестные и некорректные параметры отбрасываются.
+
+    Args:
+        params (QueryDict | dict): параметры запроса.
+
+    Returns:
+        dict: канонические параметры в порядке FILTERS.
+    """
+    parsed = {}
+    for name, value in params.items():
+        param = ALIASES.get(name, name)
+        if param not in FILTERS or not isinstance(value, str):
+            continue
+        value = FILTERS[param][0](value)
+        if value is not None:
+            parsed[param] = value
+    return {param: parsed[param] for param in FILTERS if param in parsed}
+
+
+def compile_query(params) -> CompiledQuery:
+    """
+    Компилирует параметры запроса в фильтр сотрудников.
+
+    Используется поиском, подтверждением экспорта, экспортом,
+    массовыми операциями и API, поэтому количество на странице
+    подтверждения и выгруженные строки получаются одним и тем же
+    запросом.
+
+    Args:
+        params (QueryDict | dict): параметры запроса.
+
+    Returns:
+        CompiledQuery: канонические параметры и условие фильтра.
+    """
+    canon = canonicalize(params)
+    return _compile(tuple(canon.items()))
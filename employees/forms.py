@@ -7,12 +7,16 @@ from django.utils import timezone
 from .models import Employee, Region
 
 
+# Русские буквы, первая — заглавная (используется и при импорте)
+RUSSIAN_NAME_RE = r"^[А-ЯЁ][а-яё]+$"
+
+
 def validate_russian_name(value):
     """
     Валидатор для ФИО:
     разрешает только русские буквы, первая буква — заглавная.
     """
-    if not re.match(r"^[А-ЯЁ][а-яё]+$", value):
+    if not re.match(RUSSIAN_NAME_RE, value):
         raise ValidationError(
             "Разрешены только русские буквы. "
             "Первая буква должна быть заглавной."
@@ -57,6 +61,18 @@ class EmployeeForm(forms.ModelForm):
             }
         ),
     )
+    # поле формы сохраняет прежнее имя region_name (шаблоны и сохранённые
+    # в сессии данные правки), в модели это поле region
+    region_name = forms.ModelChoiceField(
+        queryset=Region.objects.all(),
+        label="Регион",
+        widget=forms.Select(
+            attrs={
+                "class": "w-full border rounded-md px-3 py-2 h-10 shadow-sm "
+                         "focus:ring focus:ring-indigo-200 focus:border-indigo-500",
+            }
+        ),
+    )
     note_date = forms.DateField(
         label="Дата служебной записки",
         widget=forms.DateInput(
@@ -87,18 +103,11 @@ class EmployeeForm(forms.ModelForm):
             "last_name",
             "first_name",
             "patronymic",
-            "region_name",
             "note_date",
             "note_number",
             "status",
         ]
         widgets = {
-            "region_name": forms.Select(
-                attrs={
-                    "class": "w-full border rounded-md px-3 py-2 h-10 shadow-sm "
-                             "focus:ring focus:ring-indigo-200 focus:border-indigo-500",
-                }
-            ),
             "status": forms.Select(
                 attrs={
                     "class": "w-full border rounded-md px-3 py-2 h-10 shadow-sm "
@@ -107,6 +116,28 @@ class EmployeeForm(forms.ModelForm):
             ),
         }
 
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        if self.instance.region_id:
+            self.fields["region_name"].initial = self.instance.region_id
+        # порядок полей — как до объединения region_name/region_code
+        self.order_fields(
+            ["last_name", "first_name", "patronymic", "region_name"]
+        )
+
+    def clean(self):
+        """
+        Переносит регион в сотрудника.
+
+        Поле region не входит в Meta.fields, поэтому дубликат ФИО в
+        регионе не проверяется отдельным запросом: его отклоняет
+        ограничение employee_unique_person при сохранении.
+        """
+        cleaned_data = super().clean()
+        if cleaned_data.get("region_name"):
+            self.instance.region = cleaned_data["region_name"]
+        return cleaned_data
+
     def clean_note_date(self):
         """Не допускаем будущую дату."""
         date = self.cleaned_data.get("note_date")
@@ -0,0 +1,80 @@
+"""
+Рендеринг строк таблицы сотрудников с кэшированием фрагментов.
+
+Каждая строка кэшируется по ключу (id сотрудника, версия данных, права
+пользователя), поэтому при листании страниц готовый HTML берётся из
+кэша, а шаблон строки выполняется только для изменившихся сотрудников.
+Адрес возврата (prev_url) подставляется после сборки строк, чтобы одна
+и та же строка подходила для любой страницы списка.
+"""
+from urllib.parse import quote
+
+from django.conf import settings
+from django.core.cache import cache
+from django.template.loader import get_template
+from django.utils.safestring import mark_safe
+
+ROW_TEMPLATE = 'employee_row.html'
+ROW_CACHE_TIMEOUT = getattr(settings, 'ROW_CACHE_TIMEOUT', 3600)
+
+# Заменяется на закодированный prev_url после сборки строк
+PREV_URL_PLACEHOLDER = '__prev_url__'
+
+
+def row_permissions(user) -> tuple:
+    """
+    Права, от которых зависит разметка строки.
+
+    Returns:
+        tuple[bool, bool]: (может редактировать, может удалять).
+    """
+    can_delete = user.is_admin()
+    return can_delete or user.is_manager(), can_delete
+
+
+def render_rows(employees, user, prev_url: str, version: int) -> str:
+    """
+    Возвращает HTML строк <tr> для списка сотрудников.
+
+    Args:
+        employees (Iterable[Employee]): сотрудники страницы
+            (с select_related регионов).
+        user (User): текущий пользователь.
+        prev_url (str): адрес возврата для ссылок действий.
+        version (int): текущая версия данных сотрудников.
+
+    Returns:
+        str: безопасная HTML-строка.
+    """
+    can_edit, can_delete = row_permissions(user)
+    suffix = f'{int(can_edit)}{int(can_delete)}'
+    keys = {
+        emp.pk: f'employees:row:v{version}:{emp.pk}:{suffix}'
+        for emp in employees
+    }
+    cached = cache.get_many(list(keys.values()))
+
+    template = None
+    rendered = {}
+    parts = []
+    for emp in employees:
+        key = keys[emp.pk]
+        html = cached.get(key)
+        if html is None:
+            template = template or get_template(ROW_TEMPLATE)
+            html = template.render(
+                {
+                    'emp': emp,
+                    'can_edit': can_edit,
+                    'can_delete': can_delete,
+                    'prev_url': PREV_URL_PLACEHOLDER,
+                }
+            )
+            rendered[key] = html
+        parts.append(html)
+
+    if rendered:
+        cache.set_many(rendered, ROW_CACHE_TIMEOUT)
+    return mark_safe(
+        ''.join(parts).replace(PREV_URL_PLACEHOLDER, quote(prev_url, safe='/'))
+    )
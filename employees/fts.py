@@ -0,0 +1,183 @@
+"""
+Полнотекстовый индекс сотрудников на SQLite FTS5.
+
+Теневая таблица хранит нормализованные (нижний регистр, ё → е) ФИО,
+номер служебной записки и логин; rowid совпадает с id сотрудника.
+Поиск выполняется через lookup ``fts`` (например,
+``Employee.objects.filter(last_name__fts='иван')``), который на SQLite
+превращается в MATCH по индексу, а на остальных СУБД — в icontains.
+"""
+import re
+from typing import Iterable, Optional
+
+from django.db import connections
+from django.db.models import Lookup
+from django.db.models.lookups import IContains
+
+FTS_TABLE = 'employees_employee_fts'
+FTS_COLUMNS = ('last_name', 'first_name', 'patronymic', 'note_number', 'login')
+
+# remove_diacritics 0: иначе unicode61 сворачивает «й» в «и»
+CREATE_FTS_SQL = (
+    f'CREATE VIRTUAL TABLE IF NOT EXISTS {FTS_TABLE} USING fts5('
+    f"{', '.join(FTS_COLUMNS)}, "
+    "tokenize = 'unicode61 remove_diacritics 0')"
+)
+DROP_FTS_SQL = f'DROP TABLE IF EXISTS {FTS_TABLE}'
+
+# Сколько строк индекса удаляется одним запросом
+FTS_DELETE_BATCH = 500
+
+_TOKEN_RE = re.compile(r'[^\W_]+')
+
+
+def normalize(value: Optional[str]) -> str:
+    """
+    Нормализует текст для индекса и поисковых запросов.
+
+    Args:
+        value (str | None): исходная строка.
+
+    Returns:
+        str: строка в нижнем регистре с заменой «ё» на «е».
+    """
+    return (value or '').lower().replace('ё', 'е')
+
+
+def is_enabled(using: str = 'default') -> bool:
+    """Индекс поддерживается только на SQLite."""
+    return connections[using].vendor == 'sqlite'
+
+
+def build_match_query(column: str, value: str) -> Optional[str]:
+    """
+    Строит выражение MATCH: все слова запроса как префиксы в колонке.
+
+    Args:
+        column (str): колонка FTS-таблицы.
+        value (str): пользовательский ввод.
+
+    Returns:
+        str | None: выражение FTS5 или None, если в запросе нет слов.
+    """
+    tokens = _TOKEN_RE.findall(normalize(value))
+    if not tokens:
+        return None
+    terms = ' AND '.join(f'"{token}"*' for token in tokens)
+    return f'{{{column}}} : ({terms})'
+
+
+def _row(employee) -> list:
+    return [employee.pk] + [
+        normalize(getattr(employee, column)) for column in FTS_COLUMNS
+    ]
+
+
+def index_employees(employees: Iterable, using: str = 'default') -> None:
+    """
+    Добавляет или обновляет строки индекса для сотрудников.
+
+    Args:
+        employees (Iterable[Employee]): сотрудники (или объекты
+            с теми же атрибутами, например строки values()).
+        using (str): алиас базы данных.
+    """
+    if not is_enabled(using):
+        return
+    rows = [_row(employee) for employee in employees]
+    if not rows:
+        return
+    placeholders = ', '.join(['%s'] * (len(FTS_COLUMNS) + 1))
+    with connections[using].cursor() as cursor:
+        cursor.executemany(
+            f'DELETE FROM {FTS_TABLE} WHERE rowid = %s',
+            [[row[0]] for row in rows],
+        )
+        cursor.executemany(
+            f'INSERT INTO {FTS_TABLE} (rowid, {", ".join(FTS_COLUMNS)}) '
+            f'VALUES ({placeholders})',
+            rows,
+        )
+
+
+def unindex_employees(pks: Iterable[int], using: str = 'default') -> None:
+    """
+    Удаляет строки индекса по id сотрудников.
+
+    Args:
+        pks (Iterable[int]): id удалённых сотрудников.
+        using (str): алиас базы данных.
+    """
+    if not is_enabled(using):
+        return
+    pks = list(pks)
+    with connections[using].cursor() as cursor:
+        # один DELETE на порцию (в пределах лимита переменных SQLite)
+        for start in range(0, len(pks), FTS_DELETE_BATCH):
+            part = pks[start:start + FTS_DELETE_BATCH]
+            cursor.execute(
+                f'DELETE FROM {FTS_TABLE} WHERE rowid IN '
+                f'({", ".join(["%s"] * len(part))})',
+                part,
+            )
+
+
+def rebuild_index(queryset, using: str = 'default') -> int:
+    """
+    Полностью перестраивает индекс по переданному набору сотрудников.
+
+    Args:
+        queryset (QuerySet): сотрудники для индексации.
+        using (str): алиас базы данных.
+
+    Returns:
+        int: количество проиндексированных строк.
+    """
+    if not is_enabled(using):
+        return 0
+    with connections[using].cursor() as cursor:
+        cursor.execute(f'DELETE FROM {FTS_TABLE}')
+    count = 0
+    batch = []
+    for employee in queryset.only(*FTS_COLUMNS).iterator(chunk_size=2000):
+        batch.append(employee)
+        if len(batch) >= 2000:
+            index_employees(batch, using)
+            count += len(batch)
+            batch = []
+    index_employees(batch, using)
+    return count + len(batch)
+
+
+class FullTextMatch(Lookup):
+    """
+    Lookup ``fts``: поиск слов-префиксов через FTS5 MATCH.
+
+    На SQLite подзапрос к индексу выполняется по rowid, без полного
+    сканирования таблицы. На других СУБД — обычный icontains.
+    """
+
+    lookup_name = 'fts'
+
+    def as_sql(self, compiler, connection):
+        return compiler.compile(IContains(self.lhs, self.rhs))
+
+    def as_sqlite(self, compiler, connection):
+        query = build_match_query(self.lhs.target.column, self.rhs)
+        if query is None:
+            return self.as_sql(compiler, connection)
+        pk_column = '%s.%s' % (
+            compiler.quote_name_unless_alias(self.lhs.alias),
+            connection.ops.quote_name(self.lhs.target.model._meta.pk.column),
+        )
+        return (
+            f'{pk_column} IN (SELECT rowid FROM {FTS_TABLE} '
+            f'WHERE {FTS_TABLE} MATCH %s)',
+            [query],
+        )
+
+
+def register_lookups(model) -> None:
+    """Регистрирует lookup ``fts`` на индексируемых полях модели."""
+    for column in FTS_COLUMNS:
+        model._meta.get_field(column).register_lookup(FullTextMatch)
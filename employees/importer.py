@@ -0,0 +1,360 @@
+"""
+Массовый импорт сотрудников из XLSX/CSV.
+
+Файл читается pandas целиком в DataFrame, проверки выполняются
+векторно по колонкам (ФИО по RUSSIAN_NAME_RE, регион по словарю из
+кэша, даты, номер записки), а вставка идёт через bulk_create в
+отдельной транзакции на порцию; уже существующих сотрудников отклоняет
+ограничение БД.
+bulk_create не вызывает сигналы post_save, поэтому индексы поиска и
+версия данных обновляются здесь явно.
+"""
+from pathlib import Path
+from typing import Optional
+
+import pandas as pd
+from django.conf import settings
+from django.core.cache import cache
+from django.db import IntegrityError, transaction
+from django.utils import timezone
+
+from . import fts, suggest
+from .caching import bulk_change, bump_data_version, get_data_version
+from .forms import RUSSIAN_NAME_RE
+from .logins import propose_logins
+from .models import ActionLog, Employee, Region
+from .utils import generate_passwords
+from .writes import run_write
+
+# Сколько строк проверяется и вставляется за один раз
+# (2 параметра на строку в запросе логинов — в пределах лимита SQLite)
+IMPORT_BATCH_SIZE = getattr(settings, 'IMPORT_BATCH_SIZE', 400)
+
+# Заголовки колонок файла -> поля сотрудника (как в выгрузке и по-английски)
+IMPORT_COLUMNS = {
+    'Фамилия': 'last_name',
+    'Имя': 'first_name',
+    'Отчество': 'patronymic',
+    'Регион': 'region',
+    'Код региона': 'region',
+    'Дата записки': 'note_date',
+    'Номер записки': 'note_number',
+    'last_name': 'last_name',
+    'first_name': 'first_name',
+    'patronymic': 'patronymic',
+    'region': 'region',
+    'region_name': 'region',
+    'region_code': 'region',
+    'note_date': 'note_date',
+    'note_number': 'note_number',
+}
+REQUIRED_COLUMNS = ('last_name', 'first_name', 'region', 'note_number')
+OPTIONAL_COLUMNS = ('patronymic', 'note_date')
+
+# Номер первой строки данных в файле (после строки заголовков)
+FIRST_ROW = 2
+
+
+class ImportReport:
+    """Результат импорта: созданные сотрудники и ошибки по строкам."""
+
+    def __init__(self, total=0):
+        self.total = total
+        self.created = 0
+        self.errors = {}
+
+    def add_error(self, row: int, message: str) -> None:
+        self.errors.setdefault(row, []).append(message)
+
+    @property
+    def error_rows(self) -> list:
+        """[(номер строки файла, [сообщения]), ...] по возрастанию."""
+        return sorted(self.errors.items())
+
+    @property
+    def skipped(self) -> int:
+        return len(self.errors)
+
+
+def _region_key(value: str) -> str:
+    value = value.strip().lower().replace('ё', 'е')
+    return value.zfill(2) if value.isdigit() else value
+
+
+def region_lookup() -> dict:
+    """
+    Словарь для поиска региона по коду или названию.
+
+    Ключи: код («01»), полное название («01 – республика адыгея») и
+    название без кода. Кэшируется по версии данных, которая меняется
+    и при изменении регионов.
+
+    Returns:
+        dict: {ключ: id региона}.
+    """
+    key = f'employees:regions:v{get_data_version()}'
+    lookup = cache.get(key)
+    if lookup is None:
+        lookup = {}
+        for pk, code, name in Region.objects.values_list('pk', 'code', 'name'):
+            lookup[_region_key(code)] = pk
+            lookup[_region_key(name)] = pk
+            lookup[_region_key(name.split('–', 1)[-1])] = pk
+        cache.set(key, lookup, None)
+    return lookup
+
+
+def read_table(fileobj, filename: str) -> pd.DataFrame:
+    """
+    Читает XLSX или CSV в DataFrame со строковыми колонками.
+
+    Raises:
+        ValueError: неподдерживаемый формат или нет нужных колонок.
+    """
+    suffix = Path(filename).suffix.lower()
+    if suffix in ('.xlsx', '.xlsm'):
+        df = pd.read_excel(fileobj, dtype=str, keep_default_na=False)
+    elif suffix == '.csv':
+        df = pd.read_csv(
+            fileobj,
+            dtype=str,
+            keep_default_na=False,
+            encoding='utf-8-sig',
+            sep=None,
+            engine='python',
+        )
+    else:
+        raise ValueError('Поддерживаются файлы .xlsx и .csv.')
+
+    df = df.rename(columns=lambda name: IMPORT_COLUMNS.get(str(name).strip()))
+    df = df.loc[:, [name is not None for name in df.columns]]
+    df = df.loc[:, ~df.columns.duplicated()]
+    missing = [name for name in REQUIRED_COLUMNS if name not in df.columns]
+    if missing:
+        raise ValueError(f"Нет колонок: {', '.join(missing)}.")
+    for name in OPTIONAL_COLUMNS:
+        if name not in df.columns:
+            df[name] = ''
+    df = df.apply(lambda column: column.str.strip())
+    df.index = range(FIRST_ROW, FIRST_ROW + len(df))
+    return df
+
+
+def _mark(report: ImportReport, mask: pd.Series, message: str) -> None:
+    for row in mask[mask].index:
+        report.add_error(int(row), message)
+
+
+def validate(df: pd.DataFrame, report: ImportReport) -> pd.DataFrame:
+    """
+    Векторная проверка строк файла.
+
+    Ошибки записываются в отчёт; возвращаются только корректные строки
+    с колонками region_id, note_date (date | None) и login.
+    """
+    for field, label in (
+        ('last_name', 'Фамилия'),
+        ('first_name', 'Имя'),
+    ):
+        _mark(
+            report,
+            ~df[field].str.fullmatch(RUSSIAN_NAME_RE),
+            f'{label}: только русские буквы, первая — заглавная.',
+        )
+    patronymic = df['patronymic']
+    _mark(
+        report,
+        (patronymic != '') & ~patronymic.str.fullmatch(RUSSIAN_NAME_RE),
+        'Отчество: только русские буквы, первая — заглавная.',
+    )
+
+    regions = region_lookup()
+    region_id = df['region'].map(_region_key).map(regions)
+    _mark(report, region_id.isna(), 'Неизвестный регион.')
+
+    note_date = pd.to_datetime(
+        df['note_date'], errors='coerce', format='mixed', dayfirst=True
+    )
+    _mark(
+        report,
+        (df['note_date'] != '') & note_date.isna(),
+        'Некорректная дата записки.',
+    )
+    _mark(
+        report,
+        note_date > pd.Timestamp(timezone.localdate()),
+        'Дата не может быть из будущего.',
+    )
+    _mark(report, df['note_number'] == '', 'Не указан номер записки.')
+
+    valid = df.drop(index=list(report.errors))
+    valid = valid.assign(
+        region_id=region_id[valid.index].astype(int),
+        note_date=[
+            None if pd.isna(value) else value.date()
+            for value in note_date[valid.index]
+        ],
+    )
+    # ключи-коды словаря регионов дают код региона для логина
+    valid['code'] = valid['region_id'].map(
+        {pk: key for key, pk in regions.items() if key.isdigit()}
+    )
+
+    key = ['last_name', 'first_name', 'patronymic', 'region_id']
+    _mark(
+        report,
+        valid.duplicated(key, keep='first'),
+        'Повтор сотрудника в файле.',
+    )
+    return valid.drop(index=[i for i in valid.index if i in report.errors])
+
+
+def import_employees(
+    fileobj,
+    filename: str,
+    user=None,
+    dry_run: bool = False,
+    batch_size: int = IMPORT_BATCH_SIZE,
+) -> ImportReport:
+    """
+    Импортирует сотрудников из файла XLSX/CSV.
+
+    Строки с ошибками пропускаются и попадают в отчёт, остальные
+    создаются порциями: один запрос занятых логинов (однофамильцы
+    получают логин с номером) и один bulk_create в транзакции на
+    порцию. Уже существующих сотрудников отклоняет ограничение БД
+    employee_unique_person; тогда порция вставляется построчно, чтобы
+    указать строки-дубли. Проверка без создания (dry_run) выполняет те
+    же вставки и откатывает каждую порцию (дубли внутри файла уже
+    отсеяны validate()).
+
+    Args:
+        fileobj: файл (путь или файловый объект).
+        filename (str): имя файла (по расширению выбирается формат).
+        user (User | None): пользователь для журнала действий.
+        dry_run (bool): только проверить, ничего не создавая
+            (created — сколько было бы создано).
+        batch_size (int): размер порции.
+
+    Returns:
+        ImportReport: количество созданных и ошибки по строкам.
+
+    Raises:
+        ValueError: файл не читается или в нём нет нужных колонок.
+    """
+    df = read_table(fileobj, filename)
+    report = ImportReport(total=len(df))
+    valid = validate(df, report)
+
+    _import_batches(valid, report, user, filename, batch_size, dry_run)
+    return report
+
+
+def _import_batches(
+    valid, report, user, filename, batch_size, dry_run=False
+) -> None:
+    # логины, выданные предыдущими порциями
+    reserved = set()
+    for start in range(0, len(valid), batch_size):
+        batch = valid.iloc[start:start + batch_size]
+        rows = list(batch.itertuples())
+        logins = propose_logins(
+            (
+                (row.code, row.last_name, row.first_name, row.patronymic)
+                for row in rows
+            ),
+            taken=reserved,
+        )
+        passwords = generate_passwords(len(rows))
+        employees = {}
+        for row, login, password in zip(rows, logins, passwords):
+            employees[row.Index] = Employee(
+                last_name=row.last_name,
+                first_name=row.first_name,
+                patronymic=row.patronymic,
+                region_id=row.region_id,
+                note_date=row.note_date,
+                note_number=row.note_number,
+                login=login['login'],
+                password=password,
+                action='create',
+            )
+        if employees:
+            created = _create(employees, report, user, filename, dry_run)
+            report.created += len(created)
+
+
+def _insert(employees: dict) -> tuple:
+    """
+    Вставляет порцию одним bulk_create, а при нарушении ограничения —
+    построчно.
+
+    Returns:
+        tuple: (созданные сотрудники, [(строка файла, ошибка), ...]).
+    """
+    try:
+        with transaction.atomic():
+            return Employee.objects.bulk_create(employees.values()), []
+    except IntegrityError:
+        pass
+
+    created = []
+    errors = []
+    for row, employee in employees.items():
+        try:
+            with transaction.atomic():
+                Employee.objects.bulk_create([employee])
+        except IntegrityError:
+            if Employee.objects.filter(login=employee.login).exists():
+                errors.append((row, f'Логин {employee.login} уже занят.'))
+            else:
+                errors.append((row, 'Сотрудник уже существует.'))
+        else:
+            created.append(employee)
+    return created, errors
+
+
+def _write_batch(
+    employees: dict, user: Optional[object], filename: str, dry_run: bool
+) -> tuple:
+    """Одна попытка записи порции внутри run_write()."""
+    with bulk_change():
+        created, errors = _insert(employees)
+        if created:
+            fts.index_employees(created)
+            bump_data_version()
+            ActionLog.objects.create(
+                user=user,
+                action='Импорт',
+                employee=f'{len(created)} сотрудников из {filename}'[:200],
+            )
+    # после bulk_change(): при выходе из него записывается версия
+    if dry_run:
+        transaction.set_rollback(True)
+    return created, errors
+
+
+def _create(
+    employees: dict,
+    report: ImportReport,
+    user: Optional[object],
+    filename: str,
+    dry_run: bool = False,
+) -> list:
+    """
+    Вставляет порцию и обновляет то, что обычно делают сигналы.
+
+    Порция — своя транзакция записи (BEGIN IMMEDIATE), которая при
+    «database is locked» повторяется (run_write); при dry_run она
+    откатывается. Ошибки строк попадают в отчёт только после удачной
+    попытки.
+    """
+    created, errors = run_write(
+        _write_batch, employees, user, filename, dry_run
+    )
+    for row, message in errors:
+        report.add_error(row, message)
+    if not dry_run:
+        for employee in created:
+            suggest.update_employee(employee)
+    return created
@@ -0,0 +1,199 @@
+"""
+Фоновые задачи экспорта сотрудников.
+
+Запрос на экспорт только создаёт ExportJob и ставит её в пул потоков
+с ограниченным числом воркеров (EXPORT_MAX_WORKERS), поэтому тяжёлые
+выгрузки не занимают веб-воркеры, а их общая нагрузка ограничена
+независимо от HTTP-трафика. Готовый файл пишется в EXPORT_DIR, ход
+выполнения сохраняется в задаче и доступен для опроса. Пул живёт в
+процессе, поэтому задачи, прерванные перезапуском, по истечении
+EXPORT_JOB_TIMEOUT помечаются ошибочными (fail_stale_jobs).
+"""
+import logging
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from datetime import timedelta
+from pathlib import Path
+from typing import Iterable, Iterator
+
+from django.conf import settings
+from django.db import close_old_connections, connection
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+
+from .exports import iter_snapshot_rows, write_xlsx
+from .models import ExportJob
+from .watermarks import record_export
+
+app_logger = logging.getLogger('app')
+
+# Сколько выгрузок выполняется одновременно
+EXPORT_MAX_WORKERS = getattr(settings, 'EXPORT_MAX_WORKERS', 2)
+
+# Каталог для готовых файлов выгрузки
+EXPORT_DIR = Path(
+    getattr(settings, 'EXPORT_DIR', Path(settings.BASE_DIR) / 'exports')
+)
+
+# Сколько хранятся готовые файлы и записи о задачах
+EXPORT_FILE_TTL = timedelta(
+    seconds=getattr(settings, 'EXPORT_FILE_TTL', 24 * 3600)
+)
+
+# Задача в очереди или в работе дольше этого считается прерванной
+EXPORT_JOB_TIMEOUT = timedelta(
+    seconds=getattr(settings, 'EXPORT_JOB_TIMEOUT', 3600)
+)
+
+STALE_JOB_ERROR = (
+    'Задача прервана: сервер перезапущен или превышено время выполнения.'
+)
+
+# Как часто (в строках) сохраняется ход выполнения
+PROGRESS_EVERY = 1000
+
+_executor = None
+_executor_lock = threading.Lock()
+
+
+def _get_executor() -> ThreadPoolExecutor:
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(
+                max_workers=EXPORT_MAX_WORKERS,
+                thread_name_prefix='export',
+            )
+        return _executor
+
+
+def job_path(job: ExportJob) -> Path:
+    """Путь к файлу результата задачи."""
+    return EXPORT_DIR / job.file_name
+
+
+def start_export(snapshot: dict, user) -> ExportJob:
+    """
+    Создаёт задачу выгрузки снимка и ставит её в очередь.
+
+    Args:
+        snapshot (dict): снимок выборки из exports.create_snapshot().
+        user (User): владелец задачи.
+
+    Returns:
+        ExportJob: созданная задача (статус «В очереди»).
+    """
+    cleanup_expired()
+    job = ExportJob.objects.create(
+        user=user,
+        total=snapshot['count'],
+        data_at=parse_datetime(snapshot['taken_at']),
+    )
+    _get_executor().submit(_run, job.pk, snapshot)
+    return job
+
+
+def _with_progress(job_pk: int, rows: Iterable) -> Iterator:
+    done = 0
+    for row in rows:
+        yield row
+        done += 1
+        if done % PROGRESS_EVERY == 0:
+            ExportJob.objects.filter(pk=job_pk).update(done=done)
+
+
+def _run(job_pk: int, snapshot: dict) -> None:
+    """Выполняет задачу в потоке пула."""
+    close_old_connections()
+    file_name = f'employees_{job_pk}.xlsx'
+    path = EXPORT_DIR / file_name
+    part = path.with_suffix('.part')
+    try:
+        ExportJob.objects.filter(pk=job_pk).update(
+            status=ExportJob.RUNNING
+        )
+        EXPORT_DIR.mkdir(parents=True, exist_ok=True)
+        with open(part, 'wb') as fileobj:
+            count = write_xlsx(
+                _with_progress(job_pk, iter_snapshot_rows(snapshot)),
+                fileobj,
+            )
+        os.replace(part, path)
+        ExportJob.objects.filter(pk=job_pk).update(
+            status=ExportJob.DONE,
+            done=count,
+            file_name=file_name,
+            finished_at=timezone.now(),
+        )
+        job = ExportJob.objects.select_related('user').get(pk=job_pk)
+        record_export(job.user, snapshot['query'], job.data_at)
+    except LookupError:
+        _fail(job_pk, 'Выборка для экспорта устарела.')
+    except Exception as exc:
+        app_logger.exception('Ошибка фонового экспорта #%s', job_pk)
+        _fail(job_pk, str(exc))
+    finally:
+        part.unlink(missing_ok=True)
+        connection.close()
+
+
+def _fail(job_pk: int, error: str) -> None:
+    ExportJob.objects.filter(pk=job_pk).update(
+        status=ExportJob.FAILED, error=error, finished_at=timezone.now()
+    )
+
+
+def job_status(job: ExportJob) -> dict:
+    """Состояние задачи для JSON-ответа."""
+    return {
+        'id': job.pk,
+        'status': job.status,
+        'status_display': job.get_status_display(),
+        'done': job.done,
+        'total': job.total,
+        'error': job.error,
+    }
+
+
+def is_stale(job: ExportJob) -> bool:
+    """Задача в очереди или в работе дольше EXPORT_JOB_TIMEOUT."""
+    return (
+        job.status in (ExportJob.PENDING, ExportJob.RUNNING)
+        and job.created_at < timezone.now() - EXPORT_JOB_TIMEOUT
+    )
+
+
+def fail_stale_jobs() -> int:
+    """
+    Помечает ошибочными задачи, которые в очереди или в работе дольше
+    EXPORT_JOB_TIMEOUT (их поток потерян при перезапуске процесса).
+
+    Returns:
+        int: количество помеченных задач.
+    """
+    now = timezone.now()
+    return ExportJob.objects.filter(
+        status__in=[ExportJob.PENDING, ExportJob.RUNNING],
+        created_at__lt=now - EXPORT_JOB_TIMEOUT,
+    ).update(status=ExportJob.FAILED, error=STALE_JOB_ERROR, finished_at=now)
+
+
+def cleanup_expired() -> int:
+    """
+    Помечает прерванные задачи ошибочными и удаляет задачи старше
+    EXPORT_FILE_TTL вместе с их файлами.
+
+    Returns:
+        int: количество удалённых задач.
+    """
+    fail_stale_jobs()
+    expired = ExportJob.objects.filter(
+        created_at__lt=timezone.now() - EXPORT_FILE_TTL
+    ).exclude(status__in=[ExportJob.PENDING, ExportJob.RUNNING])
+    for file_name in expired.exclude(file_name='').values_list(
+        'file_name', flat=True
+    ):
+        (EXPORT_DIR / file_name).unlink(missing_ok=True)
+    deleted, _ = expired.delete()
+    return deleted
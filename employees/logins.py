@@ -0,0 +1,179 @@
+"""
+Выдача логинов сотрудников без коллизий.
+
+Логин строится как ``{код}_{Фамилия}_{ИО}``; если он занят, к нему
+добавляется номер: ``01_Иванов_ИИ2``, ``01_Иванов_ИИ3`` и т. д. Занятые
+номера читаются одним запросом по диапазону логинов с нужным началом
+(условие login >= base AND login < base + '\\U0010ffff' использует
+уникальный индекс; startswith на SQLite — это LIKE, который индекс не
+использует). Уникальность гарантирует ограничение БД: при гонке
+создание повторяется со следующим свободным номером.
+"""
+from typing import Iterable, Optional
+
+from django.db import IntegrityError
+from django.db.models import Q
+
+from .models import Employee
+from .writes import run_write
+
+# Сколько раз повторять создание, если логин заняли параллельно
+LOGIN_ATTEMPTS = 5
+
+# Сколько префиксов проверяется одним запросом
+# (2 параметра на префикс — в пределах лимита переменных SQLite)
+LOGIN_PREFIX_BATCH = 400
+
+_MAX_CHAR = '\U0010ffff'
+
+
+def base_login(
+    region_code: str,
+    last_name: str,
+    first_name: str,
+    patronymic: Optional[str] = '',
+) -> str:
+    """
+    Логин без номера: код региона, фамилия и инициалы.
+
+    Returns:
+        str: например, «01_Иванов_ИИ».
+    """
+    initials = first_name[:1].upper() + (patronymic or '')[:1].upper()
+    return f'{region_code}_{last_name}_{initials}'
+
+
+def _numbered(base: str, number: int) -> str:
+    return base if number == 1 else f'{base}{number}'
+
+
+def _number(base: str, login: str) -> Optional[int]:
+    """Номер логина относительно base или None, если это другой логин."""
+    suffix = login[len(base):]
+    if not suffix:
+        return 1
+    if suffix.isdigit() and not suffix.startswith('0'):
+        return int(suffix)
+    return None
+
+
+def taken_numbers(bases: Iterable[str]) -> dict:
+    """
+    Занятые номера логинов для каждого префикса.
+
+    Args:
+        bases (Iterable[str]): логины без номера.
+
+    Returns:
+        dict: {base: set(номеров)}; логин без номера — номер 1.
+    """
+    bases = sorted(set(bases))
+    taken = {base: set() for base in bases}
+    for start in range(0, len(bases), LOGIN_PREFIX_BATCH):
+        part = bases[start:start + LOGIN_PREFIX_BATCH]
+        condition = Q()
+        for base in part:
+            condition |= Q(login__gte=base, login__lt=base + _MAX_CHAR)
+        logins = Employee.objects.filter(condition).values_list(
+            'login', flat=True
+        )
+        for login in logins:
+            # логин может начинаться с нескольких префиксов
+            # («01_Иванов_И» и «01_Иванов_ИИ»)
+            for base in part:
+                if login.startswith(base):
+                    number = _number(base, login)
+                    if number is not None:
+                        taken[base].add(number)
+    return taken
+
+
+def _next_free(base: str, used: set) -> str:
+    number = 1
+    while number in used:
+        number += 1
+    used.add(number)
+    return _numbered(base, number)
+
+
+def propose_logins(people: Iterable[tuple], taken: Optional[set] = None):
+    """
+    Предлагает свободные логины для списка сотрудников.
+
+    Один запрос на LOGIN_PREFIX_BATCH разных префиксов; однофамильцы
+    внутри списка получают разные номера.
+
+    Args:
+        people (Iterable[tuple]): (код региона, фамилия, имя, отчество).
+        taken (set | None): логины, которые считать занятыми (например,
+            предложенные предыдущей порцией); дополняется выданными.
+
+    Returns:
+        list[dict]: {'login', 'base', 'conflict'} в порядке people;
+            conflict — логин без номера уже занят.
+    """
+    people = list(people)
+    bases = [base_login(*person) for person in people]
+    used = taken_numbers(bases)
+    if taken:
+        for login in taken:
+            for base, numbers in used.items():
+                if login.startswith(base):
+                    number = _number(base, login)
+                    if number is not None:
+                        numbers.add(number)
+
+    result = []
+    for base in bases:
+        login = _next_free(base, used[base])
+        if taken is not None:
+            taken.add(login)
+        result.append(
+            {'login': login, 'base': base, 'conflict': login != base}
+        )
+    return result
+
+
+def allocate_login(
+    region_code: str,
+    last_name: str,
+    first_name: str,
+    patronymic: Optional[str] = '',
+) -> str:
+    """Первый свободный логин для сотрудника (один запрос)."""
+    person = (region_code, last_name, first_name, patronymic)
+    return propose_logins([person])[0]['login']
+
+
+def create_employee(**fields) -> Employee:
+    """
+    Создаёт сотрудника с первым свободным логином.
+
+    Логин резервируется вставкой строки: если его успели занять
+    параллельно (IntegrityError по логину), берётся следующий номер.
+
+    Args:
+        **fields: поля Employee без login; region — объект Region.
+
+    Returns:
+        Employee: созданный сотрудник.
+
+    Raises:
+        IntegrityError: нарушено другое ограничение или логин не удалось
+            выделить за LOGIN_ATTEMPTS попыток.
+    """
+    base = base_login(
+        fields['region'].code,
+        fields['last_name'],
+        fields['first_name'],
+        fields.get('patronymic'),
+    )
+    used = taken_numbers([base])[base]
+    for attempt in range(LOGIN_ATTEMPTS):
+        login = _next_free(base, used)
+        try:
+            return run_write(Employee.objects.create, login=login, **fields)
+        except IntegrityError:
+            taken = Employee.objects.filter(login=login).exists()
+            if not taken or attempt == LOGIN_ATTEMPTS - 1:
+                raise
@@ -0,0 +1,27 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from employees.prebuilt import EXPORT_SNAPSHOT_DIR, build_snapshots
+
+
+class Command(BaseCommand):
+    """Строит заранее подготовленные файлы выгрузки (для cron)."""
+
+    help = (
+        'Строит полную выгрузку и выгрузки по регионам для текущей '
+        'версии данных; export_excel отдаёт их, пока данные не изменятся.'
+    )
+
+    def handle(self, *args, **options):
+        started = time.monotonic()
+        manifest = build_snapshots()
+        files = manifest['files']
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Снимок v{manifest['version']}: {len(files)} файлов, "
+                f"{files['all']['count']} сотрудников, "
+                f'{time.monotonic() - started:.1f} с '
+                f'({EXPORT_SNAPSHOT_DIR})'
+            )
+        )
@@ -0,0 +1,59 @@
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import connection
+
+from employees.sqlite import enable_incremental_vacuum, run_maintenance
+
+
+class Command(BaseCommand):
+    """Обслуживание базы SQLite (для cron)."""
+
+    help = (
+        'Выполняет ANALYZE, PRAGMA optimize, incremental_vacuum и '
+        'wal_checkpoint(TRUNCATE) и печатает время каждого шага.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--vacuum-pages',
+            type=int,
+            default=None,
+            help='Сколько свободных страниц вернуть (по умолчанию все).',
+        )
+        parser.add_argument(
+            '--enable-incremental-vacuum',
+            action='store_true',
+            help=(
+                'Разово включить auto_vacuum=INCREMENTAL '
+                '(полный VACUUM, база блокируется на время выполнения).'
+            ),
+        )
+
+    def handle(self, *args, **options):
+        if connection.vendor != 'sqlite':
+            self.stdout.write(
+                self.style.WARNING('Команда рассчитана на SQLite.')
+            )
+            return
+
+        started = time.monotonic()
+        if options['enable_incremental_vacuum']:
+            seconds = enable_incremental_vacuum()
+            self.stdout.write(
+                f'VACUUM (auto_vacuum=INCREMENTAL): {seconds:.2f} с'
+            )
+
+        for name, seconds, result in run_maintenance(
+            vacuum_pages=options['vacuum_pages']
+        ):
+            line = f'{name}: {seconds:.2f} с'
+            if result:
+                line += f' {result}'
+            self.stdout.write(line)
+
+        self.stdout.write(
+            self.style.SUCCESS(
+                f'Обслуживание завершено за {time.monotonic() - started:.1f} с'
+            )
+        )
@@ -0,0 +1,96 @@
+from django.core.management.base import BaseCommand
+from django.db import connection, transaction
+from django.db.models import Count
+from django.utils import timezone
+
+from employees.filters import compile_query
+from employees.models import ActionLog, Employee, LoginHistory, Region
+
+# Размер страницы в запросах (как в списках сотрудников и журналах)
+PAGE_SIZE = 50
+
+
+def view_queries() -> list:
+    """Запросы страниц в том виде, в каком их выполняют представления."""
+    today = timezone.localdate().isoformat()
+    region = Region.objects.order_by('pk').first()
+    employees = Employee.objects.all()
+
+    def search(**params):
+        return (
+            compile_query(params)
+            .apply(employees)
+            .order_by('last_name', 'id')[:PAGE_SIZE]
+        )
+
+    queries = [
+        (
+            'search_employee: ФИО',
+            search(last_name='Иванов', first_name='Иван'),
+        ),
+        ('search_employee: статус', search(status='blocked')),
+        ('search_employee: дата записки', search(note_date=today)),
+        ('search_employee: дата создания', search(created_at=today)),
+        (
+            'search_employee: фасеты',
+            employees.filter(status='active')
+            .values('status', 'region')
+            .annotate(count=Count('pk')),
+        ),
+        (
+            'ActionLog: журнал',
+            ActionLog.objects.order_by('-timestamp')[:PAGE_SIZE],
+        ),
+        (
+            'LoginHistory: журнал',
+            LoginHistory.objects.order_by('-timestamp')[:PAGE_SIZE],
+        ),
+    ]
+    if region:
+        queries += [
+            (
+                'employees_by_region',
+                employees.filter(region=region).order_by(
+                    'created_at', 'id'
+                )[:PAGE_SIZE],
+            ),
+            (
+                'search_employee: регион и статус',
+                search(region_name=str(region.pk), status='active'),
+            ),
+        ]
+    return queries
+
+
+class Command(BaseCommand):
+    """Печатает планы запросов страниц без индексов и с индексами."""
+
+    help = (
+        'Печатает EXPLAIN QUERY PLAN для запросов поиска, списков '
+        'регионов и журналов: сначала без индексов из Meta.indexes '
+        '(удаляются в транзакции, которая откатывается), затем с ними.'
+    )
+
+    def handle(self, *args, **options):
+        if connection.vendor != 'sqlite':
+            self.stdout.write(
+                self.style.WARNING('Команда рассчитана на SQLite.')
+            )
+            return
+
+        # DDL в SQLite транзакционна: индексы вернутся при откате
+        with transaction.atomic(), connection.cursor() as cursor:
+            for model in (Employee, ActionLog, LoginHistory):
+                for index in model._meta.indexes:
+                    cursor.execute(f'DROP INDEX IF EXISTS "{index.name}"')
+            self._explain('До (без индексов)')
+            transaction.set_rollback(True)
+
+        self._explain('После (с индексами)')
+
+    def _explain(self, title):
+        self.stdout.write(self.style.MIGRATE_HEADING(f'== {title} =='))
+        for name, queryset in view_queries():
+            self.stdout.write(self.style.SUCCESS(name))
+            for line in queryset.explain().splitlines():
+                self.stdout.write(f'  {line}')
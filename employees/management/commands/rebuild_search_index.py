@@ -0,0 +1,21 @@
+from django.core.management.base import BaseCommand
+
+from employees.fts import is_enabled, rebuild_index
+from employees.models import Employee
+
+
+class Command(BaseCommand):
+    """Перестраивает полнотекстовый индекс сотрудников (FTS5)."""
+
+    help = 'Перестраивает полнотекстовый индекс ФИО, записок и логинов.'
+
+    def handle(self, *args, **options):
+        if not is_enabled():
+            self.stdout.write(
+                self.style.WARNING('Индекс FTS5 доступен только на SQLite.')
+            )
+            return
+        count = rebuild_index(Employee.objects.all())
+        self.stdout.write(
+            self.style.SUCCESS(f'Проиндексировано сотрудников: {count}')
+        )
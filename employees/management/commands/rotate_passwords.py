@@ -0,0 +1,82 @@
+import sys
+
+from django.core.management.base import BaseCommand, CommandError
+from django.http import QueryDict
+
+from employees.bulk import rotate_passwords
+from employees.exports import (
+    CREDENTIAL_HEADERS,
+    iter_credential_rows,
+    iter_csv,
+)
+from employees.filters import compile_query
+from employees.models import Employee, Region
+
+
+class Command(BaseCommand):
+    """Массовая смена паролей работающих сотрудников."""
+
+    help = (
+        'Меняет пароли работающих сотрудников региона или поискового '
+        'запроса и записывает новые логины и пароли в CSV.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--region',
+            action='append',
+            default=[],
+            help='Код региона (можно указать несколько раз).',
+        )
+        parser.add_argument(
+            '--query',
+            default='',
+            help='Параметры поиска, например "status=active&region_name=5".',
+        )
+        parser.add_argument(
+            '--output',
+            default='-',
+            help='Файл CSV с новыми паролями ("-" — стандартный вывод).',
+        )
+
+    def handle(self, *args, **options):
+        codes = [code.zfill(2) for code in options['region']]
+        compiled = compile_query(QueryDict(options['query']))
+        if not codes and not compiled:
+            raise CommandError('Укажите --region или --query.')
+
+        employees = compiled.apply(Employee.objects.all())
+        if codes:
+            regions = list(
+                Region.objects.filter(code__in=codes).values_list(
+                    'pk', flat=True
+                )
+            )
+            if len(regions) != len(set(codes)):
+                raise CommandError('Неизвестный код региона.')
+            employees = employees.filter(region_id__in=regions)
+
+        # файл открывается до смены паролей: при неверном пути или
+        # нехватке прав новые пароли иначе никто бы не узнал
+        output = options['output']
+        try:
+            stream = (
+                sys.stdout
+                if output == '-'
+                else open(output, 'w', encoding='utf-8', newline='')
+            )
+        except OSError as exc:
+            raise CommandError(f'Не удалось открыть {output}: {exc}')
+
+        try:
+            ids = rotate_passwords(employees)
+            rows = iter_credential_rows(ids)
+            for chunk in iter_csv(rows, CREDENTIAL_HEADERS):
+                stream.write(chunk)
+        finally:
+            if stream is not sys.stdout:
+                stream.close()
+
+        self.stderr.write(
+            self.style.SUCCESS(f'Пароли сменены: {len(ids)} сотрудников.')
+        )
@@ -0,0 +1,54 @@
+from django.db import migrations
+
+# Схема и нормализация на момент миграции; копия, а не импорт из
+# employees.fts, чтобы изменения модуля не меняли историю миграций
+FTS_TABLE = 'employees_employee_fts'
+FTS_COLUMNS = ('last_name', 'first_name', 'patronymic', 'note_number', 'login')
+CREATE_FTS_SQL = (
+    'CREATE VIRTUAL TABLE IF NOT EXISTS employees_employee_fts USING fts5('
+    'last_name, first_name, patronymic, note_number, login, '
+    "tokenize = 'unicode61 remove_diacritics 0')"
+)
+DROP_FTS_SQL = 'DROP TABLE IF EXISTS employees_employee_fts'
+
+
+def normalize(value):
+    return (value or '').lower().replace('ё', 'е')
+
+
+def create_fts_index(apps, schema_editor):
+    """Создаёт FTS5-таблицу и заполняет её текущими сотрудниками."""
+    if schema_editor.connection.vendor != 'sqlite':
+        return
+    Employee = apps.get_model('employees', 'Employee')
+    rows = [
+        [pk] + [normalize(value) for value in values]
+        for pk, *values in Employee.objects.values_list('pk', *FTS_COLUMNS)
+    ]
+    placeholders = ', '.join(['%s'] * (len(FTS_COLUMNS) + 1))
+    with schema_editor.connection.cursor() as cursor:
+        cursor.execute(CREATE_FTS_SQL)
+        cursor.executemany(
+            f'INSERT INTO {FTS_TABLE} (rowid, {", ".join(FTS_COLUMNS)}) '
+            f'VALUES ({placeholders})',
+            rows,
+        )
+
+
+def drop_fts_index(apps, schema_editor):
+    """Удаляет FTS5-таблицу."""
+    if schema_editor.connection.vendor != 'sqlite':
+        return
+    with schema_editor.connection.cursor() as cursor:
+        cursor.execute(DROP_FTS_SQL)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('employees', '0004_alter_employee_note_date'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_fts_index, drop_fts_index),
+    ]
@@ -0,0 +1,33 @@
+# Generated by Django 5.0.6 on 2026-10-17 16:25
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('employees', '0008_employee_updated_at'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='exportjob',
+            name='data_at',
+            field=models.DateTimeField(blank=True, null=True, verbose_name='Данные на момент'),
+        ),
+        migrations.CreateModel(
+            name='ExportWatermark',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('exported_at', models.DateTimeField(verbose_name='Данные на момент')),
+                ('user', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, related_name='export_watermark', to=settings.AUTH_USER_MODEL, verbose_name='Пользователь')),
+            ],
+            options={
+                'verbose_name': 'Отметка выгрузки',
+                'verbose_name_plural': 'Отметки выгрузок',
+            },
+        ),
+    ]
@@ -0,0 +1,73 @@
+# Generated by Django 5.0.6 on 2026-10-17 16:50
+
+import django.db.models.functions.comparison
+from django.db import migrations, models
+from django.db.models import Count, Value
+from django.db.models.functions import Coalesce
+
+# Сколько групп дублей показывать в сообщении об ошибке
+DUPLICATES_SHOWN = 20
+
+
+def check_duplicates(apps, schema_editor):
+    """
+    Останавливает миграцию со списком дублей, если они есть.
+
+    Дубли не объединяются автоматически: у них могут различаться
+    логины, пароли и служебные записки, выбрать запись должен человек.
+    """
+    Employee = apps.get_model('employees', 'Employee')
+    employees = Employee.objects.using(
+        schema_editor.connection.alias
+    ).annotate(person_patronymic=Coalesce('patronymic', Value('')))
+    key = ('last_name', 'first_name', 'person_patronymic', 'region_name')
+    groups = list(
+        employees.values(*key)
+        .annotate(count=Count('pk'))
+        .filter(count__gt=1)
+        .order_by(*key)
+    )
+    if not groups:
+        return
+    lines = []
+    for group in groups[:DUPLICATES_SHOWN]:
+        ids = (
+            employees.filter(**{field: group[field] for field in key})
+            .order_by('pk')
+            .values_list('pk', flat=True)
+        )
+        name = ' '.join(
+            part
+            for part in (
+                group['last_name'],
+                group['first_name'],
+                group['person_patronymic'],
+            )
+            if part
+        )
+        lines.append(
+            f"  {name}, регион id={group['region_name']}: "
+            f"сотрудники id {', '.join(map(str, ids))}"
+        )
+    if len(groups) > DUPLICATES_SHOWN:
+        lines.append(f'  … и ещё {len(groups) - DUPLICATES_SHOWN}')
+    raise RuntimeError(
+        'Нельзя добавить ограничение employee_unique_person: в базе есть '
+        'сотрудники с одинаковыми ФИО в одном регионе. Удалите или '
+        'исправьте лишние записи и повторите migrate.\n' + '\n'.join(lines)
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('employees', '0010_employee_indexes'),
+    ]
+
+    operations = [
+        migrations.RunPython(check_duplicates, migrations.RunPython.noop),
+        migrations.AddConstraint(
+            model_name='employee',
+            constraint=models.UniqueConstraint(models.F('last_name'), models.F('first_name'), django.db.models.functions.comparison.Coalesce('patronymic', models.Value('')), models.F('region_name'), name='employee_unique_person', violation_error_message='Такой сотрудник в этом регионе уже существует.'),
+        ),
+    ]
@@ -0,0 +1,96 @@
+# Generated by Django 5.0.6 on 2026-10-17 17:00
+
+import django.db.models.deletion
+import django.db.models.functions.comparison
+from django.db import migrations, models
+from django.db.models import F
+
+# region_code должен совпадать с region_name (check_region_code проверяет
+# это до удаления): region_name переименовывается в region, region_code
+# удаляется, индексы и ограничение пересоздаются.
+
+# Сколько расходящихся сотрудников показывать в сообщении об ошибке
+MISMATCHES_SHOWN = 20
+
+
+def check_region_code(apps, schema_editor):
+    """
+    Останавливает миграцию, если у сотрудников region_code и
+    region_name указывают на разные регионы: удаление region_code
+    молча потеряло бы это значение.
+    """
+    Employee = apps.get_model('employees', 'Employee')
+    mismatched = (
+        Employee.objects.using(schema_editor.connection.alias)
+        .exclude(region_code=F('region_name'))
+        .order_by('pk')
+        .values_list(
+            'pk', 'last_name', 'first_name', 'region_name', 'region_code'
+        )
+    )
+    total = mismatched.count()
+    if not total:
+        return
+    lines = [
+        f'  id {pk} {last_name} {first_name}: '
+        f'region_name={region_name}, region_code={region_code}'
+        for pk, last_name, first_name, region_name, region_code in (
+            mismatched[:MISMATCHES_SHOWN]
+        )
+    ]
+    if total > MISMATCHES_SHOWN:
+        lines.append(f'  … и ещё {total - MISMATCHES_SHOWN}')
+    raise RuntimeError(
+        'Нельзя объединить region_name и region_code: у сотрудников они '
+        'указывают на разные регионы. Исправьте регион у этих записей и '
+        'повторите migrate.\n' + '\n'.join(lines)
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('employees', '0011_employee_unique_person'),
+    ]
+
+    operations = [
+        migrations.RunPython(check_region_code, migrations.RunPython.noop),
+        migrations.RemoveConstraint(
+            model_name='employee',
+            name='employee_unique_person',
+        ),
+        migrations.RemoveIndex(
+            model_name='employee',
+            name='employee_region_status_idx',
+        ),
+        migrations.RemoveIndex(
+            model_name='employee',
+            name='employee_region_created_idx',
+        ),
+        migrations.RemoveField(
+            model_name='employee',
+            name='region_code',
+        ),
+        migrations.RenameField(
+            model_name='employee',
+            old_name='region_name',
+            new_name='region',
+        ),
+        migrations.AlterField(
+            model_name='employee',
+            name='region',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='employees', to='employees.region', verbose_name='Регион'),
+        ),
+        migrations.AddIndex(
+            model_name='employee',
+            index=models.Index(fields=['region', 'status'], name='employee_region_status_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='employee',
+            index=models.Index(fields=['region', 'created_at'], name='employee_region_created_idx'),
+        ),
+        migrations.AddConstraint(
+            model_name='employee',
+            constraint=models.UniqueConstraint(models.F('last_name'), models.F('first_name'), django.db.models.functions.comparison.Coalesce('patronymic', models.Value('')), models.F('region'), name='employee_unique_person', violation_error_message='Такой сотрудник в этом регионе уже существует.'),
+        ),
+    ]
@@ -0,0 +1,118 @@
+# Generated by Django 5.0.6 on 2026-10-17 17:47
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('employees', '0012_employee_region'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ExportSnapshot',
+            fields=[
+                (
+                    'id',
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name='ID',
+                    ),
+                ),
+                (
+                    'token',
+                    models.CharField(
+                        max_length=32, unique=True, verbose_name='Токен'
+                    ),
+                ),
+                (
+                    'count',
+                    models.PositiveIntegerField(
+                        default=0, verbose_name='Строк'
+                    ),
+                ),
+                (
+                    'chunks',
+                    models.PositiveIntegerField(
+                        default=0, verbose_name='Частей'
+                    ),
+                ),
+                (
+                    'query',
+                    models.JSONField(
+                        default=dict, verbose_name='Параметры фильтра'
+                    ),
+                ),
+                (
+                    'version',
+                    models.PositiveBigIntegerField(
+                        default=0, verbose_name='Версия данных'
+                    ),
+                ),
+                (
+                    'taken_at',
+                    models.DateTimeField(verbose_name='Данные на момент'),
+                ),
+                (
+                    'expires_at',
+                    models.DateTimeField(
+                        db_index=True, verbose_name='Действует до'
+                    ),
+                ),
+                (
+                    'user',
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        to=settings.AUTH_USER_MODEL,
+                        verbose_name='Пользователь',
+                    ),
+                ),
+            ],
+            options={
+                'verbose_name': 'Снимок выборки',
+                'verbose_name_plural': 'Снимки выборок',
+            },
+        ),
+        migrations.CreateModel(
+            name='ExportSnapshotPart',
+            fields=[
+                (
+                    'id',
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name='ID',
+                    ),
+                ),
+                ('number', models.PositiveIntegerField(verbose_name='Номер')),
+                ('ids', models.JSONField(verbose_name='Id сотрудников')),
+                (
+                    'snapshot',
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name='parts',
+                        to='employees.exportsnapshot',
+                        verbose_name='Снимок',
+                    ),
+                ),
+            ],
+            options={
+                'verbose_name': 'Часть снимка',
+                'verbose_name_plural': 'Части снимков',
+            },
+        ),
+        migrations.AddConstraint(
+            model_name='exportsnapshotpart',
+            constraint=models.UniqueConstraint(
+                fields=('snapshot', 'number'),
+                name='export_snapshot_part_unique',
+            ),
+        ),
+    ]
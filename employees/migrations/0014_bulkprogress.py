@@ -0,0 +1,61 @@
+# Generated by Django 5.0.6 on 2026-10-17 17:58
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('employees', '0013_exportsnapshot'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='BulkProgress',
+            fields=[
+                (
+                    'id',
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name='ID',
+                    ),
+                ),
+                (
+                    'token',
+                    models.CharField(
+                        max_length=32, unique=True, verbose_name='Токен'
+                    ),
+                ),
+                (
+                    'done',
+                    models.PositiveIntegerField(
+                        default=0, verbose_name='Выполнено'
+                    ),
+                ),
+                (
+                    'total',
+                    models.PositiveIntegerField(
+                        default=0, verbose_name='Всего'
+                    ),
+                ),
+                (
+                    'finished',
+                    models.BooleanField(
+                        default=False, verbose_name='Завершено'
+                    ),
+                ),
+                (
+                    'updated_at',
+                    models.DateTimeField(
+                        auto_now=True, db_index=True, verbose_name='Обновлено'
+                    ),
+                ),
+            ],
+            options={
+                'verbose_name': 'Ход массовой операции',
+                'verbose_name_plural': 'Ход массовых операций',
+            },
+        ),
+    ]
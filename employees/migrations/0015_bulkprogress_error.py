@@ -0,0 +1,18 @@
+# Generated by Django 5.0.6 on 2026-10-17 17:59
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('employees', '0014_bulkprogress'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='bulkprogress',
+            name='error',
+            field=models.TextField(blank=True, verbose_name='Ошибка'),
+        ),
+    ]
@@ -4,6 +4,8 @@ from django.conf import settings
 from django.core.exceptions import ValidationError
 from django.core.validators import RegexValidator
 from django.db import models
+from django.db.models import F, Value
+from django.db.models.functions import Coalesce
 from django.utils import timezone
 
 
@@ -110,18 +112,12 @@ class Employee(models.Model):
         verbose_name="Отчество",
     )
 
-    region_name = models.ForeignKey(
+    region = models.ForeignKey(
         Region,
         on_delete=models.CASCADE,
-        related_name="as_name",
+        related_name="employees",
         verbose_name="Регион",
     )
-    region_code = models.ForeignKey(
-        Region,
-        on_delete=models.CASCADE,
-        related_name="as_code",
-        verbose_name="Код региона",
-    )
 
     note_date = models.DateField(
         null=True,
@@ -161,17 +157,76 @@ class Employee(models.Model):
         auto_now_add=True,
         verbose_name="Дата создания",
     )
+    # auto_now не срабатывает при QuerySet.update() и bulk_update():
+    # там updated_at нужно передавать явно
+    updated_at = models.DateTimeField(
+        auto_now=True,
+        db_index=True,
+        verbose_name="Дата изменения",
+    )
 
     class Meta:
         verbose_name = "Сотрудник"
         verbose_name_plural = "Сотрудники"
+        # индексы под фильтры поиска, фасеты и списки регионов
+        # (планы запросов: manage.py explain_queries)
+        indexes = [
+            models.Index(
+                fields=["last_name", "first_name"],
+                name="employee_name_idx",
+            ),
+            models.Index(fields=["status"], name="employee_status_idx"),
+            models.Index(fields=["note_date"], name="employee_note_date_idx"),
+            models.Index(fields=["created_at"], name="employee_created_idx"),
+            models.Index(
+                fields=["region", "status"],
+                name="employee_region_status_idx",
+            ),
+            # employees_by_region: регион + сортировка по created_at, id
+            models.Index(
+                fields=["region", "created_at"],
+                name="employee_region_created_idx",
+            ),
+        ]
+        constraints = [
+            # один сотрудник с таким ФИО в регионе; отчество NULL и ""
+            # считаются одинаковыми
+            models.UniqueConstraint(
+                F("last_name"),
+                F("first_name"),
+                Coalesce("patronymic", Value("")),
+                F("region"),
+                name="employee_unique_person",
+                violation_error_message=(
+                    "Такой сотрудник в этом регионе уже существует."
+                ),
+            ),
+        ]
 
     def __str__(self):
         return (
             f"{self.last_name} {self.first_name} "
-            f"({self.region_code.code}) – {self.get_status_display()}"
+            f"({self.region.code}) – {self.get_status_display()}"
         )
 
+    # Прежние поля region_name и region_code (оба указывали на регион
+    # сотрудника) — для шаблонов и кода, которые обращаются к ним
+    @property
+    def region_name(self):
+        return self.region
+
+    @region_name.setter
+    def region_name(self, value):
+        self.region = value
+
+    @property
+    def region_code(self):
+        return self.region
+
+    @region_code.setter
+    def region_code(self, value):
+        self.region = value
+
 
 class ActionLog(models.Model):
     """Лог действий пользователей над сотрудниками."""
@@ -206,6 +261,9 @@ class ActionLog(models.Model):
 
     class Meta:
         ordering = ("-timestamp",)
+        indexes = [
+            models.Index(fields=["timestamp"], name="actionlog_timestamp_idx"),
+        ]
         verbose_name = "Лог действия"
         verbose_name_plural = "Логи действий"
 
@@ -246,6 +304,11 @@ class LoginHistory(models.Model):
 
     class Meta:
         ordering = ("-timestamp",)
+        indexes = [
+            models.Index(
+                fields=["timestamp"], name="loginhistory_timestamp_idx"
+            ),
+        ]
         verbose_name = "История входов"
         verbose_name_plural = "История входов"
 
@@ -253,3 +316,190 @@ class LoginHistory(models.Model):
         user_display = self.user or self.username or "unknown"
         status = "ok" if self.success else "fail"
         return f"[{self.timestamp}] login {status}: {user_display}"
+
+
+class DataVersion(models.Model):
+    """
+    Глобальная версия данных сотрудников.
+
+    Увеличивается при каждом изменении сотрудников; ключи кэшей
+    (результаты поиска, фасеты) включают версию, поэтому все записи
+    кэша становятся неактуальными одновременно.
+    """
+
+    version = models.PositiveBigIntegerField(
+        default=0,
+        verbose_name="Версия",
+    )
+    changed_at = models.DateTimeField(
+        auto_now=True,
+        verbose_name="Время изменения",
+    )
+
+    class Meta:
+        verbose_name = "Версия данных"
+        verbose_name_plural = "Версия данных"
+
+    def __str__(self):
+        return f"v{self.version} ({self.changed_at})"
+
+
+class ExportJob(models.Model):
+    """Фоновая выгрузка сотрудников в файл."""
+
+    PENDING = "pending"
+    RUNNING = "running"
+    DONE = "done"
+    FAILED = "failed"
+    STATUSES = [
+        (PENDING, "В очереди"),
+        (RUNNING, "Выполняется"),
+        (DONE, "Готово"),
+        (FAILED, "Ошибка"),
+    ]
+
+    user = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.CASCADE,
+        verbose_name="Пользователь",
+    )
+    status = models.CharField(
+        max_length=10,
+        choices=STATUSES,
+        default=PENDING,
+        verbose_name="Статус",
+    )
+    total = models.PositiveIntegerField(default=0, verbose_name="Всего строк")
+    done = models.PositiveIntegerField(default=0, verbose_name="Выгружено")
+    file_name = models.CharField(
+        max_length=255,
+        blank=True,
+        verbose_name="Файл",
+    )
+    error = models.TextField(blank=True, verbose_name="Ошибка")
+    data_at = models.DateTimeField(
+        null=True,
+        blank=True,
+        verbose_name="Данные на момент",
+    )
+    created_at = models.DateTimeField(
+        auto_now_add=True,
+        verbose_name="Создано",
+    )
+    finished_at = models.DateTimeField(
+        null=True,
+        blank=True,
+        verbose_name="Завершено",
+    )
+
+    class Meta:
+        ordering = ("-created_at",)
+        verbose_name = "Задача экспорта"
+        verbose_name_plural = "Задачи экспорта"
+
+    def __str__(self):
+        return f"Экспорт #{self.pk} ({self.get_status_display()})"
+
+
+class ExportWatermark(models.Model):
+    """Момент, на который пользователь последний раз выгрузил данные."""
+
+    user = models.OneToOneField(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.CASCADE,
+        related_name="export_watermark",
+        verbose_name="Пользователь",
+    )
+    exported_at = models.DateTimeField(verbose_name="Данные на момент")
+
+    class Meta:
+        verbose_name = "Отметка выгрузки"
+        verbose_name_plural = "Отметки выгрузок"
+
+    def __str__(self):
+        return f"{self.user}: {self.exported_at}"
+
+
+class ExportSnapshot(models.Model):
+    """
+    Снимок выборки для экспорта: id найденных сотрудников на момент
+    подтверждения. Хранится в БД, чтобы экспорт по токену работал в
+    любом процессе веб-сервера.
+    """
+
+    token = models.CharField(max_length=32, unique=True, verbose_name="Токен")
+    user = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.CASCADE,
+        verbose_name="Пользователь",
+    )
+    count = models.PositiveIntegerField(default=0, verbose_name="Строк")
+    chunks = models.PositiveIntegerField(default=0, verbose_name="Частей")
+    query = models.JSONField(default=dict, verbose_name="Параметры фильтра")
+    version = models.PositiveBigIntegerField(
+        default=0,
+        verbose_name="Версия данных",
+    )
+    taken_at = models.DateTimeField(verbose_name="Данные на момент")
+    expires_at = models.DateTimeField(
+        db_index=True,
+        verbose_name="Действует до",
+    )
+
+    class Meta:
+        verbose_name = "Снимок выборки"
+        verbose_name_plural = "Снимки выборок"
+
+    def __str__(self):
+        return f"{self.token} ({self.count})"
+
+
+class ExportSnapshotPart(models.Model):
+    """Порция id снимка выборки."""
+
+    snapshot = models.ForeignKey(
+        ExportSnapshot,
+        on_delete=models.CASCADE,
+        related_name="parts",
+        verbose_name="Снимок",
+    )
+    number = models.PositiveIntegerField(verbose_name="Номер")
+    ids = models.JSONField(verbose_name="Id сотрудников")
+
+    class Meta:
+        verbose_name = "Часть снимка"
+        verbose_name_plural = "Части снимков"
+        constraints = [
+            models.UniqueConstraint(
+                fields=["snapshot", "number"],
+                name="export_snapshot_part_unique",
+            ),
+        ]
+
+    def __str__(self):
+        return f"{self.snapshot_id}:{self.number}"
+
+
+class BulkProgress(models.Model):
+    """
+    Ход массовой операции по токену. Хранится в БД, чтобы опрос хода
+    работал в любом процессе веб-сервера.
+    """
+
+    token = models.CharField(max_length=32, unique=True, verbose_name="Токен")
+    done = models.PositiveIntegerField(default=0, verbose_name="Выполнено")
+    total = models.PositiveIntegerField(default=0, verbose_name="Всего")
+    finished = models.BooleanField(default=False, verbose_name="Завершено")
+    error = models.TextField(blank=True, verbose_name="Ошибка")
+    updated_at = models.DateTimeField(
+        auto_now=True,
+        db_index=True,
+        verbose_name="Обновлено",
+    )
+
+    class Meta:
+        verbose_name = "Ход массовой операции"
+        verbose_name_plural = "Ход массовых операций"
+
+    def __str__(self):
+        return f"{self.token}: {self.done}/{self.total}"
@@ -0,0 +1,275 @@
+import base64
+import binascii
+import datetime
+import json
+from typing import Optional
+from urllib.parse import urlencode
+
+from django.core.exceptions import ValidationError
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db.models import Q
+
+# Фиксированный размер страницы для списков сотрудников
+PAGE_SIZE = 50
+
+# Параметры URL, в которых передаётся курсор
+CURSOR_PARAMS = ('after', 'before')
+
+
+class KeysetPage:
+    """Страница результатов keyset-пагинации."""
+
+    def __init__(self, object_list, next_cursor=None, prev_cursor=None):
+        self.object_list = object_list
+        self.next_cursor = next_cursor
+        self.prev_cursor = prev_cursor
+
+    def __iter__(self):
+        return iter(self.object_list)
+
+    def __len__(self):
+        return len(self.object_list)
+
+    @property
+    def has_other_pages(self) -> bool:
+        """Есть ли соседние страницы."""
+        return bool(self.next_cursor or self.prev_cursor)
+
+
+def _cursor_value(value):
+    # DjangoJSONEncoder обрезает время до миллисекунд: курсор по
+    # created_at оказался бы раньше граничной строки, и она повторилась
+    # бы на следующей странице. isoformat() сохраняет микросекунды.
+    if isinstance(value, (datetime.datetime, datetime.time)):
+        return value.isoformat()
+    return value
+
+
+def encode_cursor(values) -> str:
+    """
+    Кодирует значения ключа сортировки в курсор для URL.
+
+    Args:
+        values (list): значения полей сортировки последней/первой строки.
+
+    Returns:
+        str: base64-строка без символов заполнения.
+    """
+    raw = json.dumps(
+        [_cursor_value(value) for value in values],
+        cls=DjangoJSONEncoder,
+        ensure_ascii=False,
+    )
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip('=')
+
+
+def decode_cursor(token, model, ordering) -> Optional[list]:
+    """
+    Декодирует курсор и приводит значения к типам полей модели.
+
+    Args:
+        token (str | None): курсор из URL.
+        model (Model): модель, по полям которой идёт сортировка.
+        ordering (tuple[str]): поля сортировки.
+
+    Returns:
+        list | None: значения ключа или None, если курсор некорректен.
+    """
+    if not token:
+        return None
+    try:
+        padded = token + '=' * (-len(token) % 4)
+        values = json.loads(base64.urlsafe_b64decode(padded))
+    except (binascii.Error, ValueError, UnicodeDecodeError):
+        return None
+    if not isinstance(values, list) or len(values) != len(ordering):
+        return None
+    try:
+        return [
+            model._meta.get_field(field).to_python(value)
+            for field, value in zip(ordering, values)
+        ]
+    except ValidationError:
+        return None
+
+
+def parse_cursor(params, model, ordering) -> dict:
+    """
+    Возвращает корректный курсор из параметров запроса.
+
+    Некорректные курсоры отбрасываются, поэтому результат можно сразу
+    добавлять в канонический набор параметров URL.
+
+    Args:
+        params (QueryDict): параметры запроса.
+        model (Model): модель списка.
+        ordering (tuple[str]): поля сортировки.
+
+    Returns:
+        dict: {'after': ...} или {'before': ...} либо пустой словарь.
+    """
+    for name in CURSOR_PARAMS:
+        token = params.get(name)
+        if decode_cursor(token, model, ordering) is not None:
+            return {name: token}
+    return {}
+
+
+def _seek_filter(ordering, values, reverse=False) -> Q:
+    """Условие «строго после/до ключа» для составного ключа сортировки."""
+    op = 'lt' if reverse else 'gt'
+    condition = Q()
+    for i, field in enumerate(ordering):
+        lookup = dict(zip(ordering[:i], values[:i]))
+        lookup[f'{field}__{op}'] = values[i]
+        condition |= Q(**lookup)
+    return condition
+
+
+def _cursor_for(obj, ordering) -> str:
+    return encode_cursor(getattr(obj, field) for field in ordering)
+
+
+def paginate(
+    queryset,
+    ordering,
+    after: Optional[str] = None,
+    before: Optional[str] = None,
+    page_size: int = PAGE_SIZE,
+) -> KeysetPage:
+    """
+    Keyset (seek) пагинация: читает не более page_size + 1 строк.
+
+    Стоимость запроса не зависит от номера страницы и общего числа
+    найденных строк, так как вместо OFFSET используется условие
+    по составному ключу сортировки.
+
+    Args:
+        queryset (QuerySet): отфильтрованный набор строк.
+        ordering (tuple[str]): уникальный ключ сортировки, например
+            ('last_name', 'id').
+        after (str | None): курсор — вернуть строки после него.
+        before (str | None): курсор — вернуть строки до него.
+        page_size (int): размер страницы.
+
+    Returns:
+        KeysetPage: строки страницы и курсоры соседних страниц.
+    """
+    model = queryset.model
+    after_values = decode_cursor(after, model, ordering)
+    before_values = (
+        decode_cursor(before, model, ordering)
+        if after_values is None
+        else None
+    )
+
+    if before_values is not None:
+        rows = list(
+            queryset.filter(
+                _seek_filter(ordering, before_values, reverse=True)
+            ).order_by(*(f'-{field}' for field in ordering))[: page_size + 1]
+        )
+        has_prev = len(rows) > page_size
+        rows = rows[:page_size][::-1]
+        has_next = True
+    else:
+        if after_values is not None:
+            queryset = queryset.filter(_seek_filter(ordering, after_values))
+        rows = list(queryset.order_by(*ordering)[: page_size + 1])
+        has_next = len(rows) > page_size
+        rows = rows[:page_size]
+        has_prev = after_values is not None
+
+    return KeysetPage(
+        rows,
+        next_cursor=_cursor_for(rows[-1], ordering)
+        if has_next and rows
+        else None,
+        prev_cursor=_cursor_for(rows[0], ordering)
+        if has_prev and rows
+        else None,
+    )
+
+
+def paginate_ids(
+    queryset,
+    ids,
+    ordering,
+    after: Optional[str] = None,
+    before: Optional[str] = None,
+    page_size: int = PAGE_SIZE,
+) -> Optional[KeysetPage]:
+    """
+    Пагинация по готовому упорядоченному списку id (например, из кэша).
+
+    Курсоры совместимы с paginate(): позиция определяется по id,
+    который всегда является последним полем ключа сортировки.
+    Из базы читается только одна страница строк по первичному ключу.
+
+    Args:
+        queryset (QuerySet): набор для загрузки строк страницы
+            (с нужными select_related).
+        ids (list[int]): id всех найденных строк в порядке ordering.
+        ordering (tuple[str]): ключ сортировки, оканчивающийся на 'id'.
+        after (str | None): курсор — вернуть строки после него.
+        before (str | None): курсор — вернуть строки до него.
+        page_size (int): размер страницы.
+
+    Returns:
+        KeysetPage | None: страница или None, если строки курсора
+            нет в списке (тогда нужен обычный paginate()).
+    """
+    model = queryset.model
+    start = 0
+    for name, token in (('after', after), ('before', before)):
+        values = decode_cursor(token, model, ordering)
+        if values is None:
+            continue
+        try:
+            position = ids.index(values[-1])
+        except ValueError:
+            return None
+        start = position + 1 if name == 'after' else position - page_size
+        start = max(start, 0)
+        end = position if name == 'before' else start + page_size
+        break
+    else:
+        end = page_size
+
+    page_ids = ids[start:end]
+    objects = queryset.in_bulk(page_ids)
+    rows = [objects[pk] for pk in page_ids if pk in objects]
+    return KeysetPage(
+        rows,
+        next_cursor=_cursor_for(rows[-1], ordering)
+        if rows and end < len(ids)
+        else None,
+        prev_cursor=_cursor_for(rows[0], ordering)
+        if rows and start > 0
+        else None,
+    )
+
+
+def pagination_context(page, url, params) -> dict:
+    """
+    Формирует ссылки на соседние страницы в каноническом виде.
+
+    Args:
+        page (KeysetPage): текущая страница.
+        url (str): путь страницы списка.
+        params (dict): канонические параметры фильтра (без курсора).
+
+    Returns:
+        dict: контекст шаблона pagination.html.
+    """
+    params = {k: v for k, v in params.items() if k not in CURSOR_PARAMS}
+    context = {'page': page, 'next_page_url': '', 'prev_page_url': ''}
+    if page.next_cursor:
+        context['next_page_url'] = (
+            f"{url}?{urlencode({**params, 'after': page.next_cursor})}"
+        )
+    if page.prev_cursor:
+        context['prev_page_url'] = (
+            f"{url}?{urlencode({**params, 'before': page.prev_cursor})}"
+        )
+    return context
@@ -0,0 +1,153 @@
+"""
+Заранее построенные файлы выгрузки (ночные снимки).
+
+Команда build_export_snapshots строит полную выгрузку и выгрузки по
+каждому региону в каталог EXPORT_SNAPSHOT_DIR/v<версия данных>/ и
+пишет manifest.json. Пока версия данных не изменилась, export_excel
+отдаёт эти файлы как статические (с ETag и Last-Modified), не выполняя
+запросов к сотрудникам.
+"""
+import json
+import shutil
+import tempfile
+from datetime import datetime, timezone as dt_timezone
+from pathlib import Path
+from typing import Optional
+
+from django.conf import settings
+
+from .caching import get_data_version
+from .exports import iter_rows, write_xlsx
+from .models import Employee
+
+# Каталог заранее построенных выгрузок
+EXPORT_SNAPSHOT_DIR = Path(
+    getattr(
+        settings,
+        'EXPORT_SNAPSHOT_DIR',
+        Path(settings.BASE_DIR) / 'exports' / 'snapshots',
+    )
+)
+
+MANIFEST = 'manifest.json'
+FULL_KEY = 'all'
+
+
+def snapshot_key(canon: dict) -> Optional[str]:
+    """
+    Ключ файла снимка для канонического фильтра.
+
+    Снимки есть только для полной выгрузки и для одного региона.
+
+    Returns:
+        str | None: 'all', 'region_<id>' или None.
+    """
+    if not canon:
+        return FULL_KEY
+    if list(canon) == ['region_name']:
+        return f"region_{canon['region_name']}"
+    return None
+
+
+def _write(path: Path, queryset) -> int:
+    with open(path, 'wb') as fileobj:
+        return write_xlsx(iter_rows(queryset), fileobj)
+
+
+def build_snapshots() -> dict:
+    """
+    Строит полную выгрузку и выгрузки по регионам для текущей версии.
+
+    Файлы пишутся во временный каталог, который затем переименовывается
+    в v<версия>, поэтому читатели не видят недостроенный снимок.
+    Снимки прошлых версий удаляются.
+
+    Returns:
+        dict: манифест построенного снимка.
+    """
+    version = get_data_version()
+    EXPORT_SNAPSHOT_DIR.mkdir(parents=True, exist_ok=True)
+    target = EXPORT_SNAPSHOT_DIR / f'v{version}'
+    workdir = Path(
+        tempfile.mkdtemp(prefix='.build_', dir=EXPORT_SNAPSHOT_DIR)
+    )
+    try:
+        files = {
+            FULL_KEY: {
+                'file': f'{FULL_KEY}.xlsx',
+                'count': _write(
+                    workdir / f'{FULL_KEY}.xlsx', Employee.objects.all()
+                ),
+            }
+        }
+        region_ids = (
+            Employee.objects.order_by('region_id')
+            .values_list('region_id', flat=True)
+            .distinct()
+        )
+        for region_id in region_ids:
+            key = f'region_{region_id}'
+            files[key] = {
+                'file': f'{key}.xlsx',
+                'count': _write(
+                    workdir / f'{key}.xlsx',
+                    Employee.objects.filter(region_id=region_id),
+                ),
+            }
+
+        manifest = {
+            'version': version,
+            'built_at': datetime.now(dt_timezone.utc).isoformat(),
+            'files': files,
+        }
+        with open(workdir / MANIFEST, 'w', encoding='utf-8') as fileobj:
+            json.dump(manifest, fileobj, ensure_ascii=False, indent=2)
+
+        shutil.rmtree(target, ignore_errors=True)
+        workdir.rename(target)
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+    for old in EXPORT_SNAPSHOT_DIR.glob('v*'):
+        if old != target:
+            shutil.rmtree(old, ignore_errors=True)
+    return manifest
+
+
+def find_snapshot(canon: dict, version: Optional[int] = None):
+    """
+    Ищет готовый файл выгрузки для фильтра и текущей версии данных.
+
+    Args:
+        canon (dict): канонические параметры фильтра.
+        version (int | None): текущая версия данных (если уже известна).
+
+    Returns:
+        dict | None: {'path', 'etag', 'last_modified', 'count'} или None,
+            если снимка нет или данные изменились после его построения.
+    """
+    key = snapshot_key(canon)
+    if key is None:
+        return None
+    if version is None:
+        version = get_data_version()
+    directory = EXPORT_SNAPSHOT_DIR / f'v{version}'
+    try:
+        with open(directory / MANIFEST, encoding='utf-8') as fileobj:
+            manifest = json.load(fileobj)
+    except (OSError, ValueError):
+        return None
+    entry = manifest['files'].get(key)
+    if entry is None or manifest['version'] != version:
+        return None
+    path = directory / entry['file']
+    try:
+        mtime = path.stat().st_mtime
+    except OSError:
+        return None
+    return {
+        'path': path,
+        'etag': f'"v{version}-{key}"',
+        'last_modified': int(mtime),
+        'count': entry['count'],
+    }
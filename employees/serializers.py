@@ -14,8 +14,9 @@ class RegionSerializer(serializers.ModelSerializer):
 class EmployeeSerializer(serializers.ModelSerializer):
     """Сериализатор для модели Employee."""
 
-    region_name = serializers.StringRelatedField()
-    region_code = serializers.StringRelatedField()
+    # прежние имена: оба поля — строка региона сотрудника
+    region_name = serializers.StringRelatedField(source='region')
+    region_code = serializers.StringRelatedField(source='region')
     status = serializers.CharField(source='get_status_display', read_only=True)
 
     class Meta:
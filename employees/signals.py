@@ -3,10 +3,20 @@ from django.contrib.auth.signals import (
     user_logged_out,
     user_login_failed,
 )
+from django.core.signals import request_started
+from django.db.backends.signals import connection_created
+from django.db.models.signals import post_delete, post_save
 from django.dispatch import receiver
 
-from .models import LoginHistory
-from .utils import get_client_ip, get_user_agent
+from . import fts, sqlite, suggest
+from .caching import bump_data_version, in_bulk_change
+from .models import Employee, LoginHistory, PasswordPolicy, Region
+from .writes import defer_write
+from .utils import (
+    get_client_ip,
+    get_user_agent,
+    invalidate_password_policy,
+)
 
 
 @receiver(user_logged_in)
@@ -19,7 +29,8 @@ def on_user_logged_in(sender, request, user, **kwargs):
         request (HttpRequest): текущий запрос.
         user (User): пользователь, выполнивший вход.
     """
-    LoginHistory.objects.create(
+    defer_write(
+        LoginHistory.objects.create,
         user=user,
         username=user.username,
         success=True,
@@ -38,7 +49,8 @@ def on_user_logged_out(sender, request, user, **kwargs):
         request (HttpRequest): текущий запрос.
         user (User): пользователь, выполнивший выход.
     """
-    LoginHistory.objects.create(
+    defer_write(
+        LoginHistory.objects.create,
         user=user,
         username=getattr(user, 'username', ''),
         success=True,
@@ -58,10 +70,79 @@ def on_user_login_failed(sender, credentials, request, **kwargs):
         request (HttpRequest | None): текущий запрос, может быть None.
     """
     username = credentials.get('username') if credentials else ''
-    LoginHistory.objects.create(
+    defer_write(
+        LoginHistory.objects.create,
         user=None,
         username=username or '',
         success=False,
         ip=get_client_ip(request) if request else None,
         user_agent=get_user_agent(request) if request else '',
     )
+
+
+@receiver(post_save, sender=Employee)
+def on_employee_saved(sender, instance, using, **kwargs):
+    """
+    Обновляет поисковые индексы и версию данных после сохранения.
+
+    Args:
+        sender: модель Employee.
+        instance (Employee): сохранённый сотрудник.
+        using (str): алиас базы данных.
+    """
+    fts.index_employees([instance], using)
+    suggest.update_employee(instance)
+    bump_data_version()
+
+
+@receiver(post_delete, sender=Employee)
+def on_employee_deleted(sender, instance, using, **kwargs):
+    """
+    Удаляет сотрудника из индексов и увеличивает версию данных.
+
+    Внутри bulk_change() индексы обновляются порцией после удаления.
+
+    Args:
+        sender: модель Employee.
+        instance (Employee): удалённый сотрудник.
+        using (str): алиас базы данных.
+    """
+    if not in_bulk_change():
+        fts.unindex_employees([instance.pk], using)
+        suggest.remove_employee(instance.pk)
+    bump_data_version()
+
+
+@receiver(post_save, sender=Region)
+@receiver(post_delete, sender=Region)
+def on_region_changed(sender, instance, **kwargs):
+    """
+    Увеличивает версию данных при изменении региона.
+
+    Название региона выводится в строках таблиц и фасетах, которые
+    кэшируются по версии данных.
+    """
+    bump_data_version()
+
+
+@receiver(post_save, sender=PasswordPolicy)
+@receiver(post_delete, sender=PasswordPolicy)
+def on_password_policy_changed(sender, instance, **kwargs):
+    """Сбрасывает кэш политики паролей текущего процесса."""
+    invalidate_password_policy()
+
+
+@receiver(connection_created)
+def on_connection_created(sender, connection, **kwargs):
+    """Применяет SQLITE_PRAGMAS (WAL, busy_timeout, ...) к соединению."""
+    sqlite.configure_connection(connection)
+
+
+@receiver(request_started, dispatch_uid='employees_suggest_warm_up')
+def on_first_request(sender, **kwargs):
+    """
+    Начинает строить индекс подсказок в фоне, как только процесс
+    начал обслуживать запросы (не при migrate и других командах).
+    """
+    request_started.disconnect(dispatch_uid='employees_suggest_warm_up')
+    suggest.warm_up()
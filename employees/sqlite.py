@@ -0,0 +1,94 @@
+"""
+Настройка соединений SQLite и обслуживание базы.
+
+Параметры PRAGMA из настройки SQLITE_PRAGMAS применяются к каждому
+новому соединению (сигнал connection_created): режим WAL позволяет
+читать во время записи (например, записи LoginHistory при входе), а
+busy_timeout заставляет пишущих ждать освобождения блокировки вместо
+ошибки «database is locked».
+"""
+import time
+from typing import Optional
+
+from django.conf import settings
+from django.db import connections
+
+# Имя PRAGMA -> значение; порядок важен: busy_timeout задаётся раньше
+# journal_mode, чтобы переключение в WAL дожидалось блокировки
+SQLITE_PRAGMAS = getattr(settings, 'SQLITE_PRAGMAS', {})
+
+
+def configure_connection(connection) -> None:
+    """
+    Применяет SQLITE_PRAGMAS к новому соединению SQLite.
+
+    Args:
+        connection: обёртка соединения Django.
+    """
+    if connection.vendor != 'sqlite' or not SQLITE_PRAGMAS:
+        return
+    with connection.cursor() as cursor:
+        for name, value in SQLITE_PRAGMAS.items():
+            cursor.execute(f'PRAGMA {name} = {value}')
+
+
+def _pragma(cursor, statement: str) -> list:
+    cursor.execute(statement)
+    # PRAGMA выполняется до конца только при чтении всех строк
+    return cursor.fetchall()
+
+
+def run_maintenance(
+    using: str = 'default', vacuum_pages: Optional[int] = None
+) -> list:
+    """
+    Обслуживание базы: статистика, оптимизация, освобождение страниц и
+    перенос WAL в основной файл.
+
+    Шаги: ANALYZE, PRAGMA optimize, PRAGMA incremental_vacuum (если
+    включён auto_vacuum=INCREMENTAL) и PRAGMA wal_checkpoint(TRUNCATE).
+
+    Args:
+        using (str): алиас базы данных.
+        vacuum_pages (int | None): сколько свободных страниц вернуть
+            (None — все).
+
+    Returns:
+        list[tuple]: (шаг, секунды, результат) для каждого шага.
+    """
+    connection = connections[using]
+    steps = []
+    with connection.cursor() as cursor:
+
+        def step(name, statement):
+            started = time.monotonic()
+            result = _pragma(cursor, statement)
+            steps.append((name, time.monotonic() - started, result))
+
+        step('ANALYZE', 'ANALYZE')
+        step('optimize', 'PRAGMA optimize')
+        auto_vacuum = _pragma(cursor, 'PRAGMA auto_vacuum')[0][0]
+        if auto_vacuum == 2:
+            pages = '' if vacuum_pages is None else f'({int(vacuum_pages)})'
+            step('incremental_vacuum', f'PRAGMA incremental_vacuum{pages}')
+        else:
+            steps.append(
+                ('incremental_vacuum', 0.0, 'auto_vacuum не INCREMENTAL')
+            )
+        step('wal_checkpoint', 'PRAGMA wal_checkpoint(TRUNCATE)')
+    return steps
+
+
+def enable_incremental_vacuum(using: str = 'default') -> float:
+    """
+    Включает auto_vacuum=INCREMENTAL (разово, выполняет полный VACUUM).
+
+    Returns:
+        float: время выполнения в секундах.
+    """
+    started = time.monotonic()
+    with connections[using].cursor() as cursor:
+        cursor.execute('PRAGMA auto_vacuum = INCREMENTAL')
+        # режим применяется к существующей базе только после VACUUM
+        cursor.execute('VACUUM')
+    return time.monotonic() - started
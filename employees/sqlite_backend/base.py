@@ -0,0 +1,27 @@
+"""
+Бэкенд SQLite, в котором внешний atomic() может начинаться с
+BEGIN IMMEDIATE.
+
+Стандартный бэкенд Django 5.0 всегда начинает транзакцию с BEGIN
+(DEFERRED): блокировка записи берётся только на первом INSERT/UPDATE,
+а выполнить свой BEGIN внутри atomic() уже нельзя. Здесь режим
+следующей транзакции задаётся атрибутом begin_mode соединения
+(то же, что OPTIONS["transaction_mode"] в Django 5.1). Используется
+employees.writes.write_atomic().
+"""
+from django.db.backends.sqlite3 import base
+
+
+class DatabaseWrapper(base.DatabaseWrapper):
+    """Соединение SQLite с настраиваемым режимом BEGIN."""
+
+    # '' — обычный BEGIN, 'IMMEDIATE' — сразу взять блокировку записи.
+    # Соединение принадлежит одному потоку, поэтому атрибут экземпляра
+    # безопасен.
+    begin_mode = ''
+
+    def _start_transaction_under_autocommit(self):
+        if self.begin_mode:
+            self.cursor().execute(f'BEGIN {self.begin_mode}')
+        else:
+            super()._start_transaction_under_autocommit()
@@ -0,0 +1,273 @@
+"""
+Подсказки фамилий и логинов по префиксу без обращения к БД.
+
+Индекс — отсортированный список нормализованных строк в памяти
+процесса; поиск — двоичный поиск по префиксу. Индекс строится в фоне
+после старта процесса (warm_up), дальше обновляется сигналами Employee
+и периодически перестраивается в фоне (изменения из других процессов).
+Изменения, пришедшие во время перестроения, повторяются после замены
+индекса, чтобы не потеряться.
+"""
+import bisect
+import logging
+import threading
+import time
+
+from django.conf import settings
+from django.db import DatabaseError, connection
+
+from .fts import normalize
+
+# Количество подсказок по умолчанию и максимальное
+SUGGEST_LIMIT = getattr(settings, 'SUGGEST_LIMIT', 10)
+SUGGEST_MAX_LIMIT = 50
+
+# Через сколько секунд индекс перестраивается в фоне
+SUGGEST_REFRESH_INTERVAL = getattr(settings, 'SUGGEST_REFRESH_INTERVAL', 300)
+
+# Поля сотрудника, попадающие в подсказки
+SUGGEST_FIELDS = ('last_name', 'login')
+
+logger = logging.getLogger('app')
+
+
+class PrefixIndex:
+    """Отсортированный индекс (ключ, поле, значение, id) для подсказок."""
+
+    def __init__(self):
+        self._entries = []
+        self._by_pk = {}
+        self._lock = threading.RLock()
+        self._built_at = None
+        self._refreshing = False
+        # изменения во время перестроения: pk -> значения (None — удалён)
+        self._pending = None
+        self._rebuilds = 0
+
+    @staticmethod
+    def _entries_for(pk, values):
+        return [
+            (normalize(values[field]), field, values[field], pk)
+            for field in SUGGEST_FIELDS
+            if values.get(field)
+        ]
+
+    @property
+    def is_built(self) -> bool:
+        return self._built_at is not None
+
+    def build(self, rows) -> None:
+        """
+        Полностью перестраивает индекс.
+
+        Изменения, записанные во время rebuild(), применяются поверх
+        новых строк: rows могли быть прочитаны до них.
+
+        Args:
+            rows (Iterable[dict]): словари с ключами pk и SUGGEST_FIELDS.
+        """
+        entries = []
+        by_pk = {}
+        for row in rows:
+            row_entries = self._entries_for(row['pk'], row)
+            entries.extend(row_entries)
+            by_pk[row['pk']] = row_entries
+        entries.sort()
+        with self._lock:
+            self._entries = entries
+            self._by_pk = by_pk
+            for pk, values in (self._pending or {}).items():
+                if values is None:
+                    self._remove(pk)
+                else:
+                    self._put(pk, values)
+            self._built_at = time.monotonic()
+
+    def rebuild(self, loader) -> None:
+        """
+        Перестраивает индекс из loader(), запоминая изменения,
+        сделанные, пока loader читает сотрудников.
+        """
+        with self._lock:
+            if self._pending is None:
+                self._pending = {}
+            self._rebuilds += 1
+        try:
+            self.build(loader())
+        finally:
+            with self._lock:
+                self._rebuilds -= 1
+                if not self._rebuilds:
+                    self._pending = None
+
+    def _record(self, pk, values):
+        if self._pending is not None:
+            self._pending[pk] = values
+
+    def update(self, pk, values) -> None:
+        """Добавляет или заменяет строки сотрудника."""
+        with self._lock:
+            self._record(pk, values)
+            if self.is_built:
+                self._put(pk, values)
+
+    def remove(self, pk) -> None:
+        """Удаляет строки сотрудника."""
+        with self._lock:
+            self._record(pk, None)
+            self._remove(pk)
+
+    def remove_many(self, pks) -> None:
+        """Удаляет строки сотрудников одним проходом по индексу."""
+        pks = set(pks)
+        with self._lock:
+            for pk in pks:
+                self._record(pk, None)
+                self._by_pk.pop(pk, None)
+            self._entries = [
+                entry for entry in self._entries if entry[3] not in pks
+            ]
+
+    def _put(self, pk, values):
+        self._remove(pk)
+        row_entries = self._entries_for(pk, values)
+        for entry in row_entries:
+            bisect.insort(self._entries, entry)
+        self._by_pk[pk] = row_entries
+
+    def _remove(self, pk):
+        for entry in self._by_pk.pop(pk, ()):
+            i = bisect.bisect_left(self._entries, entry)
+            if i < len(self._entries) and self._entries[i] == entry:
+                del self._entries[i]
+
+    def search(self, prefix: str, limit: int = SUGGEST_LIMIT) -> list:
+        """
+        Возвращает уникальные значения, начинающиеся с префикса.
+
+        Args:
+            prefix (str): введённый текст.
+            limit (int): максимальное количество подсказок.
+
+        Returns:
+            list[dict]: [{'value': ..., 'field': ...}, ...] по алфавиту.
+        """
+        key = normalize(prefix).strip()
+        if not key:
+            return []
+        results = []
+        seen = set()
+        with self._lock:
+            i = bisect.bisect_left(self._entries, (key,))
+            while i < len(self._entries) and len(results) < limit:
+                entry_key, field, value, _pk = self._entries[i]
+                if not entry_key.startswith(key):
+                    break
+                if (field, value) not in seen:
+                    seen.add((field, value))
+                    results.append({'value': value, 'field': field})
+                i += 1
+        return results
+
+    def is_stale(self) -> bool:
+        return (
+            self._built_at is None
+            or time.monotonic() - self._built_at > SUGGEST_REFRESH_INTERVAL
+        )
+
+    def refresh_in_background(self, loader) -> None:
+        """Перестраивает индекс в отдельном потоке (не блокирует запрос)."""
+        with self._lock:
+            if self._refreshing:
+                return
+            self._refreshing = True
+
+        def run():
+            try:
+                self.rebuild(loader)
+            except DatabaseError:
+                logger.exception('Не удалось построить индекс подсказок')
+            finally:
+                self._refreshing = False
+                connection.close()
+
+        threading.Thread(target=run, daemon=True).start()
+
+
+index = PrefixIndex()
+
+
+def _load_rows():
+    from .models import Employee
+
+    return list(
+        Employee.objects.values('pk', *SUGGEST_FIELDS).iterator(
+            chunk_size=5000
+        )
+    )
+
+
+def warm_up() -> None:
+    """Начинает строить индекс в фоне, не дожидаясь первой подсказки."""
+    if not index.is_built:
+        index.refresh_in_background(_load_rows)
+
+
+def _search_db(prefix, limit):
+    """Подсказки запросом к БД, пока индекс ещё строится."""
+    from .models import Employee
+
+    key = prefix.strip()
+    if not key:
+        return []
+    results = []
+    for field in SUGGEST_FIELDS:
+        values = (
+            Employee.objects.filter(**{f'{field}__istartswith': key})
+            .order_by(field)
+            .values_list(field, flat=True)
+            .distinct()[:limit]
+        )
+        results.extend({'value': value, 'field': field} for value in values)
+    results.sort(key=lambda item: normalize(item['value']))
+    return results[:limit]
+
+
+def suggest(prefix: str, limit: int = SUGGEST_LIMIT) -> list:
+    """
+    Подсказки фамилий и логинов для поля поиска.
+
+    Ответы берутся из индекса без SQL-запросов. Пока индекс строится
+    (сразу после старта процесса), подсказки ищутся в БД; устаревший
+    индекс обновляется в фоне.
+
+    Args:
+        prefix (str): введённый текст.
+        limit (int): количество подсказок.
+
+    Returns:
+        list[dict]: подсказки.
+    """
+    if index.is_stale():
+        index.refresh_in_background(_load_rows)
+    if not index.is_built:
+        return _search_db(prefix, limit)
+    return index.search(prefix, limit)
+
+
+def update_employee(employee) -> None:
+    """Обновляет подсказки для сохранённого сотрудника."""
+    index.update(
+        employee.pk,
+        {field: getattr(employee, field) for field in SUGGEST_FIELDS},
+    )
+
+
+def remove_employee(pk) -> None:
+    """Удаляет подсказки удалённого сотрудника."""
+    index.remove(pk)
+
+
+def remove_employees(pks) -> None:
+    """Удаляет подсказки порции удалённых сотрудников."""
+    index.remove_many(pks)
@@ -0,0 +1,119 @@
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.test import TestCase, TransactionTestCase
+from django.urls import reverse
+
+from employees import bulk, fts, suggest
+from employees.models import Employee, Region
+
+
+class BulkDeleteTests(TestCase):
+    """Удаление порциями и ход операции по токену."""
+
+    @classmethod
+    def setUpTestData(cls):
+        region = Region.objects.create(name='Тестовый регион', code='99')
+        Employee.objects.bulk_create(
+            Employee(
+                last_name=f'Фамилия{i}',
+                first_name='Имя',
+                region=region,
+                login=f'login{i}',
+                password='x',
+            )
+            for i in range(7)
+        )
+
+    def test_progress_is_stored_by_token(self):
+        token = bulk.new_progress_token()
+        self.assertIsNone(bulk.get_progress(token))
+        bulk.set_progress(token, 0, 7)
+        self.assertEqual(
+            bulk.get_progress(token),
+            {'done': 0, 'total': 7, 'finished': False, 'error': ''},
+        )
+
+    def test_delete_reports_progress(self):
+        token = bulk.new_progress_token()
+        deleted = bulk.delete_employees(Employee.objects.all(), token=token)
+        self.assertEqual(deleted, 7)
+        self.assertFalse(Employee.objects.exists())
+        self.assertEqual(
+            bulk.get_progress(token),
+            {'done': 7, 'total': 7, 'finished': True, 'error': ''},
+        )
+
+
+    def test_indexes_are_cleaned_once_per_chunk(self):
+        fts.index_employees(Employee.objects.all())
+        ids = list(Employee.objects.values_list('pk', flat=True))
+        with mock.patch.object(
+            fts, 'unindex_employees', wraps=fts.unindex_employees
+        ) as unindex, mock.patch.object(
+            suggest, 'remove_employee'
+        ) as remove_one, mock.patch.object(
+            suggest, 'remove_employees'
+        ) as remove_many:
+            bulk.delete_employees(ids=ids)
+
+        unindex.assert_called_once_with(ids)
+        remove_many.assert_called_once_with(ids)
+        remove_one.assert_not_called()
+        with connection.cursor() as cursor:
+            cursor.execute(f'SELECT count(*) FROM {fts.FTS_TABLE}')
+            self.assertEqual(cursor.fetchone()[0], 0)
+
+
+class BackgroundDeleteTests(TransactionTestCase):
+    """Удаление из веб-интерфейса выполняется в фоновом потоке."""
+
+    def test_start_delete_runs_in_background(self):
+        region = Region.objects.create(name='Тестовый регион', code='99')
+        employees = [
+            Employee.objects.create(
+                last_name=f'Фамилия{i}',
+                first_name='Имя',
+                region=region,
+                login=f'login{i}',
+                password='x',
+            )
+            for i in range(3)
+        ]
+        token = bulk.start_delete(ids=[employees[0].pk, employees[1].pk])
+        # пул из одного потока: следующая задача выполнится после удаления
+        bulk._get_executor().submit(lambda: None).result()
+
+        self.assertEqual(
+            list(Employee.objects.values_list('pk', flat=True)),
+            [employees[2].pk],
+        )
+        self.assertEqual(
+            bulk.get_progress(token),
+            {'done': 2, 'total': 2, 'finished': True, 'error': ''},
+        )
+
+    def test_confirm_returns_progress_token(self):
+        admin = get_user_model().objects.create_user('admin', role='admin')
+        region = Region.objects.create(name='Тестовый регион', code='99')
+        employee = Employee.objects.create(
+            last_name='Фамилия',
+            first_name='Имя',
+            region=region,
+            login='login',
+            password='x',
+        )
+        self.client.force_login(admin)
+        response = self.client.post(
+            reverse('bulk_delete_employees'),
+            {'selected': [employee.pk], 'confirm': 'yes'},
+            headers={'x-requested-with': 'XMLHttpRequest'},
+        )
+        job = response.json()
+        bulk._get_executor().submit(lambda: None).result()
+
+        self.assertEqual(job['total'], 1)
+        progress = self.client.get(job['progress_url']).json()
+        self.assertTrue(progress['finished'])
+        self.assertFalse(Employee.objects.exists())
@@ -0,0 +1,49 @@
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.test import TestCase
+
+from employees import exports
+from employees.models import Employee, ExportSnapshot, Region
+
+
+class ExportSnapshotTests(TestCase):
+    """Снимок выборки хранится в БД и читается по токену."""
+
+    @classmethod
+    def setUpTestData(cls):
+        region = Region.objects.create(name='Тестовый регион', code='99')
+        Employee.objects.bulk_create(
+            Employee(
+                last_name=f'Фамилия{i}',
+                first_name='Имя',
+                region=region,
+                login=f'login{i}',
+                password='x',
+            )
+            for i in range(5)
+        )
+        users = get_user_model().objects
+        cls.user = users.create_user('owner', password='secret')
+        cls.other = users.create_user('other', password='secret')
+
+    @mock.patch.object(exports, 'EXPORT_SNAPSHOT_CHUNK', 2)
+    def test_snapshot_round_trip(self):
+        created = exports.create_snapshot(
+            Employee.objects.all(), self.user, {'status': 'active'}
+        )
+        snapshot = exports.get_snapshot(created['token'], self.user)
+        self.assertEqual(snapshot, created)
+        self.assertEqual(snapshot['chunks'], 3)
+        self.assertTrue(exports.snapshot_is_complete(snapshot))
+        self.assertEqual(
+            [pk for ids in exports.iter_snapshot_ids(snapshot) for pk in ids],
+            list(Employee.objects.order_by('pk').values_list('pk', flat=True)),
+        )
+        self.assertIsNone(exports.get_snapshot(created['token'], self.other))
+
+    def test_expired_snapshot_is_not_returned(self):
+        created = exports.create_snapshot(Employee.objects.all(), self.user)
+        ExportSnapshot.objects.update(expires_at=created['taken_at'])
+        self.assertIsNone(exports.get_snapshot(created['token'], self.user))
+        self.assertFalse(exports.snapshot_is_complete(created))
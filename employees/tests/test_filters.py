@@ -0,0 +1,145 @@
+import datetime
+
+from django.http import QueryDict
+from django.test import SimpleTestCase, TestCase
+from django.utils import timezone
+
+from employees.filters import _compile, canonicalize, compile_query
+from employees.models import Employee, Region
+
+
+class CanonicalizeTests(SimpleTestCase):
+    """Приведение параметров запроса к каноническому виду."""
+
+    def test_aliases_map_to_region_name(self):
+        self.assertEqual(canonicalize({'region': '5'}), {'region_name': '5'})
+        self.assertEqual(
+            canonicalize({'region_code': '7'}), {'region_name': '7'}
+        )
+
+    def test_invalid_values_are_dropped(self):
+        params = {
+            'region_name': 'abc',
+            'note_date': '2024-13-40',
+            'created_at': 'вчера',
+            'since': 'не дата',
+            'status': 'deleted',
+            'last_name': '   ',
+            'unknown': '1',
+        }
+        self.assertEqual(canonicalize(params), {})
+
+    def test_order_follows_filters(self):
+        query = compile_query(
+            QueryDict('status=active&last_name=+Иванов+&region=3')
+        )
+        self.assertEqual(
+            query.querystring,
+            'last_name=%D0%98%D0%B2%D0%B0%D0%BD%D0%BE%D0%B2'
+            '&region_name=3&status=active',
+        )
+
+    def test_since_date_starts_at_midnight(self):
+        canon = canonicalize({'since': '2024-03-01'})
+        moment = datetime.datetime.fromisoformat(canon['since'])
+        self.assertEqual(
+            moment,
+            timezone.make_aware(datetime.datetime(2024, 3, 1)),
+        )
+
+    def test_empty_query_is_falsy(self):
+        self.assertFalse(compile_query(QueryDict('page=2')))
+        self.assertTrue(compile_query(QueryDict('status=active')))
+
+
+class CompileCacheTests(SimpleTestCase):
+    """Кэш скомпилированных запросов."""
+
+    def setUp(self):
+        _compile.cache_clear()
+
+    def test_equal_queries_share_plan(self):
+        first = compile_query(QueryDict('status=active&region=3'))
+        second = compile_query(QueryDict('region_name=3&status=active'))
+        self.assertIs(first, second)
+
+    def test_different_queries_do_not_share_plan(self):
+        first = compile_query(QueryDict('status=active'))
+        second = compile_query(QueryDict('status=blocked'))
+        self.assertIsNot(first, second)
+        self.assertEqual(first.canon, {'status': 'active'})
+        self.assertEqual(second.canon, {'status': 'blocked'})
+        self.assertEqual(_compile.cache_info().currsize, 2)
+
+
+class CompileQueryTests(TestCase):
+    """Условия фильтра на реальных данных."""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.region = Region.objects.create(name='Тестовый регион', code='99')
+        cls.other_region = Region.objects.create(name='Другой', code='98')
+        for login, region in (
+            ('first', cls.region),
+            ('second', cls.region),
+            ('third', cls.other_region),
+        ):
+            Employee.objects.create(
+                last_name=f'Фамилия-{login}',
+                first_name='Имя',
+                region=region,
+                login=login,
+                password='x',
+            )
+        day = datetime.datetime(2024, 3, 1)
+        created = {
+            # начало суток входит в интервал
+            'first': timezone.make_aware(day),
+            'second': timezone.make_aware(day + datetime.timedelta(
+                hours=23, minutes=59, seconds=59, microseconds=999999
+            )),
+            # начало следующих суток — нет
+            'third': timezone.make_aware(day + datetime.timedelta(days=1)),
+        }
+        for login, created_at in created.items():
+            Employee.objects.filter(login=login).update(
+                created_at=created_at,
+                updated_at=created_at,
+            )
+
+    def logins(self, query_string):
+        query = compile_query(QueryDict(query_string))
+        return sorted(
+            query.apply(Employee.objects.all()).values_list(
+                'login', flat=True
+            )
+        )
+
+    def test_region_aliases(self):
+        pk = self.region.pk
+        self.assertEqual(self.logins(f'region={pk}'), ['first', 'second'])
+        self.assertEqual(
+            self.logins(f'region_code={pk}'), ['first', 'second']
+        )
+        self.assertEqual(
+            self.logins(f'region_name={self.other_region.pk}'), ['third']
+        )
+
+    def test_created_at_day_is_half_open(self):
+        self.assertEqual(
+            self.logins('created_at=2024-03-01'), ['first', 'second']
+        )
+        self.assertEqual(self.logins('created_at=2024-03-02'), ['third'])
+
+    def test_since_is_strictly_after(self):
+        # first изменён ровно в момент метки и не попадает
+        self.assertEqual(
+            self.logins('since=2024-03-01T00:00:00%2B03:00'),
+            ['second', 'third'],
+        )
+
+    def test_invalid_values_do_not_filter(self):
+        self.assertEqual(
+            self.logins('region=abc&created_at=2024-02-30'),
+            ['first', 'second', 'third'],
+        )
@@ -0,0 +1,92 @@
+from django.db import connection
+from django.test import SimpleTestCase, TestCase
+from django.test.utils import CaptureQueriesContext
+
+from employees.fts import FTS_TABLE, build_match_query
+from employees.models import Employee, Region
+
+
+class BuildMatchQueryTests(SimpleTestCase):
+    """Выражение MATCH из пользовательского ввода."""
+
+    def test_tokens_are_prefixes(self):
+        self.assertEqual(
+            build_match_query('last_name', 'Иван Пет'),
+            '{last_name} : ("иван"* AND "пет"*)',
+        )
+
+    def test_yo_is_folded(self):
+        self.assertEqual(
+            build_match_query('last_name', 'Семёнов'),
+            '{last_name} : ("семенов"*)',
+        )
+
+    def test_quotes_and_stars_are_dropped(self):
+        self.assertEqual(
+            build_match_query('login', 'a"b* OR "c'),
+            '{login} : ("a"* AND "b"* AND "or"* AND "c"*)',
+        )
+
+    def test_no_tokens(self):
+        self.assertIsNone(build_match_query('last_name', '" * -'))
+        self.assertIsNone(build_match_query('last_name', ''))
+
+
+class FullTextLookupTests(TestCase):
+    """Lookup ``fts`` по индексу и запасной icontains."""
+
+    @classmethod
+    def setUpTestData(cls):
+        region = Region.objects.create(name='Тестовый регион', code='99')
+        for last_name, login in (
+            ('Семёнов', 'semenov'),
+            ('Семенова', 'semenova'),
+            ('Иванов', 'ivanov'),
+            ('Кто*то', 'ktoto'),
+        ):
+            Employee.objects.create(
+                last_name=last_name,
+                first_name='Имя',
+                region=region,
+                login=login,
+                password='x',
+            )
+
+    def last_names(self, value):
+        return sorted(
+            Employee.objects.filter(last_name__fts=value).values_list(
+                'last_name', flat=True
+            )
+        )
+
+    def test_prefix_match(self):
+        self.assertEqual(self.last_names('сем'), ['Семенова', 'Семёнов'])
+        self.assertEqual(self.last_names('ИВА'), ['Иванов'])
+
+    def test_yo_folding(self):
+        self.assertEqual(self.last_names('Семён'), ['Семенова', 'Семёнов'])
+        self.assertEqual(self.last_names('семенов'), ['Семенова', 'Семёнов'])
+
+    def test_user_quotes_do_not_break_query(self):
+        self.assertEqual(self.last_names('"сем'), ['Семенова', 'Семёнов'])
+        self.assertEqual(self.last_names('иван"*'), ['Иванов'])
+
+    def test_uses_index(self):
+        with CaptureQueriesContext(connection) as queries:
+            self.last_names('иван')
+        self.assertIn(f'{FTS_TABLE} MATCH', queries[0]['sql'])
+
+    def test_icontains_fallback_without_tokens(self):
+        with CaptureQueriesContext(connection) as queries:
+            self.assertEqual(self.last_names('*'), ['Кто*то'])
+        self.assertNotIn(FTS_TABLE, queries[0]['sql'])
+        self.assertIn('LIKE', queries[0]['sql'])
+
+    def test_index_follows_updates(self):
+        employee = Employee.objects.get(login='ivanov')
+        employee.last_name = 'Петров'
+        employee.save()
+        self.assertEqual(self.last_names('иван'), [])
+        self.assertEqual(self.last_names('петр'), ['Петров'])
+        employee.delete()
+        self.assertEqual(self.last_names('петр'), [])
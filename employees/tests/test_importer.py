@@ -0,0 +1,92 @@
+import io
+from unittest import mock
+
+from django.core.cache import cache
+from django.db import OperationalError, connection
+from django.test import TransactionTestCase
+from django.test.utils import CaptureQueriesContext
+
+from employees import importer, writes
+from employees.importer import import_employees
+from employees.models import Employee, Region
+
+CSV = (
+    'Фамилия;Имя;Отчество;Код региона;Номер записки\n'
+    'Иванов;Иван;Иванович;99;1\n'
+    'Петров;Пётр;;99;2\n'
+    'Сидоров;Сидор;Сидорович;99;3\n'
+)
+
+
+class ImportTransactionTests(TransactionTestCase):
+    """Каждая порция импорта — отдельная транзакция BEGIN IMMEDIATE."""
+
+    def setUp(self):
+        # словарь регионов кэшируется по версии данных, а она после
+        # очистки базы между тестами снова 0
+        cache.clear()
+        self.region = Region.objects.create(name='Тестовый регион', code='99')
+
+    def run_import(self, dry_run):
+        with CaptureQueriesContext(connection) as queries:
+            report = import_employees(
+                io.BytesIO(CSV.encode()),
+                'employees.csv',
+                dry_run=dry_run,
+                batch_size=2,
+            )
+        begins = [q['sql'] for q in queries if q['sql'].startswith('BEGIN')]
+        return report, begins
+
+    def test_dry_run_rolls_back_each_batch(self):
+        Employee.objects.create(
+            last_name='Петров',
+            first_name='Пётр',
+            region=self.region,
+            login='99_Петров_П',
+            password='x',
+        )
+        report, begins = self.run_import(dry_run=True)
+
+        self.assertEqual(begins, ['BEGIN IMMEDIATE'] * 2)
+        self.assertEqual(report.created, 2)
+        self.assertEqual(
+            report.error_rows, [(3, ['Сотрудник уже существует.'])]
+        )
+        self.assertEqual(Employee.objects.count(), 1)
+
+    def test_import_creates_employees(self):
+        report, begins = self.run_import(dry_run=False)
+
+        self.assertEqual(begins, ['BEGIN IMMEDIATE'] * 2)
+        self.assertEqual(report.created, 3)
+        self.assertEqual(Employee.objects.count(), 3)
+
+    def test_locked_batch_is_retried(self):
+        Employee.objects.create(
+            last_name='Петров',
+            first_name='Пётр',
+            region=self.region,
+            login='99_Петров_П',
+            password='x',
+        )
+        insert = importer._insert
+        calls = []
+
+        def locked_once(employees):
+            calls.append(1)
+            if len(calls) == 1:
+                raise OperationalError('database is locked')
+            return insert(employees)
+
+        with mock.patch.object(
+            importer, '_insert', side_effect=locked_once
+        ), mock.patch.object(writes.time, 'sleep'):
+            report, _begins = self.run_import(dry_run=False)
+
+        self.assertEqual(len(calls), 3)
+        self.assertEqual(report.created, 2)
+        self.assertEqual(
+            report.error_rows, [(3, ['Сотрудник уже существует.'])]
+        )
+        self.assertEqual(Employee.objects.count(), 3)
@@ -0,0 +1,34 @@
+from django.contrib.auth import get_user_model
+from django.test import TestCase
+from django.utils import timezone
+
+from employees import jobs
+from employees.models import ExportJob
+
+
+class StaleJobTests(TestCase):
+    """Задачи, потерянные при перезапуске, не остаются «в работе»."""
+
+    def test_stale_jobs_are_failed_and_cleaned_up(self):
+        user = get_user_model().objects.create_user('owner')
+        stale = ExportJob.objects.create(user=user, status=ExportJob.RUNNING)
+        fresh = ExportJob.objects.create(user=user, status=ExportJob.RUNNING)
+        ExportJob.objects.filter(pk=stale.pk).update(
+            created_at=timezone.now() - jobs.EXPORT_JOB_TIMEOUT * 2
+        )
+
+        stale.refresh_from_db()
+        self.assertTrue(jobs.is_stale(stale))
+        self.assertEqual(jobs.fail_stale_jobs(), 1)
+
+        stale.refresh_from_db()
+        fresh.refresh_from_db()
+        self.assertEqual(stale.status, ExportJob.FAILED)
+        self.assertEqual(stale.error, jobs.STALE_JOB_ERROR)
+        self.assertEqual(fresh.status, ExportJob.RUNNING)
+
+        ExportJob.objects.filter(pk=stale.pk).update(
+            created_at=timezone.now() - jobs.EXPORT_FILE_TTL * 2
+        )
+        self.assertEqual(jobs.cleanup_expired(), 1)
+        self.assertFalse(ExportJob.objects.filter(pk=stale.pk).exists())
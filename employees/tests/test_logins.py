@@ -0,0 +1,136 @@
+from unittest import mock
+
+from django.db import IntegrityError
+from django.test import TestCase
+
+from employees import logins
+from employees.models import Employee, Region
+
+
+class LoginAllocationTests(TestCase):
+    """Свободные логины и повтор при гонке."""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.region = Region.objects.create(name='Тестовый регион', code='99')
+        for last_name, first_name, login in (
+            ('Иванов', 'Иван', '99_Иванов_ИИ'),
+            ('Иванов', 'Илья', '99_Иванов_ИИ3'),
+            # другой префикс и номер с ведущим нулём не считаются
+            ('Иванов', 'Игорь', '99_Иванов_И'),
+            ('Иванов', 'Инна', '99_Иванов_ИИ05'),
+        ):
+            Employee.objects.create(
+                last_name=last_name,
+                first_name=first_name,
+                patronymic='Иванович',
+                region=cls.region,
+                login=login,
+                password='x',
+            )
+
+    def person(self, last_name='Иванов', first_name='Иван'):
+        return ('99', last_name, first_name, 'Ильич')
+
+    def test_taken_numbers(self):
+        taken = logins.taken_numbers(
+            ['99_Иванов_ИИ', '99_Иванов_И', '99_Петров_ПП']
+        )
+        self.assertEqual(
+            taken,
+            {
+                '99_Иванов_ИИ': {1, 3},
+                '99_Иванов_И': {1},
+                '99_Петров_ПП': set(),
+            },
+        )
+
+    def test_taken_numbers_in_batches(self):
+        bases = [f'99_Фамилия{i}_ИИ' for i in range(5)] + ['99_Иванов_ИИ']
+        with mock.patch.object(logins, 'LOGIN_PREFIX_BATCH', 2):
+            with self.assertNumQueries(3):
+                taken = logins.taken_numbers(bases)
+        self.assertEqual(taken['99_Иванов_ИИ'], {1, 3})
+
+    def test_propose_logins(self):
+        proposed = logins.propose_logins([
+            self.person(),
+            self.person(first_name='Игнат'),
+            self.person(last_name='Петров', first_name='Пётр'),
+        ])
+        self.assertEqual(
+            proposed,
+            [
+                {
+                    'login': '99_Иванов_ИИ2',
+                    'base': '99_Иванов_ИИ',
+                    'conflict': True,
+                },
+                {
+                    'login': '99_Иванов_ИИ4',
+                    'base': '99_Иванов_ИИ',
+                    'conflict': True,
+                },
+                {
+                    'login': '99_Петров_ПИ',
+                    'base': '99_Петров_ПИ',
+                    'conflict': False,
+                },
+            ],
+        )
+
+    def test_propose_logins_respects_taken(self):
+        taken = {'99_Петров_ПИ'}
+        proposed = logins.propose_logins(
+            [self.person(last_name='Петров', first_name='Пётр')], taken
+        )
+        self.assertEqual(proposed[0]['login'], '99_Петров_ПИ2')
+        self.assertIn('99_Петров_ПИ2', taken)
+
+    def test_create_employee(self):
+        employee = logins.create_employee(
+            last_name='Иванов',
+            first_name='Иван',
+            patronymic='Ильич',
+            region=self.region,
+            password='x',
+        )
+        self.assertEqual(employee.login, '99_Иванов_ИИ2')
+
+    def test_create_employee_retries_on_login_race(self):
+        # номера прочитаны до того, как логины заняли параллельно
+        with mock.patch.object(
+            logins, 'taken_numbers', return_value={'99_Иванов_ИИ': set()}
+        ):
+            employee = logins.create_employee(
+                last_name='Иванов',
+                first_name='Иван',
+                patronymic='Ильич',
+                region=self.region,
+                password='x',
+            )
+        self.assertEqual(employee.login, '99_Иванов_ИИ2')
+
+    def test_create_employee_gives_up_after_attempts(self):
+        with mock.patch.object(
+            logins, 'taken_numbers', return_value={'99_Иванов_ИИ': set()}
+        ), mock.patch.object(logins, 'LOGIN_ATTEMPTS', 1):
+            with self.assertRaises(IntegrityError):
+                logins.create_employee(
+                    last_name='Иванов',
+                    first_name='Иван',
+                    patronymic='Ильич',
+                    region=self.region,
+                    password='x',
+                )
+
+    def test_other_integrity_errors_are_not_retried(self):
+        with self.assertRaises(IntegrityError):
+            logins.create_employee(
+                last_name='Иванов',
+                first_name='Иван',
+                patronymic='Иванович',
+                region=self.region,
+                password='x',
+            )
+        self.assertEqual(Employee.objects.count(), 4)
@@ -0,0 +1,45 @@
+from django.db import IntegrityError, transaction
+from django.test import TestCase
+
+from employees.models import Employee, Region
+
+
+class UniquePersonConstraintTests(TestCase):
+    """Ограничение employee_unique_person: NULL и '' — одно отчество."""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.region = Region.objects.create(name='Тестовый регион', code='99')
+
+    def create(self, login, patronymic, region=None):
+        return Employee.objects.create(
+            last_name='Петров',
+            first_name='Пётр',
+            patronymic=patronymic,
+            region=region or self.region,
+            login=login,
+            password='x',
+        )
+
+    def assertDuplicate(self, login, patronymic):
+        with self.assertRaises(IntegrityError), transaction.atomic():
+            self.create(login, patronymic)
+
+    def test_null_and_empty_patronymic_collide(self):
+        self.create('first', None)
+        self.assertDuplicate('second', '')
+
+    def test_empty_and_null_patronymic_collide(self):
+        self.create('first', '')
+        self.assertDuplicate('second', None)
+
+    def test_two_null_patronymics_collide(self):
+        self.create('first', None)
+        self.assertDuplicate('second', None)
+
+    def test_different_patronymic_or_region_is_allowed(self):
+        self.create('first', None)
+        self.create('second', 'Петрович')
+        other = Region.objects.create(name='Другой', code='98')
+        self.create('third', None, region=other)
+        self.assertEqual(Employee.objects.count(), 3)
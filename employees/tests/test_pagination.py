@@ -0,0 +1,64 @@
+import datetime
+
+from django.test import TestCase
+from django.utils import timezone
+
+from employees.models import Employee, Region
+from employees.pagination import decode_cursor, encode_cursor, paginate
+
+ORDERING = ('created_at', 'id')
+
+
+class KeysetPaginationTests(TestCase):
+    """Курсоры по created_at со временем точнее миллисекунды."""
+
+    @classmethod
+    def setUpTestData(cls):
+        region = Region.objects.create(name='Тестовый регион', code='99')
+        Employee.objects.bulk_create(
+            Employee(
+                last_name=f'Фамилия{i}',
+                first_name='Имя',
+                region=region,
+                login=f'login{i}',
+                password='x',
+            )
+            for i in range(120)
+        )
+        # у всех строк одна миллисекунда, различаются микросекунды
+        base = timezone.now().replace(microsecond=123000)
+        for i, pk in enumerate(
+            Employee.objects.order_by('id').values_list('pk', flat=True)
+        ):
+            Employee.objects.filter(pk=pk).update(
+                created_at=base + datetime.timedelta(microseconds=119 - i)
+            )
+
+    def test_cursor_keeps_microseconds(self):
+        value = timezone.now().replace(microsecond=123456)
+        token = encode_cursor([value, 1])
+        self.assertEqual(decode_cursor(token, Employee, ORDERING)[0], value)
+
+    def test_pages_have_no_repeated_or_missing_rows(self):
+        queryset = Employee.objects.all()
+        seen = []
+        pages = []
+        page = paginate(queryset, ORDERING)
+        # ограничение на случай зацикливания на граничной строке
+        for _ in range(10):
+            pages.append(page)
+            seen += [employee.pk for employee in page]
+            if not page.next_cursor:
+                break
+            page = paginate(queryset, ORDERING, after=page.next_cursor)
+
+        expected = list(
+            queryset.order_by(*ORDERING).values_list('pk', flat=True)
+        )
+        self.assertEqual(seen, expected)
+
+        previous = paginate(queryset, ORDERING, before=pages[1].prev_cursor)
+        self.assertEqual(
+            [employee.pk for employee in previous],
+            [employee.pk for employee in pages[0]],
+        )
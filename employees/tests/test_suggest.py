@@ -0,0 +1,65 @@
+from django.test import SimpleTestCase
+
+from employees.suggest import PrefixIndex
+
+
+def row(pk, last_name, login):
+    return {'pk': pk, 'last_name': last_name, 'login': login}
+
+
+class PrefixIndexRebuildTests(SimpleTestCase):
+    """Изменения во время перестроения индекса не теряются."""
+
+    def setUp(self):
+        self.index = PrefixIndex()
+        self.index.build(
+            [row(1, 'Иванов', 'ivanov'), row(2, 'Петров', 'petrov')]
+        )
+
+    def values(self, prefix):
+        return [item['value'] for item in self.index.search(prefix)]
+
+    def test_changes_during_rebuild_are_replayed(self):
+        def loader():
+            # строки прочитаны до изменений, сделанных ниже
+            rows = [row(1, 'Иванов', 'ivanov'), row(2, 'Петров', 'petrov')]
+            self.index.update(1, row(1, 'Сидоров', 'sidorov'))
+            self.index.remove(2)
+            self.index.update(3, row(3, 'Орлов', 'orlov'))
+            return rows
+
+        self.index.rebuild(loader)
+
+        self.assertEqual(self.values('иван'), [])
+        self.assertEqual(self.values('сидор'), ['Сидоров'])
+        self.assertEqual(self.values('петр'), [])
+        self.assertEqual(self.values('орл'), ['Орлов'])
+
+    def test_changes_after_rebuild_are_not_replayed_again(self):
+        self.index.rebuild(lambda: [row(1, 'Иванов', 'ivanov')])
+        self.index.rebuild(
+            lambda: [row(1, 'Иванов', 'ivanov'), row(4, 'Козлов', 'kozlov')]
+        )
+        self.assertEqual(self.values('козл'), ['Козлов'])
+
+    def test_failed_rebuild_stops_recording(self):
+        def loader():
+            raise RuntimeError
+
+        with self.assertRaises(RuntimeError):
+            self.index.rebuild(loader)
+        self.index.update(5, row(5, 'Зайцев', 'zaitsev'))
+        self.index.rebuild(lambda: [])
+        self.assertEqual(self.values('зайц'), [])
+
+    def test_updates_before_first_build_are_kept(self):
+        index = PrefixIndex()
+
+        def loader():
+            index.update(7, row(7, 'Ёлкин', 'elkin'))
+            return []
+
+        index.rebuild(loader)
+        self.assertEqual(
+            [item['value'] for item in index.search('елк')], ['Ёлкин']
+        )
@@ -0,0 +1,21 @@
+from django.test import TestCase
+
+from employees import utils
+from employees.models import PasswordPolicy
+
+
+class PasswordPolicyTests(TestCase):
+    """Политика паролей из кэша процесса."""
+
+    def setUp(self):
+        utils.invalidate_password_policy()
+
+    def test_default_policy_is_created_without_deadlock(self):
+        self.assertFalse(PasswordPolicy.objects.exists())
+        password = utils.generate_password()
+        policy = PasswordPolicy.objects.get()
+        self.assertEqual(
+            len(password),
+            policy.uppercase + policy.lowercase + policy.digits
+            + policy.symbols,
+        )
@@ -0,0 +1,52 @@
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.db import OperationalError, connection
+from django.test import TransactionTestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from employees import writes
+from employees.models import LoginHistory, Region
+
+
+class RunWriteTests(TransactionTestCase):
+    """Запись через run_write() в настоящей (не вложенной) транзакции."""
+
+    def test_write_commits_with_begin_immediate(self):
+        before = writes.write_stats()['transactions']
+        with CaptureQueriesContext(connection) as queries:
+            region = writes.run_write(
+                Region.objects.create, name='Тестовый регион', code='99'
+            )
+        self.assertTrue(Region.objects.filter(pk=region.pk).exists())
+        self.assertIn('BEGIN IMMEDIATE', [q['sql'] for q in queries])
+        self.assertEqual(writes.write_stats()['transactions'], before + 1)
+
+    def test_locked_transaction_is_retried(self):
+        calls = []
+
+        def create():
+            calls.append(1)
+            if len(calls) == 1:
+                raise OperationalError('database is locked')
+            return Region.objects.create(name='Повтор', code='98')
+
+        retries = writes.write_stats()['retries']
+        with mock.patch.object(writes.time, 'sleep'):
+            region = writes.run_write(create)
+        self.assertEqual(len(calls), 2)
+        self.assertTrue(Region.objects.filter(pk=region.pk).exists())
+        self.assertEqual(writes.write_stats()['retries'], retries + 1)
+
+    def test_login_records_history(self):
+        get_user_model().objects.create_user('operator', password='secret')
+        response = self.client.post(
+            reverse('login'), {'username': 'operator', 'password': 'secret'}
+        )
+        self.assertEqual(response.status_code, 302)
+        self.assertTrue(
+            LoginHistory.objects.filter(
+                username='operator', success=True
+            ).exists()
+        )
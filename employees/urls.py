@@ -15,13 +15,30 @@ urlpatterns = [
 
     # 🔹 CRUD сотрудников
     path('create/', views.create_employee, name='create_employee'),
+    path('import/', views.import_employees, name='import_employees'),
     path('search/', views.search_employee, name='search_employee'),
+    path(
+        'search/suggest/',
+        views.suggest_employee,
+        name='suggest_employee',
+    ),
     path('edit/<int:pk>/', views.edit_employee, name='edit_employee'),
     path('delete/<int:pk>/', views.delete_employee, name='delete_employee'),
 
     # 🔹 Вспомогательные функции
     path('export_confirm/', views.confirm_export, name='confirm_export'),
     path('export_excel/', views.export_excel, name='export_excel'),
+    path('export_jobs/', views.export_job_start, name='export_job_start'),
+    path(
+        'export_jobs/<int:pk>/',
+        views.export_job_status,
+        name='export_job_status',
+    ),
+    path(
+        'export_jobs/<int:pk>/download/',
+        views.export_job_download,
+        name='export_job_download',
+    ),
     path(
         'generate_password/',
         views.generate_password_view,
@@ -33,6 +50,12 @@ urlpatterns = [
         name='employees_by_region',
     ),
     path("bulk_delete/", views.bulk_delete_employees, name="bulk_delete_employees"),
+    path(
+        'bulk_delete/progress/<str:token>/',
+        views.bulk_progress,
+        name='bulk_progress',
+    ),
+    path('write-stats/', views.write_stats_view, name='write_stats'),
 ]
 
 # Кастомные обработчики ошибок
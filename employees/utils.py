@@ -1,37 +1,119 @@
-import random
+import secrets
 import string
+import threading
+import time
 from typing import Optional
 
+from django.conf import settings
+
 from .models import ActionLog, PasswordPolicy
+from .writes import defer_write
 
+# Сколько секунд политика паролей живёт в кэше процесса
+# (изменения из других процессов подхватываются не позже этого срока)
+PASSWORD_POLICY_TTL = getattr(settings, 'PASSWORD_POLICY_TTL', 300)
 
-import random
-import string
+# Максимум паролей за один вызов generate_password_view
+PASSWORD_BATCH_MAX = getattr(settings, 'PASSWORD_BATCH_MAX', 10000)
 
-from .models import PasswordPolicy
+# RLock: создание политики по умолчанию вызывает сигнал post_save,
+# который сбрасывает кэш под этой же блокировкой
+_policy_lock = threading.RLock()
+_policy = None
+_policy_loaded_at = 0.0
 
 
-def generate_password() -> str:
+def get_password_policy() -> tuple:
     """
-    Генерирует пароль на основе политики PasswordPolicy.
+    Возвращает правила пароля из кэша процесса.
 
+    Кэш сбрасывается сигналом при сохранении PasswordPolicy и
+    перечитывается не реже раза в PASSWORD_POLICY_TTL секунд.
     Если политика отсутствует — создаётся со значениями по умолчанию.
+
+    Returns:
+        tuple: ((алфавит, количество символов), ...) по классам.
+    """
+    global _policy, _policy_loaded_at
+    with _policy_lock:
+        if (
+            _policy is None
+            or time.monotonic() - _policy_loaded_at > PASSWORD_POLICY_TTL
+        ):
+            policy = PasswordPolicy.objects.first()
+            if not policy:
+                policy = PasswordPolicy.objects.create()
+            _policy = (
+                (string.ascii_uppercase, policy.uppercase),
+                (string.ascii_lowercase, policy.lowercase),
+                (string.digits, policy.digits),
+                # ✅ используем символы, которые задал админ
+                (policy.allowed_symbols, policy.symbols),
+            )
+            _policy_loaded_at = time.monotonic()
+        return _policy
+
+
+def invalidate_password_policy() -> None:
+    """Сбрасывает кэш политики паролей (вызывается сигналом)."""
+    global _policy
+    with _policy_lock:
+        _policy = None
+
+
+def _sample(alphabet: str, count: int) -> bytes:
     """
-    policy = PasswordPolicy.objects.first()
-    if not policy:
-        policy = PasswordPolicy.objects.create()
+    Выбирает count случайных символов алфавита из байтов secrets.
 
-    chars = []
-    chars.extend(random.choices(string.ascii_uppercase, k=policy.uppercase))
-    chars.extend(random.choices(string.ascii_lowercase, k=policy.lowercase))
-    chars.extend(random.choices(string.digits, k=policy.digits))
+    Байты переводятся в символы одним bytes.translate; байты выше
+    наибольшего кратного длины алфавита отбрасываются, чтобы не было
+    смещения распределения.
+    """
+    size = len(alphabet)
+    limit = 256 - 256 % size
+    table = bytes(ord(alphabet[i % size]) for i in range(256))
+    rejected = bytes(range(limit, 256))
+    result = b''
+    while len(result) < count:
+        need = count - len(result)
+        chunk = secrets.token_bytes(need + need // 4 + 16)
+        result += chunk.translate(table, rejected)
+    return result[:count]
+
+
+def generate_passwords(count: int) -> list:
+    """
+    Генерирует пачку паролей по политике PasswordPolicy.
 
-    # ✅ используем символы, которые задал админ
-    if policy.allowed_symbols:
-        chars.extend(random.choices(policy.allowed_symbols, k=policy.symbols))
+    Символы каждого класса для всех паролей выбираются одним вызовом,
+    затем каждый пароль перемешивается. Источник случайности — secrets.
 
-    random.shuffle(chars)
-    return ''.join(chars)
+    Args:
+        count (int): количество паролей.
+
+    Returns:
+        list[str]: пароли.
+    """
+    columns = []
+    for alphabet, per_password in get_password_policy():
+        if alphabet and per_password:
+            sample = _sample(alphabet, count * per_password).decode('ascii')
+            columns.append((sample, per_password))
+
+    rng = secrets.SystemRandom()
+    passwords = []
+    for i in range(count):
+        chars = []
+        for sample, per_password in columns:
+            chars.extend(sample[i * per_password:(i + 1) * per_password])
+        rng.shuffle(chars)
+        passwords.append(''.join(chars))
+    return passwords
+
+
+def generate_password() -> str:
+    """Генерирует один пароль на основе политики PasswordPolicy."""
+    return generate_passwords(1)[0]
 
 
 def get_client_ip(request) -> Optional[str]:
@@ -101,7 +183,8 @@ def log_action(
     Returns:
         None
     """
-    ActionLog.objects.create(
+    defer_write(
+        ActionLog.objects.create,
         user=(
             request.user
             if getattr(request, 'user', None)
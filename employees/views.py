@@ -5,20 +5,90 @@ from django import forms
 from django.contrib import messages
 from django.contrib.auth import authenticate, login, logout
 from django.contrib.auth.decorators import login_required
-from django.http import HttpResponse, JsonResponse
+from django.db import IntegrityError
+from django.http import (
+    FileResponse,
+    HttpResponse,
+    JsonResponse,
+    QueryDict,
+    StreamingHttpResponse,
+)
 from django.shortcuts import get_object_or_404, redirect, render
 from django.urls import reverse
-from openpyxl import Workbook
+from django.utils import timezone
+from django.utils.cache import get_conditional_response
+from django.utils.dateparse import parse_datetime
+from django.utils.http import http_date
 
 from .forms import EmployeeForm, SearchForm
-from .models import ActionLog, Employee, Region
-from .utils import generate_password
+from .bulk import (
+    chunked,
+    get_progress,
+    new_progress_token,
+    start_delete,
+)
+from .bundle import (
+    group_by_region,
+    group_snapshot_by_region,
+    iter_region_bundle,
+)
+from .caching import (
+    facet_counts,
+    get_data_version,
+    search_results,
+)
+from .exports import (
+    EXPORT_FORMATS,
+    XLSX_CONTENT_TYPE,
+    build_xlsx,
+    create_snapshot,
+    get_snapshot,
+    iter_csv,
+    iter_ndjson,
+    iter_rows,
+    iter_snapshot_rows,
+    snapshot_is_complete,
+)
+from .filters import compile_query
+from .fragments import render_rows
+from .importer import import_employees as import_from_file
+from .jobs import (
+    fail_stale_jobs,
+    is_stale,
+    job_path,
+    job_status,
+    start_export,
+)
+from .logins import create_employee as create_with_login
+from .prebuilt import find_snapshot
+from .writes import defer_write, run_write, write_stats
+from .watermarks import get_watermark, record_export, resolve_since
+from .models import ActionLog, Employee, ExportJob, Region
+from .pagination import (
+    paginate,
+    paginate_ids,
+    pagination_context,
+    parse_cursor,
+)
+from .suggest import SUGGEST_LIMIT, SUGGEST_MAX_LIMIT, suggest
+from .utils import PASSWORD_BATCH_MAX, generate_password, generate_passwords
 
 # Логгеры
 app_logger = logging.getLogger('app')
 actions_logger = logging.getLogger('actions')
 employees_logger = logging.getLogger('employees')
 
+# Ключи keyset-пагинации списков сотрудников
+SEARCH_ORDERING = ('last_name', 'id')
+REGION_ORDERING = ('created_at', 'id')
+
+# Сколько сотрудников показывать на странице подтверждения удаления
+BULK_PREVIEW = 20
+
+EXPORT_EXPIRED_MESSAGE = (
+    'Выборка для экспорта устарела. Подтвердите экспорт заново.'
+)
+
 
 # =====================
 # 🔹 Авторизация
@@ -98,43 +168,35 @@ def create_employee(request):
             note_date = form.cleaned_data['note_date']
             note_number = form.cleaned_data['note_number']
 
-            login_value = (
-                f"{region_name.code}_{last_name}_"
-                f"{first_name[0].upper()}"
-                f"{patronymic[0].upper() if patronymic else ''}"
-            )
             password_value = generate_password()
 
-            existing = Employee.objects.filter(
-                last_name=last_name,
-                first_name=first_name,
-                patronymic=patronymic,
-                region_name=region_name,
-            ).first()
-
-            if existing:
-                messages.warning(
-                    request,
-                    f'Сотрудник {last_name} {first_name} {patronymic} '
-                    f'в регионе {region_name} уже существует.',
-                )
-            else:
-                emp = Employee.objects.create(
+            try:
+                # логин с номером, если такой уже занят (однофамильцы);
+                # дубликат ФИО в регионе отклоняет ограничение БД
+                emp = create_with_login(
                     last_name=last_name,
                     first_name=first_name,
                     patronymic=patronymic,
-                    region_name=region_name,
-                    region_code=region_name,
+                    region=region_name,
                     note_date=note_date,
                     note_number=note_number,
-                    login=login_value,
                     password=password_value,
                     action='create',
                 )
+            except IntegrityError:
+                messages.warning(
+                    request,
+                    f'Сотрудник {last_name} {first_name} {patronymic} '
+                    f'в регионе {region_name} уже существует.',
+                )
+            else:
                 messages.success(request, f'Сотрудник {emp} успешно создан!')
                 actions_logger.info("%s создал сотрудника %s", request.user, emp)
-                ActionLog.objects.create(
-                    user=request.user, action='Создание', employee=str(emp)
+                defer_write(
+                    ActionLog.objects.create,
+                    user=request.user,
+                    action='Создание',
+                    employee=str(emp),
                 )
                 return redirect('create_employee')
     else:
@@ -168,7 +230,16 @@ def edit_employee(request, pk):
                 emp = form.save(commit=False)
                 emp.login = request.session.get("edit_login", emp.login)
                 emp.password = request.session.get("edit_password", emp.password)
-                emp.save()
+                try:
+                    run_write(emp.save)
+                except IntegrityError:
+                    messages.warning(
+                        request,
+                        f"Сотрудник {emp.last_name} {emp.first_name} "
+                        f"{emp.patronymic or ''} в регионе {emp.region} "
+                        "уже существует.",
+                    )
+                    return redirect("edit_employee", pk=pk)
 
                 messages.success(request, f"Сотрудник {emp} успешно изменён!")
 
@@ -217,7 +288,7 @@ def delete_employee(request, pk):
     if request.method == 'POST':
         if request.POST.get('confirm') == 'yes':
             employee_str = str(employee)
-            employee.delete()
+            run_write(employee.delete)
             messages.info(request, f'Сотрудник {employee_str} удалён.')
             prev_url = request.POST.get('prev_url') or reverse(
                 'search_employee'
@@ -240,6 +311,46 @@ def delete_employee(request, pk):
     return render(request, 'delete_employee.html', {'employee': employee})
 
 
+# =====================
+# 🔹 Импорт сотрудников
+# =====================
+@login_required
+def import_employees(request):
+    """Массовое создание сотрудников из файла XLSX/CSV (admin и manager)."""
+    if not (request.user.is_admin() or request.user.is_manager()):
+        messages.error(request, 'У вас нет прав для создания сотрудников.')
+        return redirect('search_employee')
+
+    report = None
+    dry_run = False
+    if request.method == 'POST':
+        upload = request.FILES.get('file')
+        dry_run = bool(request.POST.get('dry_run'))
+        if not upload:
+            messages.error(request, 'Выберите файл для импорта.')
+        else:
+            try:
+                report = import_from_file(
+                    upload, upload.name, user=request.user, dry_run=dry_run
+                )
+            except ValueError as exc:
+                messages.error(request, f'Не удалось прочитать файл: {exc}')
+            else:
+                actions_logger.info(
+                    "%s импортировал %s сотрудников из %s (ошибок: %s)",
+                    request.user,
+                    0 if dry_run else report.created,
+                    upload.name,
+                    report.skipped,
+                )
+
+    return render(
+        request,
+        'import_employees.html',
+        {'report': report, 'dry_run': dry_run},
+    )
+
+
 # =====================
 # 🔹 Поиск сотрудников
 # =====================
@@ -247,58 +358,112 @@ def delete_employee(request, pk):
 def search_employee(request):
     """Поиск сотрудников по заданным фильтрам."""
     form = SearchForm(request.GET or None)
-    employees = Employee.objects.none()
+    employees = []
+    context = {}
+    canonical_url = reverse('search_employee')
 
     if form.is_valid():
-        qs = Employee.objects.all()
-        canon = {}
-
-        last_name = form.cleaned_data.get('last_name')
-        first_name = form.cleaned_data.get('first_name')
-        patronymic = form.cleaned_data.get('patronymic')
-        region_obj = form.cleaned_data.get('region_name')
-        note_date = form.cleaned_data.get('note_date')
-        note_number = form.cleaned_data.get('note_number')
-        status = form.cleaned_data.get('status')
-        created_at = form.cleaned_data.get('created_at')
-
-        if last_name:
-            qs = qs.filter(last_name__icontains=last_name)
-            canon['last_name'] = last_name
-        if first_name:
-            qs = qs.filter(first_name__icontains=first_name)
-            canon['first_name'] = first_name
-        if patronymic:
-            qs = qs.filter(patronymic__icontains=patronymic)
-            canon['patronymic'] = patronymic
-        if region_obj:
-            qs = qs.filter(region_name=region_obj)
-            canon['region_name'] = str(region_obj.id)
-        if note_date:
-            qs = qs.filter(note_date=note_date)
-            canon['note_date'] = note_date.isoformat()
-        if note_number:
-            qs = qs.filter(note_number__icontains=note_number)
-            canon['note_number'] = note_number
-        if status:
-            qs = qs.filter(status=status)
-            canon['status'] = status
-        if created_at:
-            qs = qs.filter(created_at__date=created_at)
-            canon['created_at'] = created_at.isoformat()
-
-        # Канонизация URL
-        current = {k: v for k, v in request.GET.items() if v}
-        if current != canon:
-            return redirect(f"{reverse('search_employee')}?{urlencode(canon)}")
-
-        employees = qs
-        if not employees.exists():
-            messages.warning(request, 'По вашему запросу ничего не найдено.')
+        base_qs = Employee.objects.select_related('region')
+        compiled = compile_query(request.GET)
+        qs = compiled.apply(base_qs)
+
+        cursor = parse_cursor(request.GET, Employee, SEARCH_ORDERING)
+        canon = {**compiled.canon, **cursor}
+
+        # Пустой запрос — как и раньше, без результатов
+        if canon:
+            # Канонический URL отдаётся заголовком и history.replaceState,
+            # без дополнительного редиректа
+            canonical_url = f'{canonical_url}?{urlencode(canon)}'
+            partial = request.GET.get('partial') == 'rows'
+            context = _search_page(
+                qs, base_qs, compiled.canon, cursor, with_facets=not partial
+            )
+            employees = context['page'].object_list
+            context['rows_html'] = render_rows(
+                employees, request.user, canonical_url, context['version']
+            )
+            if partial:
+                return _rows_response(context)
+            if not employees:
+                messages.warning(
+                    request, 'По вашему запросу ничего не найдено.'
+                )
 
-    return render(
-        request, 'search_employee.html', {'employees': employees, 'form': form}
+    return _render_canonical(
+        request,
+        'search_employee.html',
+        {'employees': employees, 'form': form, **context},
+        canonical_url,
+    )
+
+
+def _search_page(qs, base_qs, filters, cursor, with_facets=True):
+    """Страница результатов поиска, общее число и фасеты."""
+    # id результата кэшируются по каноническому запросу и версии
+    # данных; при попадании читается только одна страница строк
+    result = search_results(filters, qs, SEARCH_ORDERING)
+    page = None
+    if result['ids'] is not None:
+        page = paginate_ids(
+            base_qs, result['ids'], SEARCH_ORDERING, **cursor
+        )
+    if page is None:
+        page = paginate(qs, SEARCH_ORDERING, **cursor)
+    context = pagination_context(page, reverse('search_employee'), filters)
+    context['total'] = result['total']
+    context['version'] = result['version']
+    context['filters_query'] = urlencode(filters)
+    if with_facets:
+        context['facets'] = _facet_links(
+            facet_counts(filters, qs, result['version']), filters
+        )
+    return context
+
+
+def _rows_response(context):
+    """
+    Ответ для ?partial=rows: только строки таблицы.
+
+    Ссылки на соседние страницы передаются заголовками, чтобы скрипт
+    навигации мог обновить кнопки без перерисовки всей страницы.
+    """
+    response = HttpResponse(context['rows_html'])
+    response['X-Next-Page'] = context['next_page_url']
+    response['X-Prev-Page'] = context['prev_page_url']
+    return response
+
+
+def _render_canonical(request, template, context, canonical_url):
+    """
+    Рендерит страницу списка с каноническим URL.
+
+    Канонический URL передаётся заголовком ``Link: rel=canonical``,
+    а шаблон заменяет им адрес в браузере через history.replaceState,
+    поэтому повторный запрос (редирект) не нужен.
+    """
+    response = render(
+        request, template, {**context, 'canonical_url': canonical_url}
+    )
+    response['Link'] = (
+        f'<{request.build_absolute_uri(canonical_url)}>; rel="canonical"'
     )
+    return response
+
+
+def _facet_links(facets, filters):
+    """Добавляет к значениям фасетов ссылки на уточнённый поиск."""
+    url = reverse('search_employee')
+    for param, items in (
+        ('status', facets['status']),
+        ('region_name', facets['region']),
+    ):
+        for item in items:
+            item['url'] = (
+                f"{url}?{urlencode({**filters, param: item['value']})}"
+            )
+            item['active'] = filters.get(param) == item['value']
+    return facets
 
 
 # =====================
@@ -311,31 +476,30 @@ def confirm_export(request):
         messages.error(request, 'Нет прав на экспорт сотрудников.')
         return redirect('search_employee')
 
-    filters = {}
-    if request.GET.get('last_name'):
-        filters['last_name__icontains'] = request.GET['last_name']
-    if request.GET.get('first_name'):
-        filters['first_name__icontains'] = request.GET['first_name']
-    if request.GET.get('patronymic'):
-        filters['patronymic__icontains'] = request.GET['patronymic']
-    if request.GET.get('region_name'):
-        filters['region_name'] = request.GET['region_name']
-    if request.GET.get('region'):  # фильтр по региону через employees_by_region
-        filters['region_name_id'] = request.GET['region']
-    if request.GET.get('note_date'):
-        filters['note_date'] = request.GET['note_date']
-    if request.GET.get('note_number'):
-        filters['note_number__icontains'] = request.GET['note_number']
-
-    employees = Employee.objects.filter(**filters)
-    count = employees.count()
+    try:
+        params = resolve_since(request.GET, request.user)
+    except ValueError as exc:
+        messages.error(request, str(exc))
+        return redirect('search_employee')
+
+    # фильтр выполняется один раз: найденные id сохраняются в снимок,
+    # и export_excel выгружает ровно их
+    compiled = compile_query(params)
+    snapshot = create_snapshot(
+        compiled.apply(Employee.objects.all()),
+        request.user,
+        compiled.canon,
+    )
 
     return render(
         request,
         'confirm_export.html',
         {
-            'count': count,
+            'count': snapshot['count'],
+            'snapshot': snapshot['token'],
             'query': request.GET.urlencode(),
+            'since': compiled.canon.get('since'),
+            'watermark': get_watermark(request.user),
             'prev_url': request.META.get(
                 'HTTP_REFERER', reverse('search_employee')
             ),
@@ -348,84 +512,236 @@ def confirm_export(request):
 # =====================
 @login_required
 def export_excel(request):
-    """Экспорт списка сотрудников в Excel."""
+    """
+    Экспорт списка сотрудников.
+
+    Формат задаётся параметром format: xlsx (по умолчанию), csv или
+    ndjson; CSV и NDJSON отдаются потоком без сборки файла. Формат zip —
+    архив с отдельной книгой на каждый регион. Параметр since (метка
+    времени, номер фоновой выгрузки или last) оставляет только
+    сотрудников, изменённых после метки.
+    """
     if not (request.user.is_admin or request.user.is_manager):
         messages.error(request, 'Нет прав на экспорт сотрудников.')
         return redirect('search_employee')
 
-    filters = {}
-    if request.GET.get('last_name'):
-        filters['last_name__icontains'] = request.GET['last_name']
-    if request.GET.get('first_name'):
-        filters['first_name__icontains'] = request.GET['first_name']
-    if request.GET.get('patronymic'):
-        filters['patronymic__icontains'] = request.GET['patronymic']
-    if request.GET.get('region_name'):
-        filters['region_name'] = request.GET['region_name']
-    if request.GET.get('region'):  # фильтр по региону через employees_by_region
-        filters['region_name_id'] = request.GET['region']
-    if request.GET.get('note_date'):
-        filters['note_date'] = request.GET['note_date']
-    if request.GET.get('note_number'):
-        filters['note_number__icontains'] = request.GET['note_number']
-
-    employees = Employee.objects.filter(**filters)
-
-    if not employees.exists():
+    export_format = request.GET.get('format', 'xlsx')
+    if export_format not in EXPORT_FORMATS:
+        messages.error(request, 'Неизвестный формат экспорта.')
+        return redirect('search_employee')
+
+    token = request.GET.get('snapshot')
+    snapshot = None
+    if token:
+        # выборка, подтверждённая на странице confirm_export
+        snapshot = get_snapshot(token, request.user)
+        if snapshot is None:
+            messages.warning(request, EXPORT_EXPIRED_MESSAGE)
+            return redirect('search_employee')
+        compiled = compile_query(snapshot['query'])
+        moment = parse_datetime(snapshot['taken_at'])
+    else:
+        try:
+            compiled = compile_query(resolve_since(request.GET, request.user))
+        except ValueError as exc:
+            messages.error(request, str(exc))
+            return redirect('search_employee')
+        moment = timezone.now()
+
+    if export_format == 'xlsx':
+        # заранее построенный файл, если данные не менялись
+        version = get_data_version()
+        if snapshot is None or snapshot['version'] == version:
+            prebuilt = find_snapshot(compiled.canon, version)
+            if prebuilt:
+                record_export(request.user, compiled.canon, moment)
+                return _prebuilt_response(request, prebuilt)
+
+    if snapshot:
+        if not snapshot_is_complete(snapshot):
+            messages.warning(request, EXPORT_EXPIRED_MESSAGE)
+            return redirect('search_employee')
+        employees = None
+        count = snapshot['count']
+        rows = iter_snapshot_rows(snapshot)
+    else:
+        employees = compiled.apply(Employee.objects.all())
+        count = 1 if employees.exists() else 0
+        rows = iter_rows(employees)
+
+    if not count:
         messages.warning(request, 'Нет сотрудников для экспорта.')
         return redirect(
             request.META.get('HTTP_REFERER', reverse('search_employee'))
         )
 
-    # 📊 Формируем Excel
-    wb = Workbook()
-    ws = wb.active
-    ws.title = 'Сотрудники'
-    ws.append(
-        [
-            'Фамилия',
-            'Имя',
-            'Отчество',
-            'Регион',
-            'Дата записки',
-            'Номер записки',
-            'Логин',
-            'Пароль',
-        ]
+    content_type, extension = EXPORT_FORMATS[export_format]
+    filename = f'employees.{extension}'
+    if export_format == 'zip':
+        # книги регионов строятся параллельно в пуле процессов
+        try:
+            groups = (
+                group_snapshot_by_region(snapshot)
+                if snapshot
+                else group_by_region(employees)
+            )
+        except LookupError:
+            messages.warning(request, EXPORT_EXPIRED_MESSAGE)
+            return redirect('search_employee')
+        response = StreamingHttpResponse(
+            _record_when_sent(
+                iter_region_bundle(groups), request.user, compiled, moment
+            ),
+            content_type=content_type,
+        )
+        response['Content-Disposition'] = f'attachment; filename="{filename}"'
+        return response
+
+    if export_format != 'xlsx':
+        stream = iter_csv if export_format == 'csv' else iter_ndjson
+        response = StreamingHttpResponse(
+            _record_when_sent(stream(rows), request.user, compiled, moment),
+            content_type=content_type,
+        )
+        response['Content-Disposition'] = f'attachment; filename="{filename}"'
+        return response
+
+    # 📊 Формируем Excel (write-only, лист во временном файле)
+    try:
+        xlsx = build_xlsx(rows)
+    except LookupError:
+        messages.warning(request, EXPORT_EXPIRED_MESSAGE)
+        return redirect('search_employee')
+
+    record_export(request.user, compiled.canon, moment)
+    return FileResponse(
+        xlsx, as_attachment=True, filename=filename, content_type=content_type
     )
 
-    for emp in employees:
-        ws.append(
-            [
-                emp.last_name,
-                emp.first_name,
-                emp.patronymic or '',
-                emp.region_name.name,
-                emp.note_date or '',
-                emp.note_number,
-                emp.login,
-                emp.password,
-            ]
-        )
 
-    response = HttpResponse(
-        content_type=(
-            'application/vnd.openxmlformats-'
-            'officedocument.spreadsheetml.sheet'
-        )
+def _record_when_sent(chunks, user, compiled, moment):
+    """Сдвигает отметку выгрузки, только когда поток отдан целиком."""
+    yield from chunks
+    record_export(user, compiled.canon, moment)
+
+
+def _prebuilt_response(request, prebuilt):
+    """Отдаёт готовый файл выгрузки с ETag/Last-Modified (или 304)."""
+    etag = prebuilt['etag']
+    last_modified = prebuilt['last_modified']
+    response = get_conditional_response(
+        request, etag=etag, last_modified=last_modified
     )
-    response['Content-Disposition'] = 'attachment; filename="employees.xlsx"'
-    wb.save(response)
+    if response is None:
+        response = FileResponse(
+            open(prebuilt['path'], 'rb'),
+            as_attachment=True,
+            filename='employees.xlsx',
+            content_type=XLSX_CONTENT_TYPE,
+        )
+    response['ETag'] = etag
+    response['Last-Modified'] = http_date(last_modified)
     return response
 
 
+# =====================
+# 🔹 Фоновый экспорт
+# =====================
+@login_required
+def export_job_start(request):
+    """Ставит выгрузку подтверждённой выборки в очередь (JSON)."""
+    if not (request.user.is_admin() or request.user.is_manager()):
+        return JsonResponse({}, status=403)
+    if request.method != 'POST':
+        return JsonResponse({}, status=405)
+
+    snapshot = get_snapshot(request.POST.get('snapshot'), request.user)
+    if snapshot is None:
+        return JsonResponse({'error': EXPORT_EXPIRED_MESSAGE}, status=410)
+
+    job = start_export(snapshot, request.user)
+    actions_logger.info(
+        "Фоновый экспорт #%s: %s (%s строк)",
+        job.pk,
+        request.user.username,
+        job.total,
+    )
+    return JsonResponse(
+        {
+            **job_status(job),
+            'status_url': reverse('export_job_status', args=[job.pk]),
+        },
+        status=202,
+    )
+
+
+@login_required
+def export_job_status(request, pk):
+    """Состояние фоновой выгрузки и ссылка на файл, когда он готов."""
+    job = get_object_or_404(ExportJob, pk=pk, user=request.user)
+    if is_stale(job):
+        fail_stale_jobs()
+        job.refresh_from_db()
+    data = job_status(job)
+    if job.status == ExportJob.DONE:
+        data['download_url'] = reverse('export_job_download', args=[job.pk])
+    return JsonResponse(data)
+
+
+@login_required
+def export_job_download(request, pk):
+    """Отдаёт готовый файл фоновой выгрузки."""
+    job = get_object_or_404(
+        ExportJob, pk=pk, user=request.user, status=ExportJob.DONE
+    )
+    try:
+        fileobj = open(job_path(job), 'rb')
+    except FileNotFoundError:
+        messages.warning(request, 'Файл выгрузки больше недоступен.')
+        return redirect('search_employee')
+    return FileResponse(
+        fileobj,
+        as_attachment=True,
+        filename='employees.xlsx',
+        content_type=XLSX_CONTENT_TYPE,
+    )
+
+
 # =====================
 # 🔹 Генерация пароля
 # =====================
 @login_required
 def generate_password_view(request):
-    """Возвращает сгенерированный пароль в JSON-ответе."""
-    return JsonResponse({'password': generate_password()})
+    """
+    Возвращает сгенерированный пароль в JSON-ответе.
+
+    С параметром count=N возвращает список из N паролей
+    (не больше PASSWORD_BATCH_MAX) для массового заведения.
+    """
+    if 'count' not in request.GET:
+        return JsonResponse({'password': generate_password()})
+    try:
+        count = int(request.GET['count'])
+    except ValueError:
+        return JsonResponse({'error': 'count должен быть числом.'}, status=400)
+    count = min(max(count, 1), PASSWORD_BATCH_MAX)
+    return JsonResponse({'passwords': generate_passwords(count)})
+
+
+# =====================
+# 🔹 Подсказки для поиска
+# =====================
+@login_required
+def suggest_employee(request):
+    """Подсказки фамилий и логинов по началу строки (без SQL)."""
+    try:
+        limit = int(request.GET.get('limit', SUGGEST_LIMIT))
+    except ValueError:
+        limit = SUGGEST_LIMIT
+    limit = min(max(limit, 1), SUGGEST_MAX_LIMIT)
+    return JsonResponse(
+        {'results': suggest(request.GET.get('q', ''), limit)}
+    )
 
 
 # =====================
@@ -478,71 +794,164 @@ def employees_by_region(request):
     """Отображает сотрудников выбранного региона."""
     employees = []
     selected_region = None
+    context = {}
+    canonical_url = reverse('employees_by_region')
     form = RegionSelectForm(request.GET or None)
 
     if form.is_valid():
         selected_region = form.cleaned_data['region']
+        cursor = parse_cursor(request.GET, Employee, REGION_ORDERING)
+        canon = {'region': str(selected_region.id), **cursor}
 
-        # Канонизируем URL: всегда один параметр ?region=<id>
-        if selected_region and (
-            list(request.GET.keys()) != ['region']
-            or request.GET.get('region') != str(selected_region.id)
-        ):
-            return redirect(
-                f"{reverse('employees_by_region')}?region={selected_region.id}"
-            )
+        # Канонический URL: ?region=<id> и, при наличии, курсор страницы
+        canonical_url = f'{canonical_url}?{urlencode(canon)}'
 
         if selected_region:
-            employees = Employee.objects.filter(region_name=selected_region)
+            page = paginate(
+                Employee.objects.select_related('region').filter(
+                    region=selected_region
+                ),
+                REGION_ORDERING,
+                **cursor,
+            )
+            context = pagination_context(
+                page, reverse('employees_by_region'), canon
+            )
+            employees = page.object_list
+            context['rows_html'] = render_rows(
+                employees, request.user, canonical_url, get_data_version()
+            )
+            if request.GET.get('partial') == 'rows':
+                return _rows_response(context)
 
-            if not employees.exists():
+            if not employees:
                 messages.warning(
                     request, f'В регионе {selected_region} нет сотрудников.'
                 )
 
-    return render(
+    return _render_canonical(
         request,
         'employees_by_region.html',
         {
             'form': form,
             'employees': employees,
             'selected_region': selected_region,
+            **context,
         },
+        canonical_url,
     )
 
 
 @login_required
 def bulk_delete_employees(request):
-    """Массовое удаление сотрудников (только admin)."""
+    """
+    Массовое удаление сотрудников (только admin).
+
+    Удаляются либо отмеченные сотрудники (selected), либо все
+    сотрудники, найденные поисковым запросом (scope=query). Удаление
+    идёт в фоновом потоке порциями в коротких транзакциях; запрос сразу
+    возвращает токен, ход доступен через bulk_progress.
+    """
     if not request.user.is_admin:
         messages.error(request, "Удаление доступно только администраторам.")
         return redirect("search_employee")
 
     if request.method == "POST":
-        selected_ids = request.POST.getlist("selected")
         prev_url = request.POST.get("prev_url", reverse("search_employee"))
+        scope = request.POST.get("scope", "selected")
+        queryset = None
+        selected_ids = []
+        query = ""
+
+        if scope == "query":
+            compiled = compile_query(
+                QueryDict(request.POST.get("query", ""))
+            )
+            if not compiled:
+                messages.warning(request, "Не задан поисковый запрос.")
+                return redirect(prev_url)
+            query = compiled.querystring
+            queryset = compiled.apply(Employee.objects.all())
+            count = queryset.count()
+        else:
+            selected_ids = [
+                int(pk) for pk in request.POST.getlist("selected")
+                if pk.isdigit()
+            ]
+            if not selected_ids:
+                messages.warning(
+                    request, "Вы не выбрали сотрудников для удаления."
+                )
+                return redirect(prev_url)
+            count = sum(
+                Employee.objects.filter(pk__in=ids).count()
+                for ids in chunked(selected_ids)
+            )
 
-        if not selected_ids:
-            messages.warning(request, "Вы не выбрали сотрудников для удаления.")
-            return redirect(prev_url)
-
-        employees = Employee.objects.filter(pk__in=selected_ids)
-
-        if not employees.exists():
+        if not count:
             messages.error(request, "Выбранные сотрудники не найдены.")
             return redirect(prev_url)
 
-        # Подтверждение удаления
+        # Подтверждение удаления: запускаем в фоне
         if request.POST.get("confirm") == "yes":
-            count = employees.count()
-            employees.delete()
-            messages.success(request, f"Удалено сотрудников: {count}.")
+            token = start_delete(
+                queryset,
+                None if queryset is not None else selected_ids,
+                token=request.POST.get("progress_token"),
+                user=request.user,
+            )
+            actions_logger.info(
+                "%s запустил удаление сотрудников: %s", request.user, count
+            )
+            if request.headers.get("x-requested-with") == "XMLHttpRequest":
+                return JsonResponse(
+                    {
+                        "token": token,
+                        "total": count,
+                        "progress_url": reverse(
+                            "bulk_progress", args=[token]
+                        ),
+                    }
+                )
+            messages.info(
+                request, f"Удаление запущено: {count} сотрудников."
+            )
             return redirect(prev_url)
 
+        preview = (
+            queryset
+            if queryset is not None
+            else Employee.objects.filter(pk__in=selected_ids[:BULK_PREVIEW])
+        ).order_by("last_name", "id")[:BULK_PREVIEW]
         return render(
             request,
             "bulk_delete_confirm.html",
-            {"employees": employees, "prev_url": prev_url},
+            {
+                "preview": preview,
+                "count": count,
+                "more": max(count - BULK_PREVIEW, 0),
+                "scope": scope,
+                "query": query,
+                "selected_ids": selected_ids,
+                "progress_token": new_progress_token(),
+                "prev_url": prev_url,
+            },
         )
 
     return redirect("search_employee")
+
+
+@login_required
+def bulk_progress(request, token):
+    """Ход массовой операции в JSON (для индикатора на странице)."""
+    if not request.user.is_admin():
+        return JsonResponse({}, status=403)
+    return JsonResponse(get_progress(token) or {})
+
+
+@login_required
+def write_stats_view(request):
+    """Счётчики записи в БД текущего процесса в JSON (ожидания, повторы)."""
+    if not request.user.is_admin():
+        return JsonResponse({}, status=403)
+    return JsonResponse(write_stats())
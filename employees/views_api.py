@@ -3,6 +3,7 @@ from rest_framework import permissions, viewsets
 from .models import Employee, Region
 from .serializers import EmployeeSerializer, RegionSerializer
 from .utils import log_action
+from .writes import run_write
 
 
 class IsAdminOrManager(permissions.BasePermission):
@@ -22,7 +23,7 @@ class IsAdminOrManager(permissions.BasePermission):
 class EmployeeViewSet(viewsets.ModelViewSet):
     """ViewSet для сотрудников (CRUD через API)."""
 
-    queryset = Employee.objects.all().select_related('region_name', 'region_code')
+    queryset = Employee.objects.all().select_related('region')
     serializer_class = EmployeeSerializer
 
     def get_permissions(self):
@@ -37,18 +38,18 @@ class EmployeeViewSet(viewsets.ModelViewSet):
 
     def perform_create(self, serializer):
         """Создание сотрудника через API + логирование действия."""
-        employee = serializer.save()
+        employee = run_write(serializer.save)
         log_action(self.request, 'api_create_employee', employee)
 
     def perform_update(self, serializer):
         """Обновление сотрудника через API + логирование действия."""
-        employee = serializer.save()
+        employee = run_write(serializer.save)
         log_action(self.request, 'api_update_employee', employee)
 
     def perform_destroy(self, instance):
         """Удаление сотрудника через API + логирование действия."""
         log_action(self.request, 'api_delete_employee', instance)
-        instance.delete()
+        run_write(instance.delete)
 
 
 class RegionViewSet(viewsets.ReadOnlyModelViewSet):
@@ -0,0 +1,91 @@
+"""
+Отметки выгрузок для дельта-экспорта.
+
+Параметр since в фильтре экспорта принимает метку времени ISO 8601,
+номер фоновой выгрузки или last — момент последней полной выгрузки
+пользователя. Отметка пользователя сдвигается после каждой выгрузки
+всего реестра (полной или дельты), поэтому «выгрузить новое с прошлого
+раза» — один запрос с since=last.
+"""
+from datetime import datetime
+from typing import Optional
+
+from .models import ExportJob, ExportWatermark
+
+SINCE_LAST = 'last'
+
+
+def get_watermark(user) -> Optional[datetime]:
+    """Момент последней выгрузки реестра пользователем (или None)."""
+    return (
+        ExportWatermark.objects.filter(user=user)
+        .values_list('exported_at', flat=True)
+        .first()
+    )
+
+
+def resolve_since(params, user) -> dict:
+    """
+    Заменяет since=last и since=<номер выгрузки> на метку времени.
+
+    Args:
+        params (QueryDict | dict): параметры запроса.
+        user (User): пользователь, выполняющий выгрузку.
+
+    Returns:
+        dict: параметры, в которых since — метка ISO 8601 или
+            отсутствует (since=last без предыдущих выгрузок).
+
+    Raises:
+        ValueError: выгрузка с указанным номером не найдена.
+    """
+    params = dict(params.items())
+    since = params.get('since', '').strip()
+    if since == SINCE_LAST:
+        moment = get_watermark(user)
+    elif since.isdigit():
+        moment = (
+            ExportJob.objects.filter(
+                pk=since, user=user, status=ExportJob.DONE
+            )
+            .values_list('data_at', flat=True)
+            .first()
+        )
+        if moment is None:
+            raise ValueError(f'Выгрузка №{since} не найдена.')
+    else:
+        return params
+
+    if moment is None:
+        params.pop('since')
+    else:
+        params['since'] = moment.isoformat()
+    return params
+
+
+def is_registry_export(canon: dict) -> bool:
+    """Выгружается весь реестр (без фильтров, кроме since)."""
+    return not any(param != 'since' for param in canon)
+
+
+def record_export(user, canon: dict, moment: datetime) -> None:
+    """
+    Сдвигает отметку пользователя после выгрузки реестра.
+
+    Выгрузки с фильтрами (регион, статус и т.п.) отметку не меняют,
+    иначе since=last пропустил бы изменения вне фильтра.
+
+    Args:
+        user (User): пользователь.
+        canon (dict): канонические параметры выгрузки.
+        moment (datetime): момент, на который прочитаны данные.
+    """
+    if not is_registry_export(canon):
+        return
+    watermark, created = ExportWatermark.objects.get_or_create(
+        user=user, defaults={'exported_at': moment}
+    )
+    if not created and watermark.exported_at < moment:
+        ExportWatermark.objects.filter(
+            pk=watermark.pk, exported_at__lt=moment
+        ).update(exported_at=moment)
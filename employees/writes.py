@@ -0,0 +1,194 @@
+"""
+Согласование записи в SQLite при конкурентных пишущих.
+
+SQLite допускает одного пишущего одновременно. Транзакция, начатая
+обычным BEGIN, берёт блокировку записи только на первом INSERT/UPDATE,
+и при конфликте ошибка «database is locked» возникает посреди работы.
+Здесь транзакции записи начинаются с BEGIN IMMEDIATE (его выполняет
+сам atomic() через бэкенд employees.sqlite_backend): блокировка
+берётся сразу (ожидание — PRAGMA busy_timeout), а если её не удалось
+получить, транзакция повторяется с экспоненциальной задержкой со
+случайным разбросом. Малоприоритетные записи (журналы действий и
+входов) при WRITE_QUEUE выполняются одним фоновым потоком-писателем и
+не задерживают ответ. Счётчики ожиданий и повторов — write_stats().
+"""
+import logging
+import random
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import ExitStack, contextmanager
+from functools import wraps
+from typing import Callable
+
+from django.conf import settings
+from django.db import (
+    DEFAULT_DB_ALIAS,
+    OperationalError,
+    close_old_connections,
+    connections,
+    transaction,
+)
+
+app_logger = logging.getLogger('app')
+
+# Сколько раз повторять транзакцию, если блокировка записи занята
+WRITE_RETRIES = getattr(settings, 'WRITE_RETRIES', 5)
+
+# Базовая задержка перед повтором (секунды), удваивается с каждой попыткой
+WRITE_RETRY_DELAY = getattr(settings, 'WRITE_RETRY_DELAY', 0.05)
+
+# Ожидание блокировки дольше этого (секунды) считается в lock_waits
+LOCK_WAIT_THRESHOLD = 0.005
+
+# Выполнять малоприоритетные записи фоновым потоком-писателем
+WRITE_QUEUE = getattr(settings, 'WRITE_QUEUE', False)
+
+_stats = {
+    'transactions': 0,
+    'lock_waits': 0,
+    'lock_wait_seconds': 0.0,
+    'retries': 0,
+    'failures': 0,
+    'queued': 0,
+    'queue_errors': 0,
+}
+_stats_lock = threading.Lock()
+
+_writer = None
+_writer_lock = threading.Lock()
+
+
+def _count(name: str, value=1) -> None:
+    with _stats_lock:
+        _stats[name] += value
+
+
+def write_stats() -> dict:
+    """
+    Счётчики записи текущего процесса.
+
+    Returns:
+        dict: transactions, lock_waits, lock_wait_seconds, retries,
+            failures (повторы исчерпаны), queued, queue_errors.
+    """
+    with _stats_lock:
+        return dict(_stats)
+
+
+def _is_locked(exc: OperationalError) -> bool:
+    message = str(exc).lower()
+    return 'locked' in message or 'busy' in message
+
+
+@contextmanager
+def write_atomic(using: str = DEFAULT_DB_ALIAS):
+    """
+    transaction.atomic(), который на SQLite сразу берёт блокировку
+    записи (BEGIN IMMEDIATE).
+
+    Вложенный блок — обычная точка сохранения внутри внешней
+    транзакции. С бэкендом без begin_mode (не employees.sqlite_backend)
+    работает как обычный atomic().
+    """
+    connection = connections[using]
+    immediate = not connection.in_atomic_block and hasattr(
+        connection, 'begin_mode'
+    )
+    with ExitStack() as stack:
+        if immediate:
+            started = time.monotonic()
+            connection.begin_mode = 'IMMEDIATE'
+            try:
+                stack.enter_context(transaction.atomic(using=using))
+            finally:
+                connection.begin_mode = ''
+            waited = time.monotonic() - started
+            if waited > LOCK_WAIT_THRESHOLD:
+                _count('lock_waits')
+                _count('lock_wait_seconds', waited)
+        else:
+            stack.enter_context(transaction.atomic(using=using))
+        _count('transactions')
+        yield
+
+
+def run_write(
+    func: Callable, *args, using: str = DEFAULT_DB_ALIAS, **kwargs
+):
+    """
+    Выполняет func в транзакции записи с повтором при блокировке.
+
+    Повтор возможен только для внешней транзакции: внутри уже открытой
+    func просто выполняется в точке сохранения.
+
+    Args:
+        func (Callable): функция, выполняющая запись.
+        *args, **kwargs: её аргументы.
+        using (str): алиас базы данных.
+
+    Returns:
+        Результат func.
+
+    Raises:
+        OperationalError: блокировка не получена за WRITE_RETRIES
+            попыток или другая ошибка БД.
+    """
+    if connections[using].in_atomic_block:
+        with write_atomic(using):
+            return func(*args, **kwargs)
+
+    for attempt in range(WRITE_RETRIES + 1):
+        try:
+            with write_atomic(using):
+                return func(*args, **kwargs)
+        except OperationalError as exc:
+            if not _is_locked(exc):
+                raise
+            if attempt == WRITE_RETRIES:
+                _count('failures')
+                raise
+            _count('retries')
+            # полный разброс: от 0 до удвоенной задержки попытки
+            time.sleep(random.uniform(0, WRITE_RETRY_DELAY * 2 ** attempt))
+
+
+def serialized_write(func: Callable) -> Callable:
+    """Декоратор: функция выполняется через run_write()."""
+
+    @wraps(func)
+    def wrapper(*args, **kwargs):
+        return run_write(func, *args, **kwargs)
+
+    return wrapper
+
+
+def _get_writer() -> ThreadPoolExecutor:
+    global _writer
+    with _writer_lock:
+        if _writer is None:
+            _writer = ThreadPoolExecutor(
+                max_workers=1, thread_name_prefix='writer'
+            )
+        return _writer
+
+
+def _run_queued(func: Callable, args: tuple, kwargs: dict) -> None:
+    close_old_connections()
+    try:
+        run_write(func, *args, **kwargs)
+    except Exception:
+        _count('queue_errors')
+        app_logger.exception('Ошибка фоновой записи %s', func)
+
+
+def defer_write(func: Callable, *args, **kwargs) -> None:
+    """
+    Малоприоритетная запись (журналы): при WRITE_QUEUE выполняется
+    потоком-писателем по очереди, иначе — сразу через run_write().
+    """
+    if not WRITE_QUEUE:
+        run_write(func, *args, **kwargs)
+        return
+    _count('queued')
+    _get_writer().submit(_run_queued, func, args, kwargs)
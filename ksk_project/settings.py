@@ -64,14 +64,61 @@ TEMPLATES = [
 
 WSGI_APPLICATION = 'ksk_project.wsgi.application'
 
-# 💾 База данных
+# 💾 База данных. employees.sqlite_backend — стандартный SQLite с
+# поддержкой BEGIN IMMEDIATE для транзакций записи (employees.writes)
 DATABASES = {
     'default': {
-        'ENGINE': 'django.db.backends.sqlite3',
+        'ENGINE': 'employees.sqlite_backend',
         'NAME': BASE_DIR / 'db.sqlite3',
     }
 }
 
+# Параметры каждого нового соединения SQLite (employees.sqlite):
+# WAL — чтение не блокируется записью, busy_timeout (мс) — ожидание
+# блокировки вместо «database is locked», mmap_size (байты) и
+# cache_size (отрицательное — КиБ) — кэш страниц. Обслуживание базы
+# по расписанию: manage.py db_maintenance.
+SQLITE_PRAGMAS = {
+    'busy_timeout': 5000,
+    'journal_mode': 'WAL',
+    'synchronous': 'NORMAL',
+    'mmap_size': 256 * 1024 * 1024,
+    'cache_size': -64 * 1024,
+    'temp_store': 'MEMORY',
+}
+
+# Транзакции записи (employees.writes) начинаются с BEGIN IMMEDIATE и
+# повторяются при «database is locked». WRITE_QUEUE — журналы действий
+# и входов пишет один фоновый поток, не задерживая ответ (записи,
+# не выполненные к остановке процесса, теряются).
+WRITE_QUEUE = False
+
+# 🗄️ Кэш (результаты поиска сотрудников). Ключи включают версию данных
+# из БД, поэтому кэш корректен и при нескольких процессах; для общего
+# кэша между процессами можно указать Redis/Memcached.
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        'LOCATION': 'ksk',
+    }
+}
+SEARCH_CACHE_TIMEOUT = 600
+SEARCH_CACHE_MAX_IDS = 20000
+# Время жизни снимка выборки для экспорта (секунды); снимки хранятся
+# в БД (ExportSnapshot) и доступны всем процессам
+EXPORT_SNAPSHOT_TIMEOUT = 900
+
+# Фоновые выгрузки: число одновременных задач, каталог файлов
+# и сколько секунд хранятся готовые файлы
+EXPORT_MAX_WORKERS = 2
+EXPORT_DIR = BASE_DIR / 'exports'
+EXPORT_FILE_TTL = 24 * 3600
+# Через сколько секунд задача «в очереди»/«выполняется» считается
+# прерванной (пул потоков теряет задачи при перезапуске процесса)
+EXPORT_JOB_TIMEOUT = 3600
+# Заранее построенные выгрузки (manage.py build_export_snapshots из cron)
+EXPORT_SNAPSHOT_DIR = EXPORT_DIR / 'snapshots'
+
 # 🔐 Пароли
 AUTH_PASSWORD_VALIDATORS = [
     {